@@ -3,10 +3,14 @@ import typing
 
 import yaml
 from config.DataStoreConfiguration import DataStoreConfiguration
+from config.HttpProbeConfiguration import HttpProbeConfiguration
 from config.LoggingConfiguration import LoggingConfiguration
 from config.NetProbeConfiguration import NetProbeConfiguration
 from config.PresentationConfiguration import PresentationConfiguration
+from config.SchedulerConfiguration import SchedulerConfiguration
 from config.SpeedTestConfiguration import SpeedTestConfiguration
+from config.TcpProbeConfiguration import TcpProbeConfiguration
+from config.TraceProbeConfiguration import TraceProbeConfiguration
 from dotenv import find_dotenv, load_dotenv
 from lib.enums.ConfigurationDefaults import ConfigurationDefaults
 from lib.enums.EnvVars import EnvVars
@@ -39,6 +43,10 @@ class Configuration:
 
         self.probe = NetProbeConfiguration(base_config)
         self.logging = LoggingConfiguration(base_config)
+        self.scheduler = SchedulerConfiguration(base_config)
         self.speedtest = SpeedTestConfiguration(base_config)
-        self.datastore = DataStoreConfiguration(base_config)
+        self.tcp = TcpProbeConfiguration(base_config)
+        self.http_probe = HttpProbeConfiguration(base_config)
+        self.trace = TraceProbeConfiguration(base_config)
+        self.datastore = DataStoreConfiguration(base_config, shards=self.probe.shards)
         self.presentation = PresentationConfiguration(base_config, probe=self.probe, speedtest=self.speedtest)
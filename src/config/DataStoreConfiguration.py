@@ -10,7 +10,7 @@ from lib.enums.YamlVars import YamlVars
 
 
 class DataStoreConfiguration:
-    def __init__(self, base: dict = {}):
+    def __init__(self, base: dict = {}, shards: list[str] = []):
 
         probe_type = EnvVars.DATASTORE_PROBE_TYPE.string(
             YamlVars.DATASTORE_PROBE_TYPE.string(base, ConfigurationDefaults.DATASTORE_PROBE_TYPE)
@@ -24,15 +24,58 @@ class DataStoreConfiguration:
         speed_topic = EnvVars.DATASTORE_SPEEDTEST_TOPIC.string(
             YamlVars.DATASTORE_SPEEDTEST_TOPIC.string(base, ConfigurationDefaults.DATASTORE_SPEEDTEST_TOPIC)
         )
+        speed_server_topic = EnvVars.DATASTORE_SPEEDTEST_SERVER_TOPIC.string(
+            YamlVars.DATASTORE_SPEEDTEST_SERVER_TOPIC.string(
+                base, ConfigurationDefaults.DATASTORE_SPEEDTEST_SERVER_TOPIC
+            )
+        )
+        speed_load_topic = EnvVars.DATASTORE_SPEEDTEST_LOAD_TOPIC.string(
+            YamlVars.DATASTORE_SPEEDTEST_LOAD_TOPIC.string(base, ConfigurationDefaults.DATASTORE_SPEEDTEST_LOAD_TOPIC)
+        )
+
+        tcp_type = EnvVars.DATASTORE_TCP_TYPE.string(
+            YamlVars.DATASTORE_TCP_TYPE.string(base, ConfigurationDefaults.DATASTORE_TCP_TYPE)
+        ).upper()
+        tcp_topic = EnvVars.DATASTORE_TCP_TOPIC.string(
+            YamlVars.DATASTORE_TCP_TOPIC.string(base, ConfigurationDefaults.DATASTORE_TCP_TOPIC)
+        )
+        http_probe_type = EnvVars.DATASTORE_HTTP_PROBE_TYPE.string(
+            YamlVars.DATASTORE_HTTP_PROBE_TYPE.string(base, ConfigurationDefaults.DATASTORE_HTTP_PROBE_TYPE)
+        ).upper()
+        http_probe_topic = EnvVars.DATASTORE_HTTP_PROBE_TOPIC.string(
+            YamlVars.DATASTORE_HTTP_PROBE_TOPIC.string(base, ConfigurationDefaults.DATASTORE_HTTP_PROBE_TOPIC)
+        )
+        trace_type = EnvVars.DATASTORE_TRACE_TYPE.string(
+            YamlVars.DATASTORE_TRACE_TYPE.string(base, ConfigurationDefaults.DATASTORE_TRACE_TYPE)
+        ).upper()
+        trace_topic = EnvVars.DATASTORE_TRACE_TOPIC.string(
+            YamlVars.DATASTORE_TRACE_TOPIC.string(base, ConfigurationDefaults.DATASTORE_TRACE_TOPIC)
+        )
 
         self.netprobe = {'type': DataStoreTypes.from_str(probe_type), 'topic': probe_topic}
-        self.speedtest = {'type': DataStoreTypes.from_str(speed_type), 'topic': speed_topic}
+        self.speedtest = {
+            'type': DataStoreTypes.from_str(speed_type),
+            'topic': speed_topic,
+            'server_topic': speed_server_topic,
+            'load_topic': speed_load_topic,
+        }
+        self.tcp = {'type': DataStoreTypes.from_str(tcp_type), 'topic': tcp_topic}
+        self.http_probe = {'type': DataStoreTypes.from_str(http_probe_type), 'topic': http_probe_topic}
+        self.trace = {'type': DataStoreTypes.from_str(trace_type), 'topic': trace_topic}
 
         self.file = FileDataStoreConfiguration(base)
         self.redis = RedisDataStoreConfiguration(base)
         self.mongodb = MongoDBDataStoreConfiguration(base)
         self.http = HttpDataStoreConfiguration(base)
-        self.mqtt = MqttDataStoreConfiguration(base, netprobe=self.netprobe, speedtest=self.speedtest)
+        self.mqtt = MqttDataStoreConfiguration(
+            base,
+            netprobe=self.netprobe,
+            speedtest=self.speedtest,
+            tcp=self.tcp,
+            http_probe=self.http_probe,
+            trace=self.trace,
+            shards=shards,
+        )
 
     def merge(self, config: dict):
         self.__dict__.update(config)
@@ -0,0 +1,38 @@
+from lib.enums.ConfigurationDefaults import ConfigurationDefaults
+from lib.enums.EnvVars import EnvVars
+from lib.enums.YamlVars import YamlVars
+
+
+class HttpProbeConfiguration:
+    def __init__(self, base: dict = {}):
+        self.enabled = EnvVars.HTTP_PROBE_ENABLED.boolean(
+            YamlVars.HTTP_PROBE_ENABLED.boolean(base, ConfigurationDefaults.HTTP_PROBE_ENABLED)
+        )
+        self.interval = EnvVars.HTTP_PROBE_INTERVAL.integer(
+            YamlVars.HTTP_PROBE_INTERVAL.integer(base, ConfigurationDefaults.HTTP_PROBE_INTERVAL)
+        )
+        self.count = EnvVars.HTTP_PROBE_COUNT.integer(
+            YamlVars.HTTP_PROBE_COUNT.integer(base, ConfigurationDefaults.HTTP_PROBE_COUNT)
+        )
+        self.timeout = EnvVars.HTTP_PROBE_TIMEOUT.float(
+            YamlVars.HTTP_PROBE_TIMEOUT.float(base, ConfigurationDefaults.HTTP_PROBE_TIMEOUT)
+        )
+        # reuse pooled keep-alive connections between requests instead of opening a cold connection for each
+        self.keepalive = EnvVars.HTTP_PROBE_KEEPALIVE.boolean(
+            YamlVars.HTTP_PROBE_KEEPALIVE.boolean(base, ConfigurationDefaults.HTTP_PROBE_KEEPALIVE)
+        )
+        self.verify_ssl = EnvVars.HTTP_PROBE_VERIFY_SSL.boolean(
+            YamlVars.HTTP_PROBE_VERIFY_SSL.boolean(base, ConfigurationDefaults.HTTP_PROBE_VERIFY_SSL)
+        )
+        self.concurrency = max(
+            1,
+            EnvVars.HTTP_PROBE_CONCURRENCY.integer(
+                YamlVars.HTTP_PROBE_CONCURRENCY.integer(base, ConfigurationDefaults.HTTP_PROBE_CONCURRENCY)
+            ),
+        )
+        self.urls = EnvVars.HTTP_PROBE_URLS.list(
+            ',', YamlVars.HTTP_PROBE_URLS.list(base, ConfigurationDefaults.HTTP_PROBE_URLS)
+        )
+
+    def merge(self, config: dict):
+        self.__dict__.update(config)
@@ -1,7 +1,10 @@
+import typing
+
 from lib.enums.ConfigurationDefaults import ConfigurationDefaults
 from lib.enums.DataStoreTypes import DataStoreTypes
 from lib.enums.EnvVars import EnvVars
 from lib.enums.YamlVars import YamlVars
+from lib.schedulers.sharding import shard_topic
 
 
 class MqttDataStoreConfiguration:
@@ -12,6 +15,8 @@ class MqttDataStoreConfiguration:
         self.password = EnvVars.MQTT_PASSWORD.nullable(YamlVars.MQTT_PASSWORD.nullable(base, None))
 
         st_topic = None
+        st_server_topic = None
+        st_load_topic = None
         np_topic = None
         if 'netprobe' in kwargs:
             np: dict = kwargs.get('netprobe')  # type: ignore
@@ -27,12 +32,29 @@ class MqttDataStoreConfiguration:
                 if st_type == DataStoreTypes.MQTT
                 else None
             )
+            st_server_topic = st.get('server_topic', None) if st_type == DataStoreTypes.MQTT else None
+            st_load_topic = st.get('load_topic', None) if st_type == DataStoreTypes.MQTT else None
 
         self.topics = []
         if np_topic:
             self.topics.append(np_topic)
+            # sharded probes each publish their partial results to a topic of their own
+            for worker in kwargs.get('shards', None) or []:
+                self.topics.append(shard_topic(np_topic, worker))
         if st_topic:
             self.topics.append(st_topic)
+        if st_server_topic:
+            # the cached speedtest server is read back on start-up
+            self.topics.append(st_server_topic)
+        if st_load_topic:
+            # the speed test that is running, read by the network probes
+            self.topics.append(st_load_topic)
+
+        # topics of any additional probes, keyed by probe name
+        for name in ['tcp', 'http_probe', 'trace']:
+            extra: typing.Optional[dict] = kwargs.get(name)
+            if extra and extra.get('type', None) == DataStoreTypes.MQTT and extra.get('topic', None):
+                self.topics.append(extra['topic'])
 
     def merge(self, config: dict):
         self.__dict__.update(config)
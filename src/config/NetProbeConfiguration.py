@@ -1,8 +1,12 @@
 import os
 import re
 
+from config.ProbeGroupConfiguration import ProbeGroupConfiguration
+from config.ProbeSourceConfiguration import ProbeSourceConfiguration
 from lib.enums.ConfigurationDefaults import ConfigurationDefaults
 from lib.enums.EnvVars import EnvVars
+from lib.enums.PingerTypes import PingerTypes
+from lib.enums.ProbeModes import ProbeModes
 from lib.enums.YamlVars import YamlVars
 
 
@@ -15,27 +19,178 @@ class NetProbeConfiguration:
             YamlVars.PROBE_INTERVAL.integer(base, ConfigurationDefaults.PROBE_INTERVAL)
         )
         self.count = EnvVars.PROBE_COUNT.integer(YamlVars.PROBE_COUNT.integer(base, ConfigurationDefaults.PROBE_COUNT))
+        # seconds to wait for each reply
+        self.timeout = EnvVars.PROBE_TIMEOUT.float(
+            YamlVars.PROBE_TIMEOUT.float(base, ConfigurationDefaults.PROBE_TIMEOUT)
+        )
+        self.concurrency = max(
+            1,
+            EnvVars.PROBE_CONCURRENCY.integer(
+                YamlVars.PROBE_CONCURRENCY.integer(base, ConfigurationDefaults.PROBE_CONCURRENCY)
+            ),
+        )
+        # fraction of the interval a cycle may take before unanswered probes are cancelled and counted as lost
+        self.deadline = min(
+            1.0,
+            max(
+                0.1,
+                EnvVars.PROBE_DEADLINE.float(YamlVars.PROBE_DEADLINE.float(base, ConfigurationDefaults.PROBE_DEADLINE)),
+            ),
+        )
+        self.backend = PingerTypes.from_str(
+            EnvVars.PROBE_BACKEND.string(YamlVars.PROBE_BACKEND.string(base, ConfigurationDefaults.PROBE_BACKEND))
+        )
+        self.mode = ProbeModes.from_str(
+            EnvVars.PROBE_MODE.string(YamlVars.PROBE_MODE.string(base, ConfigurationDefaults.PROBE_MODE))
+        )
+        # echo requests per second to each site in STREAM mode
+        self.stream_rate = max(
+            0.1,
+            EnvVars.PROBE_STREAM_RATE.float(
+                YamlVars.PROBE_STREAM_RATE.float(base, ConfigurationDefaults.PROBE_STREAM_RATE)
+            ),
+        )
+        # seconds of samples the STREAM mode statistics cover, 0 for one probe interval
+        self.stream_window = EnvVars.PROBE_STREAM_WINDOW.integer(
+            YamlVars.PROBE_STREAM_WINDOW.integer(base, ConfigurationDefaults.PROBE_STREAM_WINDOW)
+        )
+        if self.stream_window <= 0:
+            self.stream_window = self.interval
+        # probe stable sites less often and with fewer packets, unhealthy ones more often and with more
+        self.adaptive = EnvVars.PROBE_ADAPTIVE.boolean(
+            YamlVars.PROBE_ADAPTIVE.boolean(base, ConfigurationDefaults.PROBE_ADAPTIVE)
+        )
+        self.adaptive_min_interval = max(
+            1,
+            EnvVars.PROBE_ADAPTIVE_MIN_INTERVAL.integer(
+                YamlVars.PROBE_ADAPTIVE_MIN_INTERVAL.integer(base, ConfigurationDefaults.PROBE_ADAPTIVE_MIN_INTERVAL)
+            ),
+        )
+        # the slow end of the cadence never probes more often, or with more packets, than the fast end
+        self.adaptive_max_interval = max(
+            self.adaptive_min_interval,
+            EnvVars.PROBE_ADAPTIVE_MAX_INTERVAL.integer(
+                YamlVars.PROBE_ADAPTIVE_MAX_INTERVAL.integer(base, ConfigurationDefaults.PROBE_ADAPTIVE_MAX_INTERVAL)
+            ),
+        )
+        self.adaptive_min_count = max(
+            1,
+            EnvVars.PROBE_ADAPTIVE_MIN_COUNT.integer(
+                YamlVars.PROBE_ADAPTIVE_MIN_COUNT.integer(base, ConfigurationDefaults.PROBE_ADAPTIVE_MIN_COUNT)
+            ),
+        )
+        self.adaptive_max_count = max(
+            self.adaptive_min_count,
+            EnvVars.PROBE_ADAPTIVE_MAX_COUNT.integer(
+                YamlVars.PROBE_ADAPTIVE_MAX_COUNT.integer(base, ConfigurationDefaults.PROBE_ADAPTIVE_MAX_COUNT)
+            ),
+        )
 
         sites = EnvVars.PROBE_SITES.list(',', list())
         if not sites or len(sites) == 0:
             sites = YamlVars.PROBE_SITES.list(base, ConfigurationDefaults.PROBE_SITES)
 
         self.sites = sites
+
+        # named groups of sites with their own cadence, count, timeout and thresholds
+        self.groups: list[ProbeGroupConfiguration] = []
+        match_pattern_group = r'^NP_PROBE_GROUP_(\d{1,})$'
+        for key, value in os.environ.items():
+            m = re.match(match_pattern_group, key, re.IGNORECASE | re.DOTALL | re.MULTILINE)
+            if m:
+                index = m.group(1)
+                prefix = f'NP_PROBE_GROUP_{index}'
+                group_sites = EnvVars.unquote(os.getenv(f'{prefix}_SITES', None)) or ''
+                self.add_group(
+                    {
+                        'name': EnvVars.unquote(value) or f'group_{index}',
+                        'sites': [site.strip() for site in group_sites.split(',') if site.strip()],
+                        'interval': EnvVars.unquote(os.getenv(f'{prefix}_INTERVAL', None)),
+                        'count': EnvVars.unquote(os.getenv(f'{prefix}_COUNT', None)),
+                        'timeout': EnvVars.unquote(os.getenv(f'{prefix}_TIMEOUT', None)),
+                        'threshold_loss': EnvVars.unquote(os.getenv(f'{prefix}_THRESHOLD_LOSS', None)),
+                        'threshold_latency': EnvVars.unquote(os.getenv(f'{prefix}_THRESHOLD_LATENCY', None)),
+                    }
+                )
+
+        groups = YamlVars.PROBE_GROUPS.expand(base, [])
+        if groups and isinstance(groups, list):
+            for group in groups:
+                if isinstance(group, dict) and "name" in group and "sites" in group:
+                    self.add_group(group)
+
+        # local addresses or interfaces (uplinks) every site and nameserver is probed from, in the same cycle
+        self.sources: list[ProbeSourceConfiguration] = []
+        match_pattern_source = r'^NP_PROBE_SOURCE_(\d{1,})$'
+        for key, value in os.environ.items():
+            m = re.match(match_pattern_source, key, re.IGNORECASE | re.DOTALL | re.MULTILINE)
+            if m:
+                index = m.group(1)
+                self.add_source(
+                    {
+                        'name': EnvVars.unquote(value) or f'source_{index}',
+                        'address': EnvVars.unquote(os.getenv(f'NP_PROBE_SOURCE_{index}_ADDRESS', None)),
+                        'interface': EnvVars.unquote(os.getenv(f'NP_PROBE_SOURCE_{index}_INTERFACE', None)),
+                    }
+                )
+
+        sources = YamlVars.PROBE_SOURCES.expand(base, [])
+        if sources and isinstance(sources, list):
+            for source in sources:
+                if isinstance(source, dict) and "name" in source:
+                    self.add_source(source)
+        self.dns_timeout = EnvVars.PROBE_DNS_TIMEOUT.float(
+            YamlVars.PROBE_DNS_TIMEOUT.float(base, ConfigurationDefaults.PROBE_DNS_TIMEOUT)
+        )
+        # 0 lets every nameserver be queried at once, alongside the pings
+        self.dns_concurrency = max(
+            0,
+            EnvVars.PROBE_DNS_CONCURRENCY.integer(
+                YamlVars.PROBE_DNS_CONCURRENCY.integer(base, ConfigurationDefaults.PROBE_DNS_CONCURRENCY)
+            ),
+        )
         self.dns_test_site = EnvVars.PROBE_DNS_TEST_SITE.string(
             YamlVars.PROBE_DNS_TEST_SITE.string(base, ConfigurationDefaults.PROBE_DNS_TEST_SITE)
         )
-        self.device_id = (
-            str(
-                EnvVars.PROBE_DEVICE_ID.string(
-                    YamlVars.PROBE_DEVICE_ID.string(base, ConfigurationDefaults.PROBE_DEVICE_ID)
-                )
+        # every test site is queried for every record type, falling back to the single dns test site
+        self.dns_test_sites = EnvVars.PROBE_DNS_TEST_SITES.list(
+            ',', YamlVars.PROBE_DNS_TEST_SITES.list(base, [self.dns_test_site])
+        )
+        self.dns_record_types = [
+            record_type.upper()
+            for record_type in EnvVars.PROBE_DNS_RECORD_TYPES.list(
+                ',', YamlVars.PROBE_DNS_RECORD_TYPES.list(base, ConfigurationDefaults.PROBE_DNS_RECORD_TYPES)
             )
-            .replace(' ', '_')
-            .replace('.', '_')
-            .replace('-', '_')
-            .lower()
+        ]
+        self.dns_samples = max(
+            1,
+            EnvVars.PROBE_DNS_SAMPLES.integer(
+                YamlVars.PROBE_DNS_SAMPLES.integer(base, ConfigurationDefaults.PROBE_DNS_SAMPLES)
+            ),
+        )
+        self.dns_cache_miss = EnvVars.PROBE_DNS_CACHE_MISS.boolean(
+            YamlVars.PROBE_DNS_CACHE_MISS.boolean(base, ConfigurationDefaults.PROBE_DNS_CACHE_MISS)
+        )
+        self.device_id = self.safe_id(
+            EnvVars.PROBE_DEVICE_ID.string(YamlVars.PROBE_DEVICE_ID.string(base, ConfigurationDefaults.PROBE_DEVICE_ID))
         )
 
+        # device ids of every probe container that shares the sites, each probes the slice it owns
+        self.shard_workers = [
+            self.safe_id(worker)
+            for worker in EnvVars.PROBE_SHARD_WORKERS.list(
+                ',', YamlVars.PROBE_SHARD_WORKERS.list(base, [self.device_id])
+            )
+        ]
+        # probe processes per container, each owns a slice of the sites as well
+        self.shard_processes = max(
+            1,
+            EnvVars.PROBE_SHARD_PROCESSES.integer(
+                YamlVars.PROBE_SHARD_PROCESSES.integer(base, ConfigurationDefaults.PROBE_SHARD_PROCESSES)
+            ),
+        )
+        self.shards = self.shard_ids(self.shard_workers)
+
         # get all environment variables that match the pattern DNS_NAMESERVER_\d{1,}
         # and create a list of tuples with the nameserver and the IP
         self.nameservers = []
@@ -82,5 +237,49 @@ class NetProbeConfiguration:
                     if not any(d[1] == dns['ip'] for d in self.nameservers):
                         self.nameservers.append((dns['name'], dns['ip'], "internal"))
 
+    @staticmethod
+    def safe_id(value: str) -> str:
+        return str(value).strip().replace(' ', '_').replace('.', '_').replace('-', '_').lower()
+
+    def shard_ids(self, workers: list[str]) -> list[str]:
+        # every worker process across all containers, empty when the sites are not sharded
+        if self.shard_processes > 1:
+            workers = [f"{worker}_{index}" for worker in workers for index in range(self.shard_processes)]
+        return workers if len(workers) > 1 else []
+
+    def shard_id(self, index: int = 0) -> str:
+        return f"{self.device_id}_{index}" if self.shard_processes > 1 else self.device_id
+
+    def add_group(self, group: dict) -> None:
+        name = str(group['name'])
+        sites = [str(site) for site in group.get('sites') or []]
+        # groups from the environment win over groups of the same name in the file
+        if not sites or any(g.name == name for g in self.groups):
+            return
+
+        def value(key: str, default, cast):
+            return cast(group[key]) if group.get(key) not in (None, '') else default
+
+        self.groups.append(
+            ProbeGroupConfiguration(
+                name,
+                sites,
+                value('interval', self.interval, int),
+                value('count', self.count, int),
+                value('timeout', self.timeout, float),
+                value('threshold_loss', None, float),
+                value('threshold_latency', None, float),
+            )
+        )
+
+    def add_source(self, source: dict) -> None:
+        name = str(source['name'])
+        address = str(source['address']) if source.get('address') else None
+        interface = str(source['interface']) if source.get('interface') else None
+        # sources from the environment win over sources of the same name in the file
+        if not (address or interface) or any(s.name == name for s in self.sources):
+            return
+        self.sources.append(ProbeSourceConfiguration(name, address, interface))
+
     def merge(self, config: dict):
         self.__dict__.update(config)
@@ -0,0 +1,25 @@
+import typing
+
+
+class ProbeGroupConfiguration:
+    def __init__(
+        self,
+        name: str,
+        sites: typing.List[str],
+        interval: int,
+        count: int,
+        timeout: float,
+        threshold_loss: typing.Optional[float] = None,
+        threshold_latency: typing.Optional[float] = None,
+    ):
+        self.name = name
+        self.sites = sites
+        self.interval = interval
+        self.count = count
+        self.timeout = timeout
+        # None falls back to the presentation thresholds
+        self.threshold_loss = threshold_loss
+        self.threshold_latency = threshold_latency
+
+    def merge(self, config: dict):
+        self.__dict__.update(config)
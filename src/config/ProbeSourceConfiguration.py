@@ -0,0 +1,11 @@
+import typing
+
+
+class ProbeSourceConfiguration:
+    def __init__(self, name: str, address: typing.Optional[str] = None, interface: typing.Optional[str] = None):
+        self.name = name
+        self.address = address  # local address the probes are sent from
+        self.interface = interface  # device the probes are bound to, needs CAP_NET_RAW
+
+    def merge(self, config: dict):
+        self.__dict__.update(config)
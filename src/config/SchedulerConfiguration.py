@@ -0,0 +1,55 @@
+from lib.enums.ConfigurationDefaults import ConfigurationDefaults
+from lib.enums.EnvVars import EnvVars
+from lib.enums.LoadPolicies import LoadPolicies
+from lib.enums.OverrunPolicies import OverrunPolicies
+from lib.enums.YamlVars import YamlVars
+
+
+class SchedulerConfiguration:
+    def __init__(self, base: dict = {}):
+        # fraction of the interval each tick may be delayed by at random, so probes do not all fire at once
+        self.jitter = min(
+            1.0,
+            max(
+                0.0,
+                EnvVars.SCHEDULER_JITTER.float(
+                    YamlVars.SCHEDULER_JITTER.float(base, ConfigurationDefaults.SCHEDULER_JITTER)
+                ),
+            ),
+        )
+        self.overrun = OverrunPolicies.from_str(
+            EnvVars.SCHEDULER_OVERRUN.string(
+                YamlVars.SCHEDULER_OVERRUN.string(base, ConfigurationDefaults.SCHEDULER_OVERRUN)
+            )
+        )
+        # packets per second every probe in the process may send together, 0 for no limit
+        self.rate_limit = max(
+            0.0,
+            EnvVars.SCHEDULER_RATE_LIMIT.float(
+                YamlVars.SCHEDULER_RATE_LIMIT.float(base, ConfigurationDefaults.SCHEDULER_RATE_LIMIT)
+            ),
+        )
+        # packets that may be sent at once before the rest are spread out
+        self.rate_burst = max(
+            1,
+            EnvVars.SCHEDULER_RATE_BURST.integer(
+                YamlVars.SCHEDULER_RATE_BURST.integer(base, ConfigurationDefaults.SCHEDULER_RATE_BURST)
+            ),
+        )
+        # what the network probe does with the cycles a speed test overlaps: IGNORE, PAUSE or TAG
+        self.load_policy = LoadPolicies.from_str(
+            EnvVars.SCHEDULER_LOAD_POLICY.string(
+                YamlVars.SCHEDULER_LOAD_POLICY.string(base, ConfigurationDefaults.SCHEDULER_LOAD_POLICY)
+            )
+        )
+        # file the speed test locks while it runs, shared by the probe processes of one host
+        self.load_lock = EnvVars.SCHEDULER_LOAD_LOCK.string(
+            YamlVars.SCHEDULER_LOAD_LOCK.string(base, ConfigurationDefaults.SCHEDULER_LOAD_LOCK)
+        )
+        # also publish the speed test to the datastore, for probes running in other containers
+        self.load_shared = EnvVars.SCHEDULER_LOAD_SHARED.boolean(
+            YamlVars.SCHEDULER_LOAD_SHARED.boolean(base, ConfigurationDefaults.SCHEDULER_LOAD_SHARED)
+        )
+
+    def merge(self, config: dict):
+        self.__dict__.update(config)
@@ -1,5 +1,7 @@
+from config.SpeedTestHttpConfiguration import SpeedTestHttpConfiguration
 from lib.enums.ConfigurationDefaults import ConfigurationDefaults
 from lib.enums.EnvVars import EnvVars
+from lib.enums.SpeedTestBackends import SpeedTestBackends
 from lib.enums.YamlVars import YamlVars
 
 
@@ -11,6 +13,27 @@ class SpeedTestConfiguration:
         self.interval = EnvVars.SPEEDTEST_INTERVAL.integer(
             YamlVars.SPEEDTEST_INTERVAL.integer(base, ConfigurationDefaults.SPEEDTEST_INTERVAL)
         )
+        # the test runs in a child process that is stopped after `timeout` seconds and may map `memory_limit` MB
+        self.timeout = max(
+            1.0,
+            EnvVars.SPEEDTEST_TIMEOUT.float(
+                YamlVars.SPEEDTEST_TIMEOUT.float(base, ConfigurationDefaults.SPEEDTEST_TIMEOUT)
+            ),
+        )
+        self.memory_limit = EnvVars.SPEEDTEST_MEMORY_LIMIT.integer(
+            YamlVars.SPEEDTEST_MEMORY_LIMIT.integer(base, ConfigurationDefaults.SPEEDTEST_MEMORY_LIMIT)
+        )
+        # speedtest.net, or a lighter test against your own HTTP endpoints
+        self.backend = SpeedTestBackends.from_str(
+            EnvVars.SPEEDTEST_BACKEND.string(
+                YamlVars.SPEEDTEST_BACKEND.string(base, ConfigurationDefaults.SPEEDTEST_BACKEND)
+            )
+        )
+        self.http = SpeedTestHttpConfiguration(base)
+        # seconds the selected server is reused before the closest servers are tested again, 0 to select every run
+        self.server_ttl = EnvVars.SPEEDTEST_SERVER_TTL.integer(
+            YamlVars.SPEEDTEST_SERVER_TTL.integer(base, ConfigurationDefaults.SPEEDTEST_SERVER_TTL)
+        )
         self.weight_rebalance = EnvVars.SPEEDTEST_WEIGHT_REBALANCE.boolean(
             YamlVars.SPEEDTEST_WEIGHT_REBALANCE.boolean(base, ConfigurationDefaults.SPEEDTEST_WEIGHT_REBALANCE)
         )
@@ -29,6 +52,19 @@ class SpeedTestConfiguration:
         self.threshold_upload = EnvVars.THRESHOLD_SPEEDTEST_UPLOAD.float(
             YamlVars.THRESHOLD_SPEEDTEST_UPLOAD.float(base, ConfigurationDefaults.THRESHOLD_SPEEDTEST_UPLOAD)
         )
+        # pings `bufferbloat_target` during the test to measure the latency under load
+        self.bufferbloat = EnvVars.SPEEDTEST_BUFFERBLOAT.boolean(
+            YamlVars.SPEEDTEST_BUFFERBLOAT.boolean(base, ConfigurationDefaults.SPEEDTEST_BUFFERBLOAT)
+        )
+        self.bufferbloat_target = EnvVars.SPEEDTEST_BUFFERBLOAT_TARGET.string(
+            YamlVars.SPEEDTEST_BUFFERBLOAT_TARGET.string(base, ConfigurationDefaults.SPEEDTEST_BUFFERBLOAT_TARGET)
+        )
+        self.bufferbloat_rate = EnvVars.SPEEDTEST_BUFFERBLOAT_RATE.float(
+            YamlVars.SPEEDTEST_BUFFERBLOAT_RATE.float(base, ConfigurationDefaults.SPEEDTEST_BUFFERBLOAT_RATE)
+        )
+        self.bufferbloat_idle = EnvVars.SPEEDTEST_BUFFERBLOAT_IDLE.float(
+            YamlVars.SPEEDTEST_BUFFERBLOAT_IDLE.float(base, ConfigurationDefaults.SPEEDTEST_BUFFERBLOAT_IDLE)
+        )
         self.enforce_or_enabled = self.enforce_weight or self.enabled
 
     def merge(self, config: dict):
@@ -0,0 +1,46 @@
+from lib.enums.ConfigurationDefaults import ConfigurationDefaults
+from lib.enums.EnvVars import EnvVars
+from lib.enums.YamlVars import YamlVars
+
+
+class SpeedTestHttpConfiguration:
+    def __init__(self, base: dict = {}):
+        self.download_url = EnvVars.SPEEDTEST_HTTP_DOWNLOAD_URL.nullable(
+            YamlVars.SPEEDTEST_HTTP_DOWNLOAD_URL.nullable(base, None)
+        )
+        self.upload_url = EnvVars.SPEEDTEST_HTTP_UPLOAD_URL.nullable(
+            YamlVars.SPEEDTEST_HTTP_UPLOAD_URL.nullable(base, None)
+        )
+        # requested with HEAD to measure the latency, the download url when not set
+        self.latency_url = EnvVars.SPEEDTEST_HTTP_LATENCY_URL.nullable(
+            YamlVars.SPEEDTEST_HTTP_LATENCY_URL.nullable(base, None)
+        )
+        self.streams = max(
+            1,
+            EnvVars.SPEEDTEST_HTTP_STREAMS.integer(
+                YamlVars.SPEEDTEST_HTTP_STREAMS.integer(base, ConfigurationDefaults.SPEEDTEST_HTTP_STREAMS)
+            ),
+        )
+        # each direction stops after this many bytes or seconds, whichever comes first (0 for no byte budget)
+        self.bytes = EnvVars.SPEEDTEST_HTTP_BYTES.integer(
+            YamlVars.SPEEDTEST_HTTP_BYTES.integer(base, ConfigurationDefaults.SPEEDTEST_HTTP_BYTES)
+        )
+        self.duration = max(
+            1.0,
+            EnvVars.SPEEDTEST_HTTP_DURATION.float(
+                YamlVars.SPEEDTEST_HTTP_DURATION.float(base, ConfigurationDefaults.SPEEDTEST_HTTP_DURATION)
+            ),
+        )
+        # stop early once the rate varies less than this fraction, 0 to always use the whole budget
+        self.stability = EnvVars.SPEEDTEST_HTTP_STABILITY.float(
+            YamlVars.SPEEDTEST_HTTP_STABILITY.float(base, ConfigurationDefaults.SPEEDTEST_HTTP_STABILITY)
+        )
+        self.timeout = EnvVars.SPEEDTEST_HTTP_TIMEOUT.float(
+            YamlVars.SPEEDTEST_HTTP_TIMEOUT.float(base, ConfigurationDefaults.SPEEDTEST_HTTP_TIMEOUT)
+        )
+        self.verify_ssl = EnvVars.SPEEDTEST_HTTP_VERIFY_SSL.boolean(
+            YamlVars.SPEEDTEST_HTTP_VERIFY_SSL.boolean(base, ConfigurationDefaults.SPEEDTEST_HTTP_VERIFY_SSL)
+        )
+
+    def merge(self, config: dict):
+        self.__dict__.update(config)
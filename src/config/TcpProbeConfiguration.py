@@ -0,0 +1,26 @@
+from lib.enums.ConfigurationDefaults import ConfigurationDefaults
+from lib.enums.EnvVars import EnvVars
+from lib.enums.YamlVars import YamlVars
+
+
+class TcpProbeConfiguration:
+    def __init__(self, base: dict = {}):
+        self.enabled = EnvVars.TCP_ENABLED.boolean(
+            YamlVars.TCP_ENABLED.boolean(base, ConfigurationDefaults.TCP_ENABLED)
+        )
+        self.interval = EnvVars.TCP_INTERVAL.integer(
+            YamlVars.TCP_INTERVAL.integer(base, ConfigurationDefaults.TCP_INTERVAL)
+        )
+        self.count = EnvVars.TCP_COUNT.integer(YamlVars.TCP_COUNT.integer(base, ConfigurationDefaults.TCP_COUNT))
+        self.timeout = EnvVars.TCP_TIMEOUT.float(YamlVars.TCP_TIMEOUT.float(base, ConfigurationDefaults.TCP_TIMEOUT))
+        self.concurrency = max(
+            1,
+            EnvVars.TCP_CONCURRENCY.integer(
+                YamlVars.TCP_CONCURRENCY.integer(base, ConfigurationDefaults.TCP_CONCURRENCY)
+            ),
+        )
+        # host:port pairs, IPv6 addresses in brackets: [2606:4700::1111]:443
+        self.targets = EnvVars.TCP_TARGETS.list(',', YamlVars.TCP_TARGETS.list(base, ConfigurationDefaults.TCP_TARGETS))
+
+    def merge(self, config: dict):
+        self.__dict__.update(config)
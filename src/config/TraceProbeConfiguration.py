@@ -0,0 +1,32 @@
+from lib.enums.ConfigurationDefaults import ConfigurationDefaults
+from lib.enums.EnvVars import EnvVars
+from lib.enums.YamlVars import YamlVars
+
+
+class TraceProbeConfiguration:
+    def __init__(self, base: dict = {}):
+        self.enabled = EnvVars.TRACE_ENABLED.boolean(
+            YamlVars.TRACE_ENABLED.boolean(base, ConfigurationDefaults.TRACE_ENABLED)
+        )
+        self.interval = EnvVars.TRACE_INTERVAL.integer(
+            YamlVars.TRACE_INTERVAL.integer(base, ConfigurationDefaults.TRACE_INTERVAL)
+        )
+        # rounds of probes to every hop per cycle
+        self.count = EnvVars.TRACE_COUNT.integer(YamlVars.TRACE_COUNT.integer(base, ConfigurationDefaults.TRACE_COUNT))
+        self.max_hops = max(
+            1,
+            EnvVars.TRACE_MAX_HOPS.integer(YamlVars.TRACE_MAX_HOPS.integer(base, ConfigurationDefaults.TRACE_MAX_HOPS)),
+        )
+        self.timeout = EnvVars.TRACE_TIMEOUT.float(
+            YamlVars.TRACE_TIMEOUT.float(base, ConfigurationDefaults.TRACE_TIMEOUT)
+        )
+        # probes each hop's statistics cover, across cycles
+        self.window = max(
+            1, EnvVars.TRACE_WINDOW.integer(YamlVars.TRACE_WINDOW.integer(base, ConfigurationDefaults.TRACE_WINDOW))
+        )
+        self.targets = EnvVars.TRACE_TARGETS.list(
+            ',', YamlVars.TRACE_TARGETS.list(base, ConfigurationDefaults.TRACE_TARGETS)
+        )
+
+    def merge(self, config: dict):
+        self.__dict__.update(config)
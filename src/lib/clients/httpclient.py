@@ -0,0 +1,266 @@
+import asyncio
+import socket
+import ssl
+import time
+import typing
+from urllib.parse import urlsplit
+
+
+class HttpResponse:
+    def __init__(self, status: int, headers: typing.Dict[str, str], size: int, reused: bool, timings: dict):
+        self.status = status
+        self.headers = headers
+        self.size = size  # body bytes read
+        self.reused = reused  # True when the request went over a pooled keep-alive connection
+        self.timings = timings  # phase durations in ms: dns, connect, tls, ttfb, transfer, total
+
+
+class HttpConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @property
+    def stale(self) -> bool:
+        return self.reader.at_eof() or self.writer.is_closing()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class HttpClient:
+    """Minimal asyncio HTTP/1.1 client that times each phase of a request.
+
+    With `keepalive` enabled, connections are pooled per scheme, host and port and reused by later requests, which
+    then skip the DNS, connect and TLS phases. Pooled connections belong to the event loop that opened them, so the
+    client has to be used from one long-lived loop.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    ZEROES = bytes(CHUNK_SIZE)  # request bodies are sent from this buffer
+
+    def __init__(self, timeout: float = 10, keepalive: bool = False, verify_ssl: bool = True):
+        self.timeout = timeout
+        self.keepalive = keepalive
+        self.ssl_context = ssl.create_default_context()
+        if not verify_ssl:
+            self.ssl_context.check_hostname = False
+            self.ssl_context.verify_mode = ssl.CERT_NONE
+        self.pool: typing.Dict[typing.Tuple[str, str, int], typing.List[HttpConnection]] = {}
+
+    def close(self) -> None:
+        for connections in self.pool.values():
+            for connection in connections:
+                connection.close()
+        self.pool = {}
+
+    async def request(
+        self,
+        url: str,
+        method: str = "GET",
+        body_size: int = 0,
+        progress: typing.Optional[typing.Callable[[int], None]] = None,
+    ) -> HttpResponse:
+        """Sends a request and reads (and discards) the whole response body.
+
+        A `body_size` above 0 sends that many zero bytes as the request body. `progress` is called with the size of
+        every chunk of the request and response bodies as it is sent or received.
+        """
+        return await asyncio.wait_for(self._request(url, method, body_size, progress), self.timeout)
+
+    async def _request(
+        self, url: str, method: str, body_size: int, progress: typing.Optional[typing.Callable[[int], None]]
+    ) -> HttpResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported url '{url}'")
+        host = parts.hostname
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        host_header = f"[{host}]" if ":" in host else host
+        if parts.port is not None:
+            host_header = f"{host_header}:{port}"
+        head = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {host_header}",
+            "User-Agent: netprobe",
+            "Accept: */*",
+            f"Connection: {'keep-alive' if self.keepalive else 'close'}",
+        ]
+        if body_size > 0:
+            head += ["Content-Type: application/octet-stream", f"Content-Length: {body_size}"]
+        request = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1")
+        key = (scheme, host, port)
+        body = (body_size, progress)
+
+        connection = self._checkout(key)
+        if connection is not None:
+            try:
+                timings = {"dns": 0.0, "connect": 0.0, "tls": 0.0}
+                return await self._exchange(key, connection, True, method, request, body, time.perf_counter(), timings)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # the server closed the idle connection, retry on a new one
+                pass
+
+        timings = {}
+        started = time.perf_counter()
+        connection = await self._connect(scheme, host, port, timings)
+        return await self._exchange(key, connection, False, method, request, body, started, timings)
+
+    async def _exchange(
+        self,
+        key: typing.Tuple[str, str, int],
+        connection: HttpConnection,
+        reused: bool,
+        method: str,
+        request: bytes,
+        body: typing.Tuple[int, typing.Optional[typing.Callable[[int], None]]],
+        started: float,
+        timings: dict,
+    ) -> HttpResponse:
+        body_size, progress = body
+        try:
+            connection.writer.write(request)
+            await connection.writer.drain()
+            remaining = body_size
+            while remaining > 0:
+                chunk = self.ZEROES[: min(remaining, self.CHUNK_SIZE)]
+                connection.writer.write(chunk)
+                await connection.writer.drain()
+                remaining -= len(chunk)
+                if progress is not None:
+                    progress(len(chunk))
+            sent = time.perf_counter()
+
+            status_line = await connection.reader.readline()
+            first_byte = time.perf_counter()
+            if not status_line:
+                raise ConnectionError("Connection closed before a response was received")
+            status, headers = await self._read_head(status_line, connection.reader)
+
+            size, complete = await self._read_body(method, status, headers, connection.reader, progress)
+            finished = time.perf_counter()
+        except BaseException:
+            connection.close()
+            raise
+
+        timings["ttfb"] = (first_byte - sent) * 1000
+        timings["transfer"] = (finished - first_byte) * 1000
+        timings["total"] = (finished - started) * 1000
+
+        if self.keepalive and complete and headers.get("connection", "").lower() != "close":
+            self.pool.setdefault(key, []).append(connection)
+        else:
+            connection.close()
+
+        return HttpResponse(status, headers, size, reused, timings)
+
+    def _checkout(self, key: typing.Tuple[str, str, int]) -> typing.Optional[HttpConnection]:
+        connections = self.pool.get(key, [])
+        while connections:
+            connection = connections.pop()
+            if not connection.stale:
+                return connection
+            connection.close()
+        return None
+
+    async def _connect(self, scheme: str, host: str, port: int, timings: dict) -> HttpConnection:
+        loop = asyncio.get_running_loop()
+
+        started = time.perf_counter()
+        addresses = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        family, _, proto, _, sockaddr = addresses[0]
+        resolved = time.perf_counter()
+
+        sock = socket.socket(family, socket.SOCK_STREAM, proto)
+        sock.setblocking(False)
+        try:
+            await loop.sock_connect(sock, sockaddr)
+            connected = time.perf_counter()
+
+            if scheme == "https":
+                reader, writer = await asyncio.open_connection(sock=sock, ssl=self.ssl_context, server_hostname=host)
+            else:
+                reader, writer = await asyncio.open_connection(sock=sock)
+            handshaken = time.perf_counter()
+        except BaseException:
+            sock.close()
+            raise
+
+        timings["dns"] = (resolved - started) * 1000
+        timings["connect"] = (connected - resolved) * 1000
+        timings["tls"] = (handshaken - connected) * 1000 if scheme == "https" else 0.0
+        return HttpConnection(reader, writer)
+
+    async def _read_head(
+        self, status_line: bytes, reader: asyncio.StreamReader
+    ) -> typing.Tuple[int, typing.Dict[str, str]]:
+        # HTTP/1.1 200 OK
+        parts = status_line.decode("latin-1").split(" ", 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+            raise ConnectionError(f"Invalid status line {status_line!r}")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return int(parts[1]), headers
+
+    async def _read_body(
+        self,
+        method: str,
+        status: int,
+        headers: typing.Dict[str, str],
+        reader: asyncio.StreamReader,
+        progress: typing.Optional[typing.Callable[[int], None]] = None,
+    ) -> typing.Tuple[int, bool]:
+        # returns the number of body bytes read and whether the connection is left at a message boundary
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return 0, True
+
+        size = 0
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                chunk_size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if chunk_size == 0:
+                    # skip trailers
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return size, True
+                remaining = chunk_size
+                while remaining > 0:
+                    data = await reader.read(min(remaining, self.CHUNK_SIZE))
+                    if not data:
+                        return size, False
+                    remaining -= len(data)
+                    size += len(data)
+                    if progress is not None:
+                        progress(len(data))
+                await reader.readline()
+
+        if "content-length" in headers:
+            remaining = int(headers["content-length"])
+            while remaining > 0:
+                data = await reader.read(min(remaining, self.CHUNK_SIZE))
+                if not data:
+                    return size, False
+                remaining -= len(data)
+                size += len(data)
+                if progress is not None:
+                    progress(len(data))
+            return size, True
+
+        # no framing, the body ends when the server closes the connection
+        while True:
+            data = await reader.read(self.CHUNK_SIZE)
+            if not data:
+                return size, False
+            size += len(data)
+            if progress is not None:
+                progress(len(data))
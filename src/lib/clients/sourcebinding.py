@@ -0,0 +1,45 @@
+import fcntl
+import ipaddress
+import socket
+import struct
+import typing
+
+from config.ProbeSourceConfiguration import ProbeSourceConfiguration
+
+SIOCGIFADDR = 0x8915
+
+
+def interface_address(interface: str) -> typing.Optional[str]:
+    # the IPv4 address of a network device, None if it has none
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        request = struct.pack("256s", interface[:15].encode())
+        return socket.inet_ntoa(fcntl.ioctl(sock.fileno(), SIOCGIFADDR, request)[20:24])
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+
+def source_address(source: typing.Optional[ProbeSourceConfiguration], family: int) -> typing.Optional[str]:
+    """Returns the local address to send from for `family`, None to let the routing table pick it."""
+    if source is None:
+        return None
+    address = source.address
+    if address is None and source.interface and family == socket.AF_INET:
+        address = interface_address(source.interface)
+    if address is None:
+        return None
+    version = 6 if family == socket.AF_INET6 else 4
+    return address if ipaddress.ip_address(address).version == version else None
+
+
+def bind_socket(sock: socket.socket, source: typing.Optional[ProbeSourceConfiguration]) -> None:
+    """Binds a socket to the source's device and address, so it leaves through that uplink."""
+    if source is None:
+        return
+    if source.interface:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BINDTODEVICE, source.interface.encode())
+    address = source_address(source, sock.family)
+    if address is not None:
+        sock.bind((address, 0))
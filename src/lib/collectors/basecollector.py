@@ -9,5 +9,12 @@ class BaseCollector:
         config = ApplicationConfiguration
         self.logger = setup_logging(self.__class__.__name__, config.logging)
 
+    def start(self) -> None:
+        # called when the collector is scheduled, before its first collect()
+        pass
+
     def collect(self) -> typing.Optional[dict]:
         return None
+
+    def close(self) -> None:
+        pass
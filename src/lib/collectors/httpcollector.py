@@ -0,0 +1,89 @@
+import asyncio
+import json
+import traceback
+import typing
+
+from lib.clients.httpclient import HttpClient, HttpResponse
+from lib.collectors.basecollector import BaseCollector
+from lib.schedulers.ratelimiter import SharedRateLimiter
+from lib.stats.rttsamples import RttSamples
+
+
+class HttpCollector(BaseCollector):
+    """Times HTTP(S) requests to each url and breaks them down into dns, connect, tls, ttfb and transfer phases."""
+
+    PHASES = ["dns", "connect", "tls", "ttfb", "transfer", "total"]
+    CONNECTION_PHASES = ["dns", "connect", "tls"]  # only timed by requests that opened a new connection
+
+    def __init__(
+        self,
+        urls: typing.List[str],
+        count: int,
+        timeout: float = 10,
+        keepalive: bool = False,
+        verify_ssl: bool = True,
+        concurrency: int = 16,
+    ):
+        super().__init__()
+        self.urls = urls
+        self.count = count
+        self.concurrency = concurrency  # Max requests in flight
+        self.client = HttpClient(timeout, keepalive, verify_ssl)
+        # pooled keep-alive connections are bound to the loop that opened them, so one loop is kept for every cycle
+        self.loop = asyncio.new_event_loop()
+
+    def collect(self) -> typing.Optional[dict]:
+        try:
+            return {"http_stats": self.loop.run_until_complete(self._collect_all())}
+        except Exception as e:
+            self.logger.error("Error collecting HTTP stats")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return None
+
+    def close(self) -> None:
+        self.client.close()
+        self.loop.close()
+
+    async def _collect_all(self) -> typing.List[dict]:
+        limit = asyncio.Semaphore(self.concurrency)
+        return list(await asyncio.gather(*[self._probe(limit, url) for url in self.urls]))
+
+    async def _probe(self, limit: asyncio.Semaphore, url: str) -> dict:
+        # requests to the same url are sent one after the other so later ones can reuse the connection
+        responses: typing.List[HttpResponse] = []
+        for _ in range(self.count):
+            async with limit:
+                await SharedRateLimiter.wait("http")
+                try:
+                    responses.append(await self.client.request(url))
+                except (asyncio.TimeoutError, OSError, ValueError, asyncio.IncompleteReadError) as e:
+                    self.logger.debug(f"Error requesting {url}: {e!r}")
+
+        totals = RttSamples(response.timings["total"] for response in responses)
+        for _ in range(self.count - len(responses)):
+            totals.add(None)
+        httpdata: typing.Dict[str, typing.Any] = {
+            "url": url,
+            "status": responses[-1].status if responses else 0,
+            "samples": self.count,
+            "loss": totals.loss,
+        }
+        if responses:
+            cold = [response for response in responses if not response.reused]
+            for phase in self.PHASES:
+                # reused connections record 0 for the connection phases, they would only dilute them
+                timed = cold if phase in self.CONNECTION_PHASES else responses
+                if timed:
+                    httpdata[phase] = round(sum(response.timings[phase] for response in timed) / len(timed), 3)
+            summary = totals.summary(url)
+            for stat in ["p50", "p90", "max"]:
+                httpdata[f"total_{stat}"] = summary[stat]
+            httpdata["bytes"] = responses[-1].size
+            httpdata["reused"] = len([response for response in responses if response.reused])
+        else:
+            for phase in self.PHASES:
+                httpdata[phase] = -1
+
+        self.logger.debug(json.dumps(httpdata, indent=4))
+        return httpdata
@@ -0,0 +1,120 @@
+import multiprocessing
+import resource
+import signal
+import sys
+import time
+import traceback
+import typing
+from multiprocessing.connection import Connection
+
+from lib.collectors.basecollector import BaseCollector
+from lib.datastores.factory import DatastoreFactory
+
+
+def collect_isolated(
+    factory: typing.Callable[..., BaseCollector], args: tuple, memory_limit: int, connection: Connection
+) -> None:
+    # runs in the child process, SIGTERM unwinds it so the collector is closed on the way out
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    if memory_limit > 0:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    collector = factory(*args)
+    collector.on_partial = lambda results: connection.send(("partial", results))  # type: ignore
+    try:
+        connection.send(("done", collector.collect()))
+    finally:
+        collector.close()
+        # the connections the collector used end with the child
+        DatastoreFactory.close_all()
+        connection.close()
+
+
+class IsolatedCollector(BaseCollector):
+    """Runs another collector in a child process with a hard wall-clock timeout and an address space limit.
+
+    The collector is created in the child from `factory(*args)`, so its buffers and threads never live in the probe
+    process and a hung transfer cannot stall it: once `timeout` seconds have passed the child is terminated, then
+    killed if it does not exit within GRACE seconds. Collectors with an `on_partial` attribute report the results of
+    every phase they finish, and when the child does not return a result those are returned with `partial` set.
+    `close()` stops a running child, so it does not outlive the probe.
+    """
+
+    GRACE = 5
+
+    def __init__(self, timeout: float, memory_limit: int, factory: typing.Callable[..., BaseCollector], *args):
+        super().__init__()
+        self.timeout = timeout
+        self.memory_limit = memory_limit  # bytes, 0 for no limit
+        self.factory = factory
+        self.args = args
+        # a fresh interpreter, forking would copy the probe's threads and locks
+        self.context = multiprocessing.get_context("spawn")
+        self.process: typing.Optional[multiprocessing.process.BaseProcess] = None
+
+    def collect(self) -> typing.Optional[dict]:
+        receiver, sender = self.context.Pipe(duplex=False)
+        process = self.context.Process(
+            target=collect_isolated,
+            args=(self.factory, self.args, self.memory_limit, sender),
+            name=self.factory.__name__,
+            daemon=True,
+        )
+        results = None
+        partial: typing.Optional[dict] = None
+        timed_out = False
+        try:
+            process.start()
+            self.process = process
+            sender.close()
+            deadline = time.monotonic() + self.timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    self.logger.warning(f"{self.factory.__name__} did not finish within {self.timeout}s, stopping it")
+                    break
+                if not receiver.poll(remaining):
+                    continue
+                try:
+                    kind, data = receiver.recv()
+                except EOFError:
+                    # the child exited without a result: crashed, out of memory or stopped
+                    if process.exitcode not in (None, 0):
+                        self.logger.warning(f"{self.factory.__name__} exited with code {process.exitcode}")
+                    break
+                if kind == "partial":
+                    partial = data
+                else:
+                    results = data
+                    break
+        except Exception as e:
+            self.logger.error(f"Error running {self.factory.__name__}")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+        finally:
+            if process.pid is not None and not timed_out:
+                # let the child close the collector after it sent its result
+                process.join(self.GRACE)
+            self._stop(process)
+            receiver.close()
+            self.process = None
+
+        if results is None and partial:
+            self.logger.warning(f"{self.factory.__name__} returned partial results: {', '.join(partial)}")
+            return {**partial, "partial": 1}
+        return results
+
+    def close(self) -> None:
+        process = self.process
+        if process is not None:
+            self._stop(process)
+
+    def _stop(self, process: multiprocessing.process.BaseProcess) -> None:
+        if process.pid is None or process.exitcode is not None:
+            return
+        process.terminate()
+        process.join(self.GRACE)
+        if process.exitcode is None:
+            self.logger.warning(f"{self.factory.__name__} did not exit on SIGTERM, killing it")
+            process.kill()
+            process.join()
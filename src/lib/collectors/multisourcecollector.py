@@ -0,0 +1,46 @@
+import traceback
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+from lib.collectors.basecollector import BaseCollector
+from lib.collectors.networkcollector import NetworkCollector
+
+
+class MultiSourceCollector(BaseCollector):
+    """Runs one NetworkCollector per uplink at the same time and merges their results.
+
+    The collectors share the worker pool, which has one worker per source on top of the probe concurrency, so every
+    source can wait on its pings and DNS tests while the rest of the pool runs them. Each record is tagged with the
+    name of its source.
+    """
+
+    def __init__(self, collectors: typing.List[NetworkCollector], executor: ThreadPoolExecutor):
+        super().__init__()
+        self.collectors = collectors
+        self.executor = executor
+
+    def start(self) -> None:
+        for collector in self.collectors:
+            collector.start()
+
+    def collect(self) -> typing.Optional[dict]:
+        futures = [self.executor.submit(collector.collect) for collector in self.collectors]
+        merged: typing.Dict[str, list] = {"stats": [], "dns_stats": []}
+        for collector, future in zip(self.collectors, futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                self.logger.error(f"Error collecting network stats from {collector.source.name}")  # type: ignore
+                self.logger.error(e)
+                self.logger.error(traceback.format_exc())
+                continue
+            if results is None:
+                continue
+            merged["stats"].extend(results.get("stats", []))
+            merged["dns_stats"].extend(results.get("dns_stats", []))
+        return merged
+
+    def close(self) -> None:
+        for collector in self.collectors:
+            collector.close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
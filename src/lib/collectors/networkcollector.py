@@ -1,137 +1,86 @@
-import json
-import os
-import re
-import subprocess
+import functools
+import time
 import traceback
 import typing
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor, wait
 
-import dns.resolver
+from config.ProbeSourceConfiguration import ProbeSourceConfiguration
 from lib.collectors.basecollector import BaseCollector
+from lib.enums.PingerTypes import PingerTypes
+from lib.enums.ProbeModes import ProbeModes
+from lib.pingers.factory import PingerFactory
+from lib.pingers.icmp import IcmpPinger
+from lib.pingers.stream import StreamPinger
+from lib.resolvers.dnsprober import DnsProber
+from lib.resolvers.resolvecache import Resolution, SharedResolveCache
+from lib.schedulers.cadence import AdaptiveCadence
+from lib.stats.rttsamples import RttSamples
+
+T = typing.TypeVar("T")
 
 
 class NetworkCollector(BaseCollector):  # Main network collection class
-    def __init__(self, sites: list[str], count: int, dns_test_site: str, nameservers: list[tuple[str, str, str]]):
+    RESOLVE_SHARE = 0.5  # of the cycle deadline name resolution may take, the pings get the rest
+
+    def __init__(
+        self,
+        sites: list[str],
+        count: int,
+        dns_test_sites: list[str],
+        nameservers: list[tuple[str, str, str]],
+        backend: PingerTypes = PingerTypes.ICMP,
+        concurrency: int = 16,
+        dns_concurrency: int = 0,
+        dns_timeout: float = 10,
+        dns_record_types: typing.Optional[list[str]] = None,
+        dns_samples: int = 1,
+        dns_cache_miss: bool = False,
+        mode: ProbeModes = ProbeModes.BURST,
+        stream_rate: float = 1,
+        stream_window: float = 60,
+        cadence: typing.Optional[AdaptiveCadence] = None,
+        dns_interval: float = 0,
+        timeout: float = 2,
+        deadline: typing.Optional[float] = None,
+        source: typing.Optional[ProbeSourceConfiguration] = None,
+        executor: typing.Optional[ThreadPoolExecutor] = None,
+    ):
         super().__init__()
         self.sites = sites  # List of sites to ping
-        self.count = str(count)  # Number of pings
+        self.count = count  # Number of pings
         self.stats = []  # List of stat dicts
         self.dnsstats = []  # List of stat dicts
-        self.dns_test_site = dns_test_site  # Site used to test DNS response times
+        self.dns_test_sites = dns_test_sites  # Sites used to test DNS response times
         self.nameservers = nameservers
-
-    def pingtest(self, count, site) -> bool:
-        ping = None
-        if os.name == "nt":
-            # This is only for testing purposes locally.
-            self.logger.warning("Windows detected, using fake ping")
-            try:
-                ping = """10 packets transmitted, 10 received, 0% packet loss, time 9011ms
-rtt min/avg/max/mdev = 11.487/12.915/14.475/1.095 ms"""
-            except Exception as e:
-                self.logger.error(f"Error pinging {site}")
-                self.logger.error(e)
-                self.logger.error(traceback.format_exc())
-                return False
-        else:
-            try:
-                ping = subprocess.getoutput(f"ping -n -i 0.1 -c {count} {site} | grep 'rtt\\|loss'")
-                # 10 packets transmitted, 10 received, 0% packet loss, time 9011ms
-                # rtt min/avg/max/mdev = 11.487/12.915/14.475/1.095 ms
-
-                # logger.debug(ping)
-                # loss = ping.split(' ')[5].strip('%')
-                # latency = ping.split('/')[4]
-                # jitter = ping.split('/')[6].split(' ')[0]
-
-            except Exception as e:
-                self.logger.error(f"Error pinging {site}")
-                self.logger.error(e)
-                self.logger.error(traceback.format_exc())
-                return False
-
-        if ping is None:
-            self.logger.error(f"Error pinging {site}. No output from ping command")
-            return False
-
-        try:
-            self.logger.debug(ping)
-            loss_regex = re.compile(r"(\d+)% packet loss", re.MULTILINE | re.DOTALL | re.IGNORECASE)
-            latency_regex = re.compile(
-                r"^rtt\s.*?(\d+\.\d+)/(\d+\.\d+)/(\d+\.\d+)/(\d+\.\d+)\sms", re.MULTILINE | re.DOTALL | re.IGNORECASE
-            )
-
-            loss_match = loss_regex.search(ping)
-            latency_match = latency_regex.search(ping)
-            loss = 0
-            latency = 0
-            jitter = 0
-
-            if loss_match:
-                loss = float(loss_match.group(1))
+        # the uplink every site and nameserver is probed from, None for the default route
+        self.source = source
+        self.dnsprober = DnsProber(dns_timeout, dns_concurrency, dns_record_types, dns_samples, dns_cache_miss, source)
+        # Workers are reused across cycles and cap how many probes run at once, the sources of a
+        # multi-WAN probe share one pool
+        self.owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix=self.__class__.__name__
+        )
+        self.pinger = PingerFactory().create(backend, self.executor, timeout, source)
+        # with an adaptive cadence only the sites that are due are pinged, the others keep their last result
+        self.cadence = cadence
+        self.results: dict[str, dict] = {}
+        self.dns_interval = dns_interval  # 0 runs the DNS tests every cycle
+        # seconds a cycle may take, whatever has not answered by then is reported as lost
+        self.deadline = deadline
+        self.dns_due = 0.0
+        self.dns_results = []
+        self.stream = None
+        if mode == ProbeModes.STREAM:
+            if IcmpPinger.available():
+                self.stream = StreamPinger(sites, stream_rate, stream_window, timeout, source)
             else:
-                loss = -1
-                self.logger.critical("Ping output did not match expected format")
-            if latency_match:
-                latency = float(latency_match.group(2))
-                jitter = float(latency_match.group(4))
-            else:
-                self.logger.critical("Ping output did not match expected format")
-                latency = -1
-                jitter = -1
-
-            # check that the values are valid
-            if loss >= 0 or latency == 0 or jitter == 0:
-                netdata = {"site": site, "latency": latency, "loss": loss, "jitter": jitter}
-                self.logger.debug(json.dumps(netdata, indent=4))
-                self.stats.append(netdata)
-            else:
-                self.logger.warning(f"Invalid ping results for {site}")
-
-        except Exception as e:
-            self.logger.error(f"Error parsing ping output for {site}")
-            self.logger.error(e)
-            self.logger.error(traceback.format_exc())
-            return False
-
-        return True
-
-    def dnstest(self, site, nameserver) -> bool:
-        resolver = dns.resolver.Resolver()
-        server = []  # Resolver needs a list
-        server.append(nameserver[1])
-
-        try:
-            resolver.nameservers = server
-            resolver.timeout = 10
-            answers = resolver.query(site, 'A')
-
-            dns_latency = round(answers.response.time * 1000, 2)
+                self.logger.warning("ICMP sockets are not available, falling back to BURST mode")
 
-            dnsdata = {
-                "nameserver": nameserver[0],
-                "nameserver_ip": nameserver[1],
-                "type": nameserver[2] if len(nameserver) == 3 else "external",
-                "latency": dns_latency,
-            }
-
-            self.dnsstats.append(dnsdata)
-
-        except Exception as e:
-            self.logger.error(f"Error performing DNS resolution on {nameserver}")
-            self.logger.error(e)
-            self.logger.error(traceback.format_exc())
-
-            # dnsdata = {
-            #     "nameserver": nameserver[0],
-            #     "nameserver_ip": nameserver[1],
-            #     "type": nameserver[2] if len(nameserver) == 3 else "external",
-            #     "latency": 5000,
-            # }
-
-            # self.dnsstats.append(dnsdata)
-
-        return True
+    def start(self) -> None:
+        # the stream fills its windows between cycles, so it starts before the first one
+        if self.stream is not None:
+            self.stream.start()
 
     def collect(self) -> typing.Optional[dict]:
         try:
@@ -139,31 +88,40 @@ rtt min/avg/max/mdev = 11.487/12.915/14.475/1.095 ms"""
             self.stats = []
             self.dnsstats = []
 
-            # Create threads, start them
-            threads = []
-
-            for item in self.sites:
-                t = Thread(target=self.pingtest, args=(self.count, item))
-                threads.append(t)
-                t.start()
-
-            # Wait for threads to complete
-            for t in threads:
-                t.join()
-
-            # Create threads, start them
-            threads = []
-
-            for item in self.nameservers:
-                s = Thread(target=self.dnstest, args=(self.dns_test_site, item))
-                threads.append(s)
-                s.start()
+            if self.stream is not None:
+                self.stream.start()
+                # publish what the window holds now, once the first replies are in
+                stream_stats = self.stream.snapshot()
+                if not stream_stats:
+                    self.logger.debug("No replies since the ping stream started, skipping this cycle")
+                    return None
+
+            now = time.monotonic()
+            dns_future = None
+            if self.nameservers and now >= self.dns_due:
+                # Queue the DNS tests first so they run while the sites are pinged
+                dns_future = self.executor.submit(
+                    self.dnsprober.probe, self.dns_test_sites, self.nameservers, self.deadline
+                )
+                self.dns_due = now + self.dns_interval
+            if self.stream is not None:
+                self.stats = stream_stats
+            elif self.cadence is not None:
+                self.stats = self.ping_due(now)
+            else:
+                self.stats = self.ping(self.sites, self.count, self.deadline)
 
-            # Wait for threads to complete
-            for s in threads:
-                s.join()
+            # Wait for the DNS tests to complete
+            if dns_future is not None:
+                self.dns_results = dns_future.result()
+            self.dnsstats = self.dns_results
 
             results = {"stats": self.stats, "dns_stats": self.dnsstats}
+            if self.source is not None:
+                results = {
+                    key: [{**record, "source": self.source.name} for record in records]
+                    for key, records in results.items()
+                }
 
             return results
         except Exception as e:
@@ -171,3 +129,79 @@ rtt min/avg/max/mdev = 11.487/12.915/14.475/1.095 ms"""
             self.logger.error(e)
             self.logger.error(traceback.format_exc())
             return None
+
+    def ping(self, sites: list[str], count: int, deadline: typing.Optional[float]) -> list[dict]:
+        # sites are resolved once, from the shared cache, and pinged by address
+        started = time.monotonic()
+        timeout = deadline * self.RESOLVE_SHARE if deadline is not None else None
+        resolutions = self.resolve(sites, timeout)
+        results: dict[str, dict] = {}
+        rounds: list[dict[str, str]] = []  # address: site, sites that share an address are pinged in separate rounds
+        for site in dict.fromkeys(sites):
+            resolution = resolutions.get(site)
+            if resolution is None:
+                self.logger.warning(f"Resolving {site} did not finish before the cycle deadline")
+                results[site] = RttSamples([None] * count).summary(site)
+            elif resolution.address is None:
+                # reported without latency or loss, a name that does not resolve says nothing about the path
+                results[site] = {"site": site, **resolution.fields()}
+            else:
+                ping_round = next((addresses for addresses in rounds if resolution.address not in addresses), None)
+                if ping_round is None:
+                    ping_round = {}
+                    rounds.append(ping_round)
+                ping_round[resolution.address] = site
+
+        if deadline is not None:
+            deadline = max(0.0, deadline - (time.monotonic() - started))
+
+        def ping_round_sites(addresses: dict[str, str]) -> list[tuple[str, dict]]:
+            netdatas = self.pinger.ping(list(addresses), count, deadline)
+            return [(addresses[netdata["site"]], netdata) for netdata in netdatas if netdata["site"] in addresses]
+
+        pinged = self.concurrently([functools.partial(ping_round_sites, addresses) for addresses in rounds])
+        for site, netdata in (pair for round_results in pinged for pair in round_results):
+            results[site] = {**netdata, "site": site, **resolutions[site].fields()}
+        return [results[site] for site in sites if site in results]
+
+    def resolve(self, sites: list[str], timeout: typing.Optional[float]) -> dict[str, Resolution]:
+        """Resolves the sites that can be resolved within `timeout` seconds."""
+        futures = {site: SharedResolveCache.submit(site) for site in dict.fromkeys(sites)}
+        if futures:
+            wait(list(futures.values()), timeout)
+        # the lookups still running go on in the background, the next cycles find them in the cache or in flight
+        return {site: future.result() for site, future in futures.items() if future.done() and not future.exception()}
+
+    def concurrently(self, calls: list[typing.Callable[[], T]]) -> list[T]:
+        # the extra calls run alongside the first, so each one gets the whole deadline of the cycle
+        if len(calls) <= 1:
+            return [call() for call in calls]
+        with ThreadPoolExecutor(len(calls) - 1, thread_name_prefix=self.__class__.__name__) as executor:
+            extra = [executor.submit(call) for call in calls[1:]]
+            return [calls[0]()] + [future.result() for future in extra]
+
+    def ping_due(self, now: float) -> list[dict]:
+        due = self.cadence.due(self.sites, now)  # type: ignore
+        remaining = None
+        if self.deadline is not None:
+            remaining = max(0.0, now + self.deadline - time.monotonic())
+        # every packet count is pinged at the same time, they share the cycle deadline
+        pinged = self.concurrently(
+            [functools.partial(self.ping, sites, count, remaining) for count, sites in due.items()]
+        )
+        for sites, netdatas in zip(due.values(), pinged):
+            results = {netdata["site"]: netdata for netdata in netdatas}
+            for site in sites:
+                netdata = results.get(site)
+                self.cadence.update(site, netdata, time.monotonic())  # type: ignore
+                if netdata is not None:
+                    self.results[site] = netdata
+                else:
+                    self.results.pop(site, None)
+        return [self.results[site] for site in self.sites if site in self.results]
+
+    def close(self) -> None:
+        if self.stream is not None:
+            self.stream.stop()
+        if self.owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
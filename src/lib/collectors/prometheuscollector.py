@@ -1,9 +1,11 @@
 import traceback
+import typing
 
 from config import ApplicationConfiguration
 from lib.datastores.factory import DatastoreFactory
 from lib.enums.ConfigurationDefaults import ConfigurationDefaults
 from lib.logging import setup_logging
+from lib.schedulers.sharding import shard_topic
 from prometheus_client.core import GaugeMetricFamily
 from prometheus_client.registry import Collector
 
@@ -24,6 +26,141 @@ class PrometheusCollector(Collector):
         safe_name = self.safe_name(name)
         return f'{self.namespace}_{safe_name}'
 
+    def read_netprobe(self, data_store: typing.Any) -> typing.Optional[dict]:
+        topic = self.config.datastore.netprobe.get('topic', ConfigurationDefaults.DATASTORE_PROBE_TOPIC)
+        if not self.config.probe.shards:
+            return data_store.read(topic)
+
+        # sharded probes each write the sites they own, merge them back into one result
+        merged = None
+        for worker in self.config.probe.shards:
+            partial = data_store.read(shard_topic(topic, worker))
+            if not partial:
+                self.logger.warning(f"No data found for shard {worker}")
+                continue
+            merged = merged or {"stats": [], "dns_stats": [], "limiter_stats": []}
+            merged["stats"].extend(partial.get("stats") or [])
+            merged["dns_stats"].extend(partial.get("dns_stats") or [])
+            merged["limiter_stats"].extend(partial.get("limiter_stats") or [])
+        return merged
+
+    def collect_tcp(self):
+        if not self.config.tcp.enabled:
+            return
+
+        try:
+            tcp_data_store = DatastoreFactory().create(
+                self.config.datastore.tcp.get('type', ConfigurationDefaults.DATASTORE_TCP_TYPE)
+            )
+            results_tcp = tcp_data_store.read(
+                self.config.datastore.tcp.get('topic', ConfigurationDefaults.DATASTORE_TCP_TOPIC)
+            )
+        except Exception as e:
+            self.logger.error('Could not connect to data store')
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return
+
+        if not results_tcp:
+            self.logger.debug("No TCP data found in data store. Skipping.")
+            return
+
+        t = GaugeMetricFamily(
+            self.metric_safe_name('tcp_stats'),
+            'TCP connect latency and loss from the probe to the destination',
+            labels=['type', 'target'],
+        )
+        for item in results_tcp.get('tcp_stats', []):
+            target = item.get('target', 'unknown')
+            # resolution time, or 1 when the host did not resolve and the target was not probed
+            if 'resolve_time' in item:
+                t.add_metric(['resolve_time', target], float(item['resolve_time']))
+            t.add_metric(['resolve_error', target], float('resolve_error' in item))
+            if 'latency' not in item:
+                continue
+            t.add_metric(['latency', target], float(item.get('latency', 0)))
+            t.add_metric(['loss', target], float(item.get('loss', 0)))
+            t.add_metric(['jitter', target], float(item.get('jitter', 0)))
+            for stat in ['min', 'p50', 'p90', 'p99', 'max']:
+                if stat in item:
+                    t.add_metric([f'latency_{stat}', target], float(item[stat]))
+            t.add_metric(['refused', target], float(item.get('refused', 0)))
+            t.add_metric(['timeouts', target], float(item.get('timeouts', 0)))
+
+        yield t
+
+    def collect_http(self):
+        if not self.config.http_probe.enabled:
+            return
+
+        try:
+            http_data_store = DatastoreFactory().create(
+                self.config.datastore.http_probe.get('type', ConfigurationDefaults.DATASTORE_HTTP_PROBE_TYPE)
+            )
+            results_http = http_data_store.read(
+                self.config.datastore.http_probe.get('topic', ConfigurationDefaults.DATASTORE_HTTP_PROBE_TOPIC)
+            )
+        except Exception as e:
+            self.logger.error('Could not connect to data store')
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return
+
+        if not results_http:
+            self.logger.debug("No HTTP data found in data store. Skipping.")
+            return
+
+        h = GaugeMetricFamily(
+            self.metric_safe_name('http_stats'),
+            'HTTP request timings (ms) by phase from the probe to the url',
+            labels=['type', 'url'],
+        )
+        for item in results_http.get('http_stats', []):
+            url = item.get('url', 'unknown')
+            for stat in ['dns', 'connect', 'tls', 'ttfb', 'transfer', 'total', 'total_p50', 'total_p90', 'total_max']:
+                if stat in item:
+                    h.add_metric([stat, url], float(item[stat]))
+            for stat in ['status', 'loss', 'bytes', 'reused']:
+                h.add_metric([stat, url], float(item.get(stat, 0)))
+
+        yield h
+
+    def collect_trace(self):
+        if not self.config.trace.enabled:
+            return
+
+        try:
+            trace_data_store = DatastoreFactory().create(
+                self.config.datastore.trace.get('type', ConfigurationDefaults.DATASTORE_TRACE_TYPE)
+            )
+            results_trace = trace_data_store.read(
+                self.config.datastore.trace.get('topic', ConfigurationDefaults.DATASTORE_TRACE_TOPIC)
+            )
+        except Exception as e:
+            self.logger.error('Could not connect to data store')
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return
+
+        if not results_trace:
+            self.logger.debug("No trace data found in data store. Skipping.")
+            return
+
+        r = GaugeMetricFamily(
+            self.metric_safe_name('trace_stats'),
+            'Loss, latency and jitter of every hop on the path from the probe to the target',
+            labels=['type', 'target', 'hop', 'address'],
+        )
+        for item in results_trace.get('trace_stats', []):
+            if 'hop' not in item:
+                continue
+            labels = [item.get('target', 'unknown'), str(item['hop']), item.get('address') or '']
+            for stat in ['latency', 'loss', 'jitter', 'min', 'p50', 'p90', 'max']:
+                if stat in item:
+                    r.add_metric([stat, *labels], float(item[stat]))
+
+        yield r
+
     def collect(self):
         probe_data_store = None
         speedtest_data_store = None
@@ -45,14 +182,16 @@ class PrometheusCollector(Collector):
             self.logger.error(e)
             self.logger.error(traceback.format_exc())
 
+        yield from self.collect_tcp()
+        yield from self.collect_http()
+        yield from self.collect_trace()
+
         if not probe_data_store:
             self.logger.error('Could not connect to data store')
             return
 
         # Retrieve Netprobe data
-        results_netprobe = probe_data_store.read(
-            self.config.datastore.netprobe.get('topic', ConfigurationDefaults.DATASTORE_PROBE_TOPIC)
-        )
+        results_netprobe = self.read_netprobe(probe_data_store)
 
         stats_speedtest = None
         if speedtest_data_store:
@@ -69,7 +208,7 @@ class PrometheusCollector(Collector):
         g = GaugeMetricFamily(
             self.metric_safe_name('network_stats'),
             'Network statistics for latency and loss from the probe to the destination',
-            labels=['type', 'target'],
+            labels=['type', 'target', 'source'],
         )
 
         total_latency = 0  # Calculate these in presentation rather than prom to reduce cardinality
@@ -90,13 +229,36 @@ class PrometheusCollector(Collector):
 
         for item in netprobe_stats:  # Expose each individual latency / loss metric for each site tested
             site = item.get('site', 'unknown')
+            # the uplink the site was probed from, empty for the default route
+            source = item.get('source', '')
+            # resolution time, or 1 when the name did not resolve and the site was not pinged
+            if 'resolve_time' in item:
+                g.add_metric(['resolve_time', site, source], float(item['resolve_time']))
+            g.add_metric(['resolve_error', site, source], float('resolve_error' in item))
+            if 'latency' not in item:
+                continue
+
             latency = float(item.get('latency', 0))
             loss = float(item.get('loss', 0))
             jitter = float(item.get('jitter', 0))
 
-            g.add_metric(['latency', site], latency)
-            g.add_metric(['loss', site], loss)
-            g.add_metric(['jitter', site], jitter)
+            g.add_metric(['latency', site, source], latency)
+            g.add_metric(['loss', site, source], loss)
+            g.add_metric(['jitter', site, source], jitter)
+            # echo requests the cycle deadline left no time to send, not part of the loss
+            g.add_metric(['unsent', site, source], float(item.get('unsent', 0)))
+
+            # Per-packet latency distribution, only present when the probe captured the individual samples
+            for stat in ['min', 'p50', 'p90', 'p99', 'max']:
+                if stat in item:
+                    g.add_metric([f'latency_{stat}', site, source], float(item[stat]))
+            if 'mdev' in item:
+                g.add_metric(['mdev', site, source], float(item['mdev']))
+            # 1 while the site is within its group's loss and latency thresholds
+            if 'healthy' in item:
+                g.add_metric(['healthy', site, source], float(item['healthy']))
+            # 1 when a speed test was saturating the link while the site was probed
+            g.add_metric(['under_load', site, source], float(item.get('under_load', 0)))
 
             total_latency += latency
             total_loss += loss
@@ -114,9 +276,10 @@ class PrometheusCollector(Collector):
         #             total_jitter += float(stats_speedtest[key])
         #             jitter_item_count += 1
 
-        average_latency = total_latency / latency_item_count
-        average_loss = total_loss / loss_item_count
-        average_jitter = total_jitter / jitter_item_count
+        # sites that did not resolve have no latency, when none resolved there is nothing to average
+        average_latency = total_latency / max(latency_item_count, 1)
+        average_loss = total_loss / max(loss_item_count, 1)
+        average_jitter = total_jitter / max(jitter_item_count, 1)
 
         self.logger.info("Network Stats:")
         self.logger.info(f"\tAverage Loss: {average_loss}")
@@ -128,7 +291,13 @@ class PrometheusCollector(Collector):
         h = GaugeMetricFamily(
             self.metric_safe_name('dns_stats'),
             'DNS performance statistics for various DNS servers',
-            labels=['server', 'ip', 'type'],
+            labels=['server', 'ip', 'type', 'source'],
+        )
+
+        dns_latency = GaugeMetricFamily(
+            self.metric_safe_name('dns_latency_stats'),
+            'DNS latency distribution and failed queries for each DNS server',
+            labels=['server', 'ip', 'type', 'source', 'stat'],
         )
 
         dns_stats = stats_netprobe.get('dns_stats', [])
@@ -144,22 +313,46 @@ class PrometheusCollector(Collector):
             ns_type = item.get('type', None)
             ns_latency = float(item.get('latency', 0))
 
-            labels = [ns_name, ns_ip, ns_type]
+            labels = [ns_name, ns_ip, ns_type, item.get('source', '')]
             h.add_metric(labels, item.get('latency', 0))
+
+            stats = ['min', 'p50', 'p90', 'p99', 'max', 'cache_miss_latency', 'cache_miss_max', 'failures', 'loss']
+            for stat in stats:
+                if stat in item:
+                    dns_latency.add_metric([*labels, stat], float(item[stat]))
+            if ns_latency < 0:
+                # no query was answered, it has no latency to average
+                continue
             # find them by type, and then get the average of the latency
             if ns_type.lower() == 'internal':
                 local_dns.append(ns_latency)
             else:
                 ext_dns.append(ns_latency)
 
-        average_local_dns_latency = sum(local_dns) / len(local_dns)
-        average_ext_dns_latency = sum(ext_dns) / len(ext_dns)
+        average_local_dns_latency = sum(local_dns) / max(len(local_dns), 1)
+        average_ext_dns_latency = sum(ext_dns) / max(len(ext_dns), 1)
 
         self.logger.info("DNS Latency:")
         self.logger.info(f"\tAverage Local DNS Latency: {average_local_dns_latency}")
         self.logger.info(f"\tAverage External DNS Latency: {average_ext_dns_latency}")
 
         yield h
+        yield dns_latency
+
+        # cumulative tokens and wait time (s), and recent wait percentiles (ms), of the packet budget
+        limiter_stats = stats_netprobe.get('limiter_stats') or []
+        if limiter_stats:
+            r = GaugeMetricFamily(
+                self.metric_safe_name('limiter_stats'),
+                'Packets sent through the probe rate limiter and how long they waited for it',
+                labels=['worker', 'consumer', 'stat'],
+            )
+            for item in limiter_stats:
+                labels = [str(item.get('worker', '')), item.get('consumer', 'unknown')]
+                for stat in ['tokens', 'delayed', 'dropped', 'wait_time', 'wait_p50', 'wait_p99', 'wait_max']:
+                    if stat in item:
+                        r.add_metric([*labels, stat], float(item[stat]))
+            yield r
 
         if stats_speedtest:  # Speed test is optional
             s = GaugeMetricFamily(
@@ -169,11 +362,40 @@ class PrometheusCollector(Collector):
             )
 
             for key in stats_speedtest.keys():
+                if key.startswith(('latency_', 'bufferbloat')):
+                    continue
                 if stats_speedtest[key] and isinstance(stats_speedtest[key], (int, float, str)):
                     s.add_metric([key], stats_speedtest[key])
 
             yield s
 
+            # latency under load, when the speed test measured it
+            loaded = GaugeMetricFamily(
+                self.metric_safe_name('speed_latency_stats'),
+                'Latency before and during the speed test',
+                labels=['phase', 'type'],
+            )
+            for key, value in stats_speedtest.items():
+                if key.startswith('latency_') and isinstance(value, (int, float)):
+                    phase, _, stat = key[len('latency_') :].partition('_')
+                    loaded.add_metric([phase, stat or 'latency'], value)
+            yield loaded
+
+            if 'bufferbloat_grade' in stats_speedtest:
+                b = GaugeMetricFamily(
+                    self.metric_safe_name('speed_bufferbloat'),
+                    'Latency added under load during the speed test (ms), labelled with its grade',
+                    labels=['grade'],
+                )
+                b.add_metric([stats_speedtest['bufferbloat_grade']], stats_speedtest['bufferbloat'])
+                yield b
+                g = GaugeMetricFamily(
+                    self.metric_safe_name('speed_bufferbloat_score'),
+                    'Bufferbloat grade of the speed test, 5 (A+) to 0 (F)',
+                )
+                g.add_metric([], stats_speedtest['bufferbloat_score'])
+                yield g
+
         # Calculate overall health score
         weight_loss = self.config.presentation.weight_loss  # Loss is 60% of score
         weight_latency = self.config.presentation.weight_latency  # Latency is 15% of score
@@ -291,13 +513,14 @@ class PrometheusCollector(Collector):
         cv_download = 0
         cv_upload = 0
         if stats_speedtest:
-            download = float(stats_speedtest.get('download', 0))
+            # a direction missing from partial results is not scored
+            download = float(stats_speedtest.get('download', -1))
             if download >= 0:
                 cv_download = 1 - (
                     1 if download / threshold_speedtest_download >= 1 else (download / threshold_speedtest_download)
                 )
 
-            upload = float(stats_speedtest.get('upload', 0))
+            upload = float(stats_speedtest.get('upload', -1))
             if upload >= 0:
                 cv_upload = 1 - (
                     1 if upload / threshold_speedtest_upload >= 1 else (upload / threshold_speedtest_upload)
@@ -366,3 +589,62 @@ class PrometheusCollector(Collector):
         i.add_metric(['overall'], overall_score)
 
         yield i
+
+        yield from self.collect_sources(netprobe_stats, dns_stats)
+
+    def coefficient(self, value: float, threshold: float) -> float:
+        # how far the value is towards its threshold, capped at 1
+        if threshold == 0:
+            return 0
+        return min(value / threshold, 1)
+
+    def collect_sources(self, netprobe_stats: typing.List[dict], dns_stats: typing.List[dict]):
+        # the health score of each uplink of a multi-WAN probe, from its own pings and DNS tests only
+        sources = sorted({item['source'] for item in netprobe_stats + dns_stats if item.get('source')})
+        if not sources:
+            return
+
+        presentation = self.config.presentation
+
+        def average(items: typing.List[dict]) -> float:
+            return sum(float(item.get('latency', 0)) for item in items) / len(items) if items else 0
+
+        i = GaugeMetricFamily(
+            self.metric_safe_name('source_health_score'),
+            'Internet health function of each uplink, without the speedtest',
+            labels=['source', 'type'],
+        )
+        for source in sources:
+            stats = [item for item in netprobe_stats if item.get('source') == source and 'latency' in item]
+            # nameservers that answered no query have no latency to average
+            dns = [item for item in dns_stats if item.get('source') == source and float(item.get('latency', 0)) >= 0]
+            count = max(len(stats), 1)
+            penalties = {
+                'loss': presentation.weight_loss
+                * self.coefficient(
+                    sum(float(item.get('loss', 0)) for item in stats) / count, presentation.threshold_loss
+                ),
+                'latency': presentation.weight_latency
+                * self.coefficient(average(stats), presentation.threshold_latency),
+                'jitter': presentation.weight_jitter
+                * self.coefficient(
+                    sum(float(item.get('jitter', 0)) for item in stats) / count, presentation.threshold_jitter
+                ),
+                'internal_dns_latency': presentation.weight_internal_dns_latency
+                * self.coefficient(
+                    average([item for item in dns if str(item.get('type', '')).lower() == 'internal']),
+                    presentation.threshold_internal_dns_latency,
+                ),
+                'external_dns_latency': presentation.weight_external_dns_latency
+                * self.coefficient(
+                    average([item for item in dns if str(item.get('type', '')).lower() != 'internal']),
+                    presentation.threshold_external_dns_latency,
+                ),
+            }
+            for score_type, penalty in penalties.items():
+                i.add_metric([source, score_type], 1 - penalty)
+            overall = 1 - sum(penalties.values())
+            i.add_metric([source, 'overall'], overall)
+            self.logger.info(f"Network Health Score of {source}: {overall * 100}%")
+
+        yield i
@@ -1,30 +1,129 @@
+import time
+import traceback
 import typing
 
 import speedtest
 from lib.collectors.basecollector import BaseCollector
+from lib.datastores.factory import DatastoreFactory
+from lib.enums.DataStoreTypes import DataStoreTypes
+from lib.pingers.loadedlatency import measure_phases
 
 
 class SpeedTestCollector(BaseCollector):  # Speed test class
-    def __init__(self):
+    # speedtest counts every failed latency request as 3600s, averaged over twice the requests, a server with any
+    # failure has a latency of at least this many ms
+    UNREACHABLE = 3600 / 6 * 1000
+
+    def __init__(
+        self,
+        bufferbloat_target: typing.Optional[str] = None,
+        bufferbloat_rate: float = 10,
+        bufferbloat_idle: float = 5,
+        server_ttl: int = 0,
+        server_datastore: typing.Optional[DataStoreTypes] = None,
+        server_topic: typing.Optional[str] = None,
+    ):
         super().__init__()
+        # pings this target during the test to measure the latency under load, None to skip
+        self.bufferbloat_target = bufferbloat_target
+        self.bufferbloat_rate = bufferbloat_rate
+        self.bufferbloat_idle = bufferbloat_idle
+        # the selected server and the closest servers are reused for `server_ttl` seconds and kept in the datastore
+        self.server_ttl = server_ttl
+        self.server_datastore = server_datastore
+        self.server_topic = server_topic
+        self.server_cache: typing.Optional[dict] = None
+        self.server_cache_loaded = False
+        # called with the results so far after the download and the upload
+        self.on_partial: typing.Optional[typing.Callable[[dict], None]] = None
 
     def _fetch(self) -> typing.Optional[dict]:
+        selected = False
         try:
             s = speedtest.Speedtest()
-            s.get_closest_servers()
-            s.get_best_server()
-            download = s.download()
-            upload = s.upload()
+            self._select_server(s)
+            selected = True
             # get the jitter and latency
             latency = s.results.ping
+            results = measure_phases(
+                {"download": s.download, "upload": s.upload},
+                self.bufferbloat_target,
+                self.bufferbloat_rate,
+                self.bufferbloat_idle,
+                (lambda partial: self.on_partial({"latency": latency, **partial})) if self.on_partial else None,
+            )
 
-            return {"download": download, "upload": upload, "latency": latency}
+            return {"latency": latency, **results}
         except Exception as e:
             self.logger.error("Error fetching speedtest results")
             self.logger.error(e)
+            if selected and self.server_cache:
+                # the server failed the test, the next run selects one again
+                self._store_server(None)
             return
         None
 
+    def _select_server(self, s: speedtest.Speedtest) -> None:
+        cache = self._load_server()
+        if cache is not None:
+            s.closest = cache["servers"]
+            if self._test_servers(s, [cache["server"]]):
+                self.logger.debug(f"Using cached speedtest server {s.best['host']}")
+                return
+
+            # the other cached servers are tested before the server list is downloaded again
+            self.logger.warning(f"Cached speedtest server {cache['server'].get('host')} failed, selecting again")
+            servers = [server for server in cache["servers"] if server.get("id") != cache["server"].get("id")]
+            if servers and self._test_servers(s, servers):
+                self.logger.info(f"Selected speedtest server {s.best['host']} ({s.best['latency']}ms)")
+                self._store_server({"server": s.best, "servers": cache["servers"], "expires": cache["expires"]})
+                return
+            self._store_server(None)
+
+        s.get_closest_servers()
+        best = s.get_best_server()
+        self.logger.info(f"Selected speedtest server {best['host']} ({best['latency']}ms)")
+        if self.server_ttl > 0 and best["latency"] < self.UNREACHABLE:
+            self._store_server({"server": best, "servers": s.closest, "expires": time.time() + self.server_ttl})
+
+    def _test_servers(self, s: speedtest.Speedtest, servers: typing.List[dict]) -> bool:
+        try:
+            return s.get_best_server(servers)["latency"] < self.UNREACHABLE
+        except speedtest.SpeedtestBestServerFailure:
+            return False
+
+    def _load_server(self) -> typing.Optional[dict]:
+        if self.server_ttl <= 0:
+            return None
+        if not self.server_cache_loaded:
+            # read once, the datastore only has to carry the cache across restarts
+            self.server_cache_loaded = True
+            if self.server_datastore is not None and self.server_topic:
+                try:
+                    self.server_cache = DatastoreFactory().create(self.server_datastore).read(self.server_topic)
+                except Exception as e:
+                    self.logger.error("Could not read the cached speedtest server")
+                    self.logger.error(e)
+                    self.logger.error(traceback.format_exc())
+        cache = self.server_cache
+        if not cache or not cache.get("server") or cache.get("expires", 0) <= time.time():
+            return None
+        return cache
+
+    def _store_server(self, cache: typing.Optional[dict]) -> None:
+        self.server_cache = cache
+        self.server_cache_loaded = True
+        if self.server_datastore is None or not self.server_topic:
+            return
+        try:
+            # an empty record replaces a cache that is no longer valid
+            ttl = max(1, int(cache["expires"] - time.time())) if cache else 1
+            DatastoreFactory().create(self.server_datastore).write(self.server_topic, cache or {}, ttl)
+        except Exception as e:
+            self.logger.error("Could not store the cached speedtest server")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+
     def collect(self) -> typing.Optional[dict]:
         results = self._fetch()
         return results
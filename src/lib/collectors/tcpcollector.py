@@ -0,0 +1,104 @@
+import asyncio
+import json
+import socket
+import struct
+import time
+import traceback
+import typing
+
+from lib.collectors.basecollector import BaseCollector
+from lib.resolvers.resolvecache import SharedResolveCache
+from lib.schedulers.ratelimiter import SharedRateLimiter
+from lib.stats.rttsamples import RttSamples
+
+
+class TcpCollector(BaseCollector):
+    """Measures TCP handshake time to host:port targets with non-blocking connects on a single asyncio loop."""
+
+    INTERVAL = 0.1  # seconds between connection attempts to the same target
+
+    def __init__(self, targets: typing.List[str], count: int, timeout: float = 2, concurrency: int = 64):
+        super().__init__()
+        self.targets = targets
+        self.count = count
+        self.timeout = timeout
+        self.concurrency = concurrency  # Max handshakes in flight
+
+    @staticmethod
+    def parse_target(target: str) -> typing.Tuple[str, int]:
+        # host:port, with IPv6 addresses in brackets: [::1]:443
+        host, _, port = target.strip().rpartition(':')
+        if not host or not port.isdigit():
+            raise ValueError(f"Invalid TCP target '{target}', expected host:port")
+        return host.strip('[]'), int(port)
+
+    def collect(self) -> typing.Optional[dict]:
+        try:
+            return {"tcp_stats": asyncio.run(self._collect_all())}
+        except Exception as e:
+            self.logger.error("Error collecting TCP stats")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return None
+
+    async def _collect_all(self) -> typing.List[dict]:
+        limit = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*[self._probe(limit, target) for target in self.targets])
+        return [tcpdata for tcpdata in results if tcpdata is not None]
+
+    async def _probe(self, limit: asyncio.Semaphore, target: str) -> typing.Optional[dict]:
+        try:
+            host, port = self.parse_target(target)
+        except ValueError as e:
+            self.logger.warning(f"Invalid TCP target {target}: {e}")
+            return None
+        resolution = await SharedResolveCache.resolve(host)
+        if resolution.address is None:
+            return {"target": target, "host": host, "port": port, **resolution.fields()}
+        family, sockaddr = resolution.family, (resolution.address, port)
+
+        outcomes: typing.List[asyncio.Future] = []
+        for index in range(self.count):
+            if index > 0:
+                await asyncio.sleep(self.INTERVAL)
+            outcomes.append(asyncio.ensure_future(self._connect(limit, family, sockaddr)))
+        results = await asyncio.gather(*outcomes)
+
+        summary = RttSamples(rtt for rtt, _ in results).summary(target)
+        summary.pop("site")
+        tcpdata = {
+            "target": target,
+            "host": host,
+            "port": port,
+            **summary,
+            **resolution.fields(),
+            "refused": len([error for _, error in results if error == "refused"]),
+            "timeouts": len([error for _, error in results if error == "timeout"]),
+        }
+        self.logger.debug(json.dumps(tcpdata, indent=4))
+        return tcpdata
+
+    async def _connect(
+        self, limit: asyncio.Semaphore, family: int, sockaddr: tuple
+    ) -> typing.Tuple[typing.Optional[float], typing.Optional[str]]:
+        # returns the handshake time in ms, or the reason the attempt failed
+        loop = asyncio.get_running_loop()
+        async with limit:
+            await SharedRateLimiter.wait("tcp")
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            # reset instead of a graceful close so hundreds of probes do not pile up in TIME_WAIT
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            try:
+                started = time.perf_counter()
+                await asyncio.wait_for(loop.sock_connect(sock, sockaddr), self.timeout)
+                return (time.perf_counter() - started) * 1000, None
+            except asyncio.TimeoutError:
+                return None, "timeout"
+            except ConnectionRefusedError:
+                return None, "refused"
+            except OSError as e:
+                self.logger.debug(f"Error connecting to {sockaddr}: {e}")
+                return None, "error"
+            finally:
+                sock.close()
@@ -0,0 +1,166 @@
+import asyncio
+import time
+import traceback
+import typing
+
+from lib.clients.httpclient import HttpClient
+from lib.collectors.basecollector import BaseCollector
+from lib.pingers.loadedlatency import measure_phases
+from lib.schedulers.ratelimiter import SharedRateLimiter
+from lib.stats.rttsamples import percentile
+
+
+class ThroughputCollector(BaseCollector):
+    """A light speed test that downloads from and uploads to your own HTTP endpoints.
+
+    Each direction runs `streams` requests in parallel, over and over, until `max_bytes` have been transferred or
+    `duration` seconds have passed. The rate is sampled every SAMPLE_INTERVAL over the last RATE_WINDOW, and the
+    direction stops early once the last STABLE_SAMPLES rates are all within `stability` of their mean. The first
+    WARMUP seconds, while the connections ramp up, are left out of the rate. Results are in bits per second like
+    speedtest.net's, with the median time to first byte of a few HEAD requests as the latency.
+    """
+
+    SAMPLE_INTERVAL = 0.2
+    RATE_WINDOW = 1.0
+    STABLE_SAMPLES = 5
+    WARMUP = 1.0
+    UPLOAD_SIZE = 8 * 1024 * 1024  # request body of each upload
+    LATENCY_COUNT = 5
+
+    def __init__(
+        self,
+        download_url: typing.Optional[str],
+        upload_url: typing.Optional[str],
+        latency_url: typing.Optional[str] = None,
+        streams: int = 4,
+        max_bytes: int = 0,
+        duration: float = 10,
+        stability: float = 0.05,
+        timeout: float = 10,
+        verify_ssl: bool = True,
+        bufferbloat_target: typing.Optional[str] = None,
+        bufferbloat_rate: float = 10,
+        bufferbloat_idle: float = 5,
+    ):
+        super().__init__()
+        self.download_url = download_url
+        self.upload_url = upload_url
+        self.latency_url = latency_url or download_url or upload_url
+        self.streams = max(1, streams)
+        self.max_bytes = max_bytes
+        self.duration = duration
+        self.stability = stability
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        # pings this target during the test to measure the latency under load, None to skip
+        self.bufferbloat_target = bufferbloat_target
+        self.bufferbloat_rate = bufferbloat_rate
+        self.bufferbloat_idle = bufferbloat_idle
+        # called with the results so far after the download and the upload
+        self.on_partial: typing.Optional[typing.Callable[[dict], None]] = None
+
+    def collect(self) -> typing.Optional[dict]:
+        try:
+            latency = asyncio.run(self._latency())
+            phases = {}
+            if self.download_url:
+                phases["download"] = lambda: asyncio.run(self._measure(self.download_url, "GET"))
+            if self.upload_url:
+                phases["upload"] = lambda: asyncio.run(self._measure(self.upload_url, "POST"))
+            results = measure_phases(
+                phases,
+                self.bufferbloat_target,
+                self.bufferbloat_rate,
+                self.bufferbloat_idle,
+                (lambda partial: self.on_partial({"latency": latency, **partial})) if self.on_partial else None,
+            )
+            return {"latency": latency, **results}
+        except Exception as e:
+            self.logger.error("Error measuring throughput")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return None
+
+    async def _latency(self) -> float:
+        # requests after the first reuse its connection, the time to first byte is about one round trip
+        client = HttpClient(self.timeout, True, self.verify_ssl)
+        try:
+            ttfbs = []
+            for _ in range(self.LATENCY_COUNT):
+                await SharedRateLimiter.wait("throughput")
+                response = await client.request(self.latency_url, "HEAD")
+                ttfbs.append(response.timings["ttfb"])
+            return round(percentile(sorted(ttfbs), 50), 3)
+        finally:
+            client.close()
+
+    async def _measure(self, url: str, method: str) -> float:
+        """Transfers data in `method`'s direction until the budget is spent or the rate settles, returns bits/s."""
+        client = HttpClient(self.duration + self.timeout, True, self.verify_ssl)
+        transferred = 0
+        stopped = False
+
+        def progress(size: int) -> None:
+            nonlocal transferred
+            transferred += size
+
+        async def stream() -> None:
+            body_size = self.UPLOAD_SIZE if method == "POST" else 0
+            # wait_for() can swallow the cancellation when a request completes at the same moment
+            while not stopped:
+                await SharedRateLimiter.wait("throughput")
+                await client.request(url, method, body_size, progress)
+
+        started = time.perf_counter()
+        streams = [asyncio.ensure_future(stream()) for _ in range(self.streams)]
+        samples: typing.List[typing.Tuple[float, int]] = [(0.0, 0)]  # (seconds since start, bytes transferred)
+        rates: typing.List[float] = []
+        settled = False
+        try:
+            while True:
+                await asyncio.sleep(self.SAMPLE_INTERVAL)
+                elapsed = time.perf_counter() - started
+                samples.append((elapsed, transferred))
+                if elapsed >= self.WARMUP + self.RATE_WINDOW:
+                    # bytes per second over the last RATE_WINDOW
+                    then, sent = next(sample for sample in samples if sample[0] >= elapsed - self.RATE_WINDOW)
+                    rates.append((transferred - sent) / (elapsed - then))
+
+                if self.max_bytes and transferred >= self.max_bytes or elapsed >= self.duration:
+                    break
+                if all(task.done() for task in streams):
+                    # every stream failed, what made it through still counts
+                    break
+                recent = rates[-self.STABLE_SAMPLES :]
+                if self.stability > 0 and len(recent) == self.STABLE_SAMPLES:
+                    mean = sum(recent) / len(recent)
+                    if mean > 0 and max(abs(rate - mean) for rate in recent) <= self.stability * mean:
+                        self.logger.debug(f"{method} {url} settled after {elapsed:.1f}s")
+                        settled = True
+                        break
+        finally:
+            stopped = True
+            for task in streams:
+                task.cancel()
+            errors = [
+                result
+                for result in await asyncio.gather(*streams, return_exceptions=True)
+                if not isinstance(result, asyncio.CancelledError)
+            ]
+            client.close()
+
+        if transferred == 0:
+            raise errors[0] if errors else ConnectionError(f"No data transferred with {method} {url}")
+        if errors:
+            self.logger.warning(f"{len(errors)} of {self.streams} streams to {url} failed: {errors[0]!r}")
+
+        elapsed, total = samples[-1]
+        if settled:
+            rate = sum(rates[-self.STABLE_SAMPLES :]) / self.STABLE_SAMPLES
+        else:
+            # everything after the warm-up, or everything when the test did not last past it
+            then, sent = next(
+                (sample for sample in samples if sample[0] >= self.WARMUP and sample[0] < elapsed), (0.0, 0)
+            )
+            rate = (total - sent) / (elapsed - then)
+        return rate * 8
@@ -0,0 +1,108 @@
+import asyncio
+import traceback
+import typing
+
+from lib.collectors.basecollector import BaseCollector
+from lib.pingers.trace import HopReply, TraceSession
+from lib.resolvers.resolvecache import SharedResolveCache
+from lib.schedulers.ratelimiter import SharedRateLimiter
+from lib.stats.rollingwindow import RollingWindow
+
+
+class HopStats:
+    def __init__(self, window: int):
+        self.window = RollingWindow(window)
+        self.address: typing.Optional[str] = None  # the router that answered last
+
+
+class TraceCollector(BaseCollector):
+    """Traces the path to each target like mtr and keeps running loss, latency and jitter statistics for every hop.
+
+    Each cycle sends `count` rounds of echo requests with every TTL from 1 up to the length of the path, all of them
+    at once, so a scan takes about as long as the slowest hop takes to answer rather than hops x targets round trips.
+    The statistics of each hop cover its last `window` requests, across cycles.
+    """
+
+    INTERVAL = 0.1  # seconds between rounds to the same target
+
+    def __init__(
+        self, targets: typing.List[str], count: int = 3, max_hops: int = 30, timeout: float = 2, window: int = 100
+    ):
+        super().__init__()
+        self.targets = targets
+        self.count = max(1, count)
+        self.max_hops = max(1, max_hops)
+        self.timeout = timeout
+        self.window = window
+        self.hops: typing.Dict[str, typing.Dict[int, HopStats]] = {target: {} for target in targets}
+        # the TTL that reached each target last cycle, None to scan up to max_hops
+        self.path_lengths: typing.Dict[str, typing.Optional[int]] = {target: None for target in targets}
+
+    def collect(self) -> typing.Optional[dict]:
+        try:
+            return {"trace_stats": asyncio.run(self._collect_all())}
+        except Exception as e:
+            self.logger.error("Error collecting trace stats")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return None
+
+    async def _collect_all(self) -> typing.List[dict]:
+        session = TraceSession()
+        try:
+            results = await asyncio.gather(*[self._trace(session, target) for target in self.targets])
+        finally:
+            session.close()
+        return [hop for hops in results for hop in hops]
+
+    async def _trace(self, session: TraceSession, target: str) -> typing.List[dict]:
+        resolution = await SharedResolveCache.resolve(target)
+        if resolution.address is None:
+            return [{"target": target, **resolution.fields()}]
+
+        # one hop past the known path, a longer path is found by the full scan after the target is not reached
+        path_length = self.path_lengths[target]
+        limit = min(self.max_hops, path_length + 1) if path_length is not None else self.max_hops
+        rounds: typing.List[typing.List[asyncio.Future]] = []
+        for index in range(self.count):
+            if index > 0:
+                await asyncio.sleep(self.INTERVAL)
+            probes = []
+            for ttl in range(1, limit + 1):
+                await SharedRateLimiter.wait("trace")
+                probes.append(
+                    asyncio.ensure_future(session.hop(resolution.family, resolution.address, ttl, self.timeout))
+                )
+            rounds.append(probes)
+        replies: typing.List[typing.List[typing.Optional[HopReply]]] = [
+            list(await asyncio.gather(*probes)) for probes in rounds
+        ]
+
+        # the path ends at the first TTL any round got an answer from the target (or an unreachable) for
+        reached = None
+        for ttl in range(1, limit + 1):
+            if any(reply[ttl - 1] is not None and reply[ttl - 1][2] for reply in replies):  # type: ignore
+                reached = ttl
+                break
+        self.path_lengths[target] = reached
+        length = reached
+        if length is None:
+            # the path goes dark, keep one silent hop after the last router that answered
+            answered = [ttl for ttl in range(1, limit + 1) if any(reply[ttl - 1] is not None for reply in replies)]
+            length = min(limit, max(answered, default=0) + 1)
+
+        hops = self.hops[target]
+        for ttl in [ttl for ttl in hops if ttl > length]:
+            del hops[ttl]
+        table = []
+        for ttl in range(1, length + 1):
+            hop = hops.setdefault(ttl, HopStats(self.window))
+            for reply in replies:
+                answer = reply[ttl - 1]
+                hop.window.add(answer[1] if answer else None)
+                if answer:
+                    hop.address = answer[0]
+            hopdata = hop.window.summary(target)
+            hopdata.pop("site")
+            table.append({"target": target, "hop": ttl, "address": hop.address, **hopdata})
+        return table
@@ -14,3 +14,10 @@ class DataStore:
 
     def write(self, topic: str, data: dict, ttl: int) -> bool:
         return False
+
+    def healthy(self) -> bool:
+        """Returns False when the connection is lost and the datastore should be created again."""
+        return True
+
+    def close(self) -> None:
+        pass
@@ -1,15 +1,123 @@
+import json
+import os
+import threading
+import time
+import traceback
+import typing
+
 from config import ApplicationConfiguration
+from lib.datastores.datastore import DataStore
 from lib.enums.DataStoreTypes import DataStoreTypes
 from lib.logging import setup_logging
 
 
+class PooledDatastore:
+    def __init__(self, datastore: DataStore):
+        self.datastore = datastore
+        self.checked = time.monotonic()  # last time the datastore was created or found healthy
+
+
 class DatastoreFactory:
+    """Creates datastores, and reuses them for as long as their connection is healthy.
+
+    Datastores are pooled per type, configuration and process, so probes and scrapes share one Redis pool, MongoDB
+    client or MQTT connection instead of opening their own every time. A pooled datastore that has not been checked
+    for HEALTH_CHECK_INTERVAL seconds is checked before it is handed out again, and created again when its connection
+    is lost. Other threads may still be reading or writing through the one it replaces, so that one is only closed
+    RETIRE_GRACE seconds later. Processes created by fork build their own instead of sharing the parent's sockets.
+    `close_all()` closes the datastores of the process on shutdown.
+    """
+
+    HEALTH_CHECK_INTERVAL = 30
+    RETIRE_GRACE = 30
+
+    # the configuration section of each type, part of the pool key so a reloaded configuration takes effect
+    SECTIONS = {
+        DataStoreTypes.REDIS: 'redis',
+        DataStoreTypes.FILE: 'file',
+        DataStoreTypes.MQTT: 'mqtt',
+        DataStoreTypes.MONGODB: 'mongodb',
+        DataStoreTypes.HTTP: 'http',
+    }
+
+    pool: typing.Dict[tuple, PooledDatastore] = {}
+    retired: typing.List[typing.Tuple[int, float, DataStore]] = []  # (pid, time retired, datastore)
+    lock = threading.Lock()
+
     def __init__(self):
         pass
 
     def create(self, type: DataStoreTypes):
         config = ApplicationConfiguration
         logger = setup_logging(self.__class__.__name__, config.logging)
+        key = self._key(type)
+        self._close_retired(logger)
+        with self.lock:
+            pooled = self.pool.get(key)
+        if pooled is not None:
+            if time.monotonic() - pooled.checked < self.HEALTH_CHECK_INTERVAL:
+                return pooled.datastore
+            # checked outside the lock, a health check may wait for a timeout
+            if pooled.datastore.healthy():
+                pooled.checked = time.monotonic()
+                return pooled.datastore
+            logger.warning(f"{pooled.datastore.__class__.__name__} connection lost, reconnecting")
+            with self.lock:
+                if self.pool.get(key) is pooled:
+                    del self.pool[key]
+                    self.retired.append((os.getpid(), time.monotonic(), pooled.datastore))
+
+        with self.lock:
+            # another thread may have created it in the meantime
+            pooled = self.pool.get(key)
+            if pooled is None:
+                pooled = self.pool[key] = PooledDatastore(self._create(type, logger))
+            return pooled.datastore
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Closes the datastores this process created."""
+        config = ApplicationConfiguration
+        logger = setup_logging(cls.__name__, config.logging)
+        pid = os.getpid()
+        with cls.lock:
+            keys = [key for key in cls.pool if key[1] == pid]
+            closing = [cls.pool.pop(key).datastore for key in keys]
+            closing += [datastore for owner, _, datastore in cls.retired if owner == pid]
+            cls.retired = [entry for entry in cls.retired if entry[0] != pid]
+        for datastore in closing:
+            logger.debug(f"Closing {datastore.__class__.__name__}")
+            cls._close(datastore, logger)
+
+    @classmethod
+    def _close_retired(cls, logger: typing.Any) -> None:
+        """Closes the retired datastores of this process once their grace period is over."""
+        if not cls.retired:
+            return
+        pid = os.getpid()
+        expired = time.monotonic() - cls.RETIRE_GRACE
+        with cls.lock:
+            closing = [datastore for owner, retired, datastore in cls.retired if owner == pid and retired <= expired]
+            cls.retired = [entry for entry in cls.retired if entry[2] not in closing]
+        for datastore in closing:
+            logger.debug(f"Closing retired {datastore.__class__.__name__}")
+            cls._close(datastore, logger)
+
+    @staticmethod
+    def _close(datastore: DataStore, logger: typing.Any) -> None:
+        try:
+            datastore.close()
+        except Exception as e:
+            logger.error(f"Error closing {datastore.__class__.__name__}")
+            logger.error(e)
+            logger.error(traceback.format_exc())
+
+    def _key(self, type: DataStoreTypes) -> tuple:
+        section = getattr(ApplicationConfiguration.datastore, self.SECTIONS.get(type, ''), None)
+        settings = json.dumps(section, default=lambda value: getattr(value, '__dict__', str(value)), sort_keys=True)
+        return (type, os.getpid(), settings)
+
+    def _create(self, type: DataStoreTypes, logger: typing.Any) -> DataStore:
         if type == DataStoreTypes.REDIS:
             logger.debug("Creating Redis Datastore")
             from lib.datastores.redis import RedisDataStore
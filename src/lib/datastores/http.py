@@ -1,5 +1,6 @@
 import hashlib
 import json
+import threading
 import typing
 
 import requests
@@ -12,6 +13,20 @@ class HttpDataStore(DataStore):
         super().__init__()
         self.base_config = ApplicationConfiguration
         self.config = self.base_config.datastore.http
+        # keeps the connections to the server open between requests, one session per thread as a pooled datastore
+        # is shared by the scheduler's threads and a requests.Session is not thread-safe
+        self.local = threading.local()
+        self.sessions: typing.List[requests.Session] = []
+        self.lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = requests.Session()
+            with self.lock:
+                self.sessions.append(session)
+        return session
 
     def checksum(self, data: dict) -> str:
         # calculate md5 checksum of the data
@@ -21,22 +36,19 @@ class HttpDataStore(DataStore):
         return url.replace(":topic", topic)
 
     def read(self, topic: str) -> typing.Optional[dict]:
-        # add topic to the params
-        if self.config.read.params is None:
-            self.config.read.params = {}
-
-        self.config.read.params["topic"] = topic
+        # add topic to the params, without changing the shared configuration
+        params = {**(self.config.read.params or {}), "topic": topic}
 
         url: str = self.build_url(self.config.read.url, topic)
         self.logger.debug(f"Reading data from {url}")
-        response = requests.request(
+        response = self.session.request(
             url=url,
             method=self.config.read.method,
             headers=self.config.read.headers,
             cookies=self.config.read.cookies,
             auth=self.config.read.auth,
             timeout=self.config.read.timeout,
-            params=self.config.read.params,
+            params=params,
             verify=self.config.verify_ssl,
         )
 
@@ -60,7 +72,7 @@ class HttpDataStore(DataStore):
         url: str = self.build_url(self.config.read.url, topic)
         self.logger.debug(f"Writing data to {url}")
 
-        response = requests.request(
+        response = self.session.request(
             url=self.build_url(self.config.write.url, topic),
             method=self.config.write.method,
             headers=self.config.write.headers,
@@ -80,3 +92,9 @@ class HttpDataStore(DataStore):
             self.logger.error(f"Error writing data to HTTP: {e}")
             self.logger.debug(response.text)
             return False
+
+    def close(self) -> None:
+        with self.lock:
+            sessions, self.sessions = self.sessions, []
+        for session in sessions:
+            session.close()
@@ -29,3 +29,15 @@ class MongoDBDatastore(DataStore):
             return result["data"]
         else:
             return None
+
+    def healthy(self) -> bool:
+        try:
+            self.client.admin.command("ping")
+            return True
+        except Exception as e:
+            self.logger.warning(f"MongoDB health check failed: {e}")
+            return False
+
+    def close(self) -> None:
+        # stops the client's monitor threads and closes its pool
+        self.client.close()
@@ -19,7 +19,8 @@ class MqttDataStore(DataStore):
         self.client.loop_start()
         count = 0
         found = 0
-        # Wait for all topics to be subscribed to and received or timeout after 3 seconds
+        # Wait for all topics to be subscribed to and received or timeout after 3 seconds. The factory reuses the
+        # datastore, so this only happens once
         while count < 3:
             for topic in self.config.topics:
                 if topic in self.messages:
@@ -35,7 +36,7 @@ class MqttDataStore(DataStore):
             self.logger.warning(f"Failed to retrieve all expected topics: {found} of {len(self.config.topics)}")
             self.logger.warning(f"Topics found: {self.messages.keys()}")
             self.logger.warning(f"Expected topics: {self.config.topics}")
-        self.client.loop_stop()
+        # the loop keeps running, so reads see the latest messages and the client reconnects when the broker drops it
 
     def create(self) -> mqtt.Client:
         client = mqtt.Client()
@@ -98,6 +99,13 @@ class MqttDataStore(DataStore):
             msg = f"Unknown error code: {rc}"
         return msg
 
+    def healthy(self) -> bool:
+        return self.client.is_connected()
+
+    def close(self) -> None:
+        self.client.loop_stop()
+        self.client.disconnect()
+
     def read(self, topic: str) -> typing.Any:
         if topic in self.messages:
             self.logger.debug(f"Read from topic '{topic}'")
@@ -7,6 +7,8 @@ from redis import Redis
 
 
 class RedisDataStore(DataStore):
+    HEALTH_CHECK_INTERVAL = 30
+
     def __init__(self):
         super().__init__()
         self.base_config = ApplicationConfiguration
@@ -20,11 +22,19 @@ class RedisDataStore(DataStore):
         # default should be "". If it is set to a value, it should be used
         self.password = self.config.password
         self.db = self.config.db
-        # Connect to Redis
+        # Connect to Redis, the client keeps a pool of connections and pings the ones that sat idle before using them
         if self.password:
-            self.r = Redis(host=self.host, port=int(self.port), db=int(self.db), password=self.password)
+            self.r = Redis(
+                host=self.host,
+                port=int(self.port),
+                db=int(self.db),
+                password=self.password,
+                health_check_interval=self.HEALTH_CHECK_INTERVAL,
+            )
         else:
-            self.r = Redis(host=self.host, port=int(self.port), db=int(self.db))
+            self.r = Redis(
+                host=self.host, port=int(self.port), db=int(self.db), health_check_interval=self.HEALTH_CHECK_INTERVAL
+            )
         self.logger.debug(f"Initializing Redis Data Store with host {self.host} and port {self.port}")
 
     def read(self, topic: str) -> typing.Any:  # Read data from Redis
@@ -39,3 +49,13 @@ class RedisDataStore(DataStore):
         self.logger.debug(f"Writing to Redis: {topic} - {ttl}")
         write = self.r.set(topic, json.dumps(data), ttl)  # Store data with a given TTL
         return True if write else False
+
+    def healthy(self) -> bool:
+        try:
+            return bool(self.r.ping())
+        except Exception as e:
+            self.logger.warning(f"Redis health check failed: {e}")
+            return False
+
+    def close(self) -> None:
+        self.r.close()
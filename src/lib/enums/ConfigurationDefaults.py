@@ -2,9 +2,17 @@ class ConfigurationDefaults:
     CONFIG_FILE_PATH = "/app/config/netprobe.yaml"
 
     DATASTORE_SPEEDTEST_TOPIC = "netprobe/speedtest"
+    DATASTORE_SPEEDTEST_SERVER_TOPIC = "netprobe/speedtest_server"
+    DATASTORE_SPEEDTEST_LOAD_TOPIC = "netprobe/speedtest_load"
     DATASTORE_PROBE_TOPIC = "netprobe/probe"
     DATASTORE_SPEEDTEST_TYPE = "FILE"
     DATASTORE_PROBE_TYPE = "FILE"
+    DATASTORE_TCP_TOPIC = "netprobe/tcp"
+    DATASTORE_TCP_TYPE = "FILE"
+    DATASTORE_HTTP_PROBE_TOPIC = "netprobe/http"
+    DATASTORE_HTTP_PROBE_TYPE = "FILE"
+    DATASTORE_TRACE_TOPIC = "netprobe/trace"
+    DATASTORE_TRACE_TYPE = "FILE"
 
     FILE_DATASTORE_PATH = "/data"
 
@@ -24,6 +32,15 @@ class ConfigurationDefaults:
     HTTP_WRITE_PARAMS = None
     HTTP_VERIFY_SSL = True
 
+    HTTP_PROBE_CONCURRENCY = 16
+    HTTP_PROBE_COUNT = 3
+    HTTP_PROBE_ENABLED = False
+    HTTP_PROBE_INTERVAL = 60
+    HTTP_PROBE_KEEPALIVE = False
+    HTTP_PROBE_TIMEOUT = 10
+    HTTP_PROBE_URLS = ["https://www.google.com/", "https://www.cloudflare.com/"]
+    HTTP_PROBE_VERIFY_SSL = True
+
     LOG_LEVEL = "INFO"
     LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     LOG_DATEFORMAT = "%Y-%m-%d %H:%M:%S"
@@ -38,22 +55,69 @@ class ConfigurationDefaults:
     PRESENTATION_PORT = 5000
     PRESENTATION_INTERFACE = "0.0.0.0"
 
+    SCHEDULER_JITTER = 0.05
+    SCHEDULER_LOAD_LOCK = "/tmp/netprobe/speedtest.lock"
+    SCHEDULER_LOAD_POLICY = "TAG"
+    SCHEDULER_LOAD_SHARED = False
+    SCHEDULER_OVERRUN = "SKIP"
+    SCHEDULER_RATE_LIMIT = 0
+    SCHEDULER_RATE_BURST = 1
+
+    PROBE_ADAPTIVE = False
+    PROBE_ADAPTIVE_MAX_COUNT = 100
+    PROBE_ADAPTIVE_MAX_INTERVAL = 600
+    PROBE_ADAPTIVE_MIN_COUNT = 10
+    PROBE_ADAPTIVE_MIN_INTERVAL = 10
+    PROBE_BACKEND = "ICMP"
     PROBE_ENABLED = True
     PROBE_COUNT = 50
+    PROBE_CONCURRENCY = 16
     PROBE_INTERVAL = 120
+    PROBE_TIMEOUT = 2
+    PROBE_MODE = "BURST"
+    PROBE_STREAM_RATE = 1
+    PROBE_STREAM_WINDOW = 0
+    PROBE_SHARD_PROCESSES = 1
     PROBE_SITES = ["google.com", "facebook.com", "twitter.com", "youtube.com"]
+    PROBE_DNS_CONCURRENCY = 0
+    PROBE_DNS_CACHE_MISS = False
+    PROBE_DNS_RECORD_TYPES = ["A"]
+    PROBE_DNS_SAMPLES = 1
     PROBE_DNS_TEST_SITE = "google.com"
+    PROBE_DNS_TIMEOUT = 10
+    PROBE_DEADLINE = 0.9
     PROBE_DEVICE_ID = "netprobe"
 
     REDIS_HOST = "localhost"
     REDIS_PORT = 6379
     REDIS_DB = "0"
 
+    SPEEDTEST_BACKEND = "SPEEDTEST"
+    SPEEDTEST_BUFFERBLOAT = False
+    SPEEDTEST_BUFFERBLOAT_IDLE = 5
+    SPEEDTEST_BUFFERBLOAT_RATE = 10
+    SPEEDTEST_BUFFERBLOAT_TARGET = "1.1.1.1"
+    SPEEDTEST_HTTP_BYTES = 100_000_000
+    SPEEDTEST_HTTP_DURATION = 10
+    SPEEDTEST_HTTP_STABILITY = 0.05
+    SPEEDTEST_HTTP_STREAMS = 4
+    SPEEDTEST_HTTP_TIMEOUT = 10
+    SPEEDTEST_HTTP_VERIFY_SSL = True
     SPEEDTEST_INTERVAL = 937
+    SPEEDTEST_MEMORY_LIMIT = 2048
+    SPEEDTEST_SERVER_TTL = 86400
+    SPEEDTEST_TIMEOUT = 300
     SPEEDTEST_ENABLED = False
     SPEEDTEST_WEIGHT_REBALANCE = True
     SPEEDTEST_WEIGHT_ENFORCE = False
 
+    TCP_CONCURRENCY = 64
+    TCP_COUNT = 10
+    TCP_ENABLED = False
+    TCP_INTERVAL = 60
+    TCP_TARGETS = ["google.com:443", "cloudflare.com:443"]
+    TCP_TIMEOUT = 2
+
     THRESHOLD_EXTERNAL_DNS_LATENCY = 100
     THRESHOLD_INTERNAL_DNS_LATENCY = 50
     THRESHOLD_JITTER = 40
@@ -62,6 +126,14 @@ class ConfigurationDefaults:
     THRESHOLD_SPEEDTEST_DOWNLOAD = 200
     THRESHOLD_SPEEDTEST_UPLOAD = 200
 
+    TRACE_COUNT = 3
+    TRACE_ENABLED = False
+    TRACE_INTERVAL = 60
+    TRACE_MAX_HOPS = 30
+    TRACE_TARGETS = ["8.8.8.8", "1.1.1.1"]
+    TRACE_TIMEOUT = 2
+    TRACE_WINDOW = 100
+
     WEIGHT_EXTERNAL_DNS_LATENCY = 0.025
     WEIGHT_INTERNAL_DNS_LATENCY = 0.025
     WEIGHT_JITTER = 0.2
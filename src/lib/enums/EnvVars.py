@@ -10,6 +10,14 @@ class EnvVars(Enum):
     DATASTORE_SPEEDTEST_TYPE = "NP_DATASTORE_SPEEDTEST_TYPE"
     DATASTORE_PROBE_TOPIC = "NP_DATASTORE_NETPROBE_TOPIC"
     DATASTORE_SPEEDTEST_TOPIC = "NP_DATASTORE_SPEEDTEST_TOPIC"
+    DATASTORE_SPEEDTEST_SERVER_TOPIC = "NP_DATASTORE_SPEEDTEST_SERVER_TOPIC"
+    DATASTORE_SPEEDTEST_LOAD_TOPIC = "NP_DATASTORE_SPEEDTEST_LOAD_TOPIC"
+    DATASTORE_TCP_TYPE = "NP_DATASTORE_TCP_TYPE"
+    DATASTORE_HTTP_PROBE_TYPE = "NP_DATASTORE_HTTP_PROBE_TYPE"
+    DATASTORE_HTTP_PROBE_TOPIC = "NP_DATASTORE_HTTP_PROBE_TOPIC"
+    DATASTORE_TRACE_TYPE = "NP_DATASTORE_TRACE_TYPE"
+    DATASTORE_TRACE_TOPIC = "NP_DATASTORE_TRACE_TOPIC"
+    DATASTORE_TCP_TOPIC = "NP_DATASTORE_TCP_TOPIC"
 
     FILE_DATASTORE_PATH = "NP_FILE_DATASTORE_PATH"
 
@@ -29,6 +37,15 @@ class EnvVars(Enum):
     HTTP_WRITE_PARAMS = "NP_HTTP_WRITE_PARAMS"
     HTTP_VERIFY_SSL = "NP_HTTP_VERIFY_SSL"
 
+    HTTP_PROBE_CONCURRENCY = "NP_HTTP_PROBE_CONCURRENCY"
+    HTTP_PROBE_COUNT = "NP_HTTP_PROBE_COUNT"
+    HTTP_PROBE_ENABLED = "NP_HTTP_PROBE_ENABLED"
+    HTTP_PROBE_INTERVAL = "NP_HTTP_PROBE_INTERVAL"
+    HTTP_PROBE_KEEPALIVE = "NP_HTTP_PROBE_KEEPALIVE"
+    HTTP_PROBE_TIMEOUT = "NP_HTTP_PROBE_TIMEOUT"
+    HTTP_PROBE_URLS = "NP_HTTP_PROBE_URLS"
+    HTTP_PROBE_VERIFY_SSL = "NP_HTTP_PROBE_VERIFY_SSL"
+
     LOG_LEVEL = "NP_LOG_LEVEL"
     LOG_FORMAT = "NP_LOG_FORMAT"
     LOG_DATEFORMAT = "NP_LOG_DATE_FORMAT"
@@ -45,12 +62,40 @@ class EnvVars(Enum):
     PRESENTATION_PORT = "NP_PRESENTATION_PORT"
     PRESENTATION_INTERFACE = "NP_PRESENTATION_INTERFACE"
 
+    SCHEDULER_JITTER = "NP_SCHEDULER_JITTER"
+    SCHEDULER_LOAD_LOCK = "NP_SCHEDULER_LOAD_LOCK"
+    SCHEDULER_LOAD_POLICY = "NP_SCHEDULER_LOAD_POLICY"
+    SCHEDULER_LOAD_SHARED = "NP_SCHEDULER_LOAD_SHARED"
+    SCHEDULER_OVERRUN = "NP_SCHEDULER_OVERRUN"
+    SCHEDULER_RATE_LIMIT = "NP_SCHEDULER_RATE_LIMIT"
+    SCHEDULER_RATE_BURST = "NP_SCHEDULER_RATE_BURST"
+
+    PROBE_ADAPTIVE = "NP_PROBE_ADAPTIVE"
+    PROBE_ADAPTIVE_MAX_COUNT = "NP_PROBE_ADAPTIVE_MAX_COUNT"
+    PROBE_ADAPTIVE_MAX_INTERVAL = "NP_PROBE_ADAPTIVE_MAX_INTERVAL"
+    PROBE_ADAPTIVE_MIN_COUNT = "NP_PROBE_ADAPTIVE_MIN_COUNT"
+    PROBE_ADAPTIVE_MIN_INTERVAL = "NP_PROBE_ADAPTIVE_MIN_INTERVAL"
+    PROBE_BACKEND = "NP_PROBE_BACKEND"
     PROBE_ENABLED = "NP_PROBE_ENABLED"
     PROBE_COUNT = "NP_PROBE_COUNT"
+    PROBE_CONCURRENCY = "NP_PROBE_CONCURRENCY"
+    PROBE_DEADLINE = "NP_PROBE_DEADLINE"
     PROBE_DEVICE_ID = "NP_DEVICE_ID"
+    PROBE_DNS_CONCURRENCY = "NP_PROBE_DNS_CONCURRENCY"
+    PROBE_DNS_CACHE_MISS = "NP_PROBE_DNS_CACHE_MISS"
+    PROBE_DNS_RECORD_TYPES = "NP_PROBE_DNS_RECORD_TYPES"
+    PROBE_DNS_SAMPLES = "NP_PROBE_DNS_SAMPLES"
     PROBE_DNS_TEST_SITE = "NP_PROBE_DNS_TEST_SITE"
+    PROBE_DNS_TEST_SITES = "NP_PROBE_DNS_TEST_SITES"
+    PROBE_DNS_TIMEOUT = "NP_PROBE_DNS_TIMEOUT"
     PROBE_INTERVAL = "NP_PROBE_INTERVAL"
+    PROBE_TIMEOUT = "NP_PROBE_TIMEOUT"
+    PROBE_MODE = "NP_PROBE_MODE"
+    PROBE_STREAM_RATE = "NP_PROBE_STREAM_RATE"
+    PROBE_STREAM_WINDOW = "NP_PROBE_STREAM_WINDOW"
     PROBE_SITES = "NP_SITES"
+    PROBE_SHARD_PROCESSES = "NP_PROBE_SHARD_PROCESSES"
+    PROBE_SHARD_WORKERS = "NP_PROBE_SHARD_WORKERS"
     PROBE_LOCAL_DNS = "NP_LOCAL_DNS"
     PROBE_LOCAL_DNS_IP = "NP_LOCAL_DNS_IP"
 
@@ -59,11 +104,35 @@ class EnvVars(Enum):
     REDIS_DB = "NP_REDIS_DB"
     REDIS_PASSWORD = "NP_REDIS_PASSWORD"
 
+    SPEEDTEST_BACKEND = "NP_SPEEDTEST_BACKEND"
+    SPEEDTEST_BUFFERBLOAT = "NP_SPEEDTEST_BUFFERBLOAT"
+    SPEEDTEST_BUFFERBLOAT_IDLE = "NP_SPEEDTEST_BUFFERBLOAT_IDLE"
+    SPEEDTEST_BUFFERBLOAT_RATE = "NP_SPEEDTEST_BUFFERBLOAT_RATE"
+    SPEEDTEST_BUFFERBLOAT_TARGET = "NP_SPEEDTEST_BUFFERBLOAT_TARGET"
     SPEEDTEST_ENABLED = "NP_SPEEDTEST_ENABLED"
+    SPEEDTEST_HTTP_BYTES = "NP_SPEEDTEST_HTTP_BYTES"
+    SPEEDTEST_HTTP_DOWNLOAD_URL = "NP_SPEEDTEST_HTTP_DOWNLOAD_URL"
+    SPEEDTEST_HTTP_DURATION = "NP_SPEEDTEST_HTTP_DURATION"
+    SPEEDTEST_HTTP_LATENCY_URL = "NP_SPEEDTEST_HTTP_LATENCY_URL"
+    SPEEDTEST_HTTP_STABILITY = "NP_SPEEDTEST_HTTP_STABILITY"
+    SPEEDTEST_HTTP_STREAMS = "NP_SPEEDTEST_HTTP_STREAMS"
+    SPEEDTEST_HTTP_TIMEOUT = "NP_SPEEDTEST_HTTP_TIMEOUT"
+    SPEEDTEST_HTTP_UPLOAD_URL = "NP_SPEEDTEST_HTTP_UPLOAD_URL"
+    SPEEDTEST_HTTP_VERIFY_SSL = "NP_SPEEDTEST_HTTP_VERIFY_SSL"
     SPEEDTEST_INTERVAL = "NP_SPEEDTEST_INTERVAL"
+    SPEEDTEST_MEMORY_LIMIT = "NP_SPEEDTEST_MEMORY_LIMIT"
+    SPEEDTEST_SERVER_TTL = "NP_SPEEDTEST_SERVER_TTL"
+    SPEEDTEST_TIMEOUT = "NP_SPEEDTEST_TIMEOUT"
     SPEEDTEST_WEIGHT_REBALANCE = "NP_WEIGHT_SPEEDTEST_REBALANCE"
     SPEEDTEST_WEIGHT_ENFORCE = "NP_WEIGHT_SPEEDTEST_ENFORCE"
 
+    TCP_CONCURRENCY = "NP_TCP_CONCURRENCY"
+    TCP_COUNT = "NP_TCP_COUNT"
+    TCP_ENABLED = "NP_TCP_ENABLED"
+    TCP_INTERVAL = "NP_TCP_INTERVAL"
+    TCP_TARGETS = "NP_TCP_TARGETS"
+    TCP_TIMEOUT = "NP_TCP_TIMEOUT"
+
     THRESHOLD_EXTERNAL_DNS_LATENCY = "NP_THRESHOLD_EXTERNAL_DNS_LATENCY"
     THRESHOLD_INTERNAL_DNS_LATENCY = "NP_THRESHOLD_INTERNAL_DNS_LATENCY"
     THRESHOLD_JITTER = "NP_THRESHOLD_JITTER"
@@ -72,6 +141,14 @@ class EnvVars(Enum):
     THRESHOLD_SPEEDTEST_DOWNLOAD = "NP_THRESHOLD_SPEEDTEST_DOWNLOAD"
     THRESHOLD_SPEEDTEST_UPLOAD = "NP_THRESHOLD_SPEEDTEST_UPLOAD"
 
+    TRACE_COUNT = "NP_TRACE_COUNT"
+    TRACE_ENABLED = "NP_TRACE_ENABLED"
+    TRACE_INTERVAL = "NP_TRACE_INTERVAL"
+    TRACE_MAX_HOPS = "NP_TRACE_MAX_HOPS"
+    TRACE_TARGETS = "NP_TRACE_TARGETS"
+    TRACE_TIMEOUT = "NP_TRACE_TIMEOUT"
+    TRACE_WINDOW = "NP_TRACE_WINDOW"
+
     WEIGHT_EXTERNAL_DNS_LATENCY = "NP_WEIGHT_EXTERNAL_DNS_LATENCY"
     WEIGHT_INTERNAL_DNS_LATENCY = "NP_WEIGHT_INTERNAL_DNS_LATENCY"
     WEIGHT_JITTER = "NP_WEIGHT_JITTER"
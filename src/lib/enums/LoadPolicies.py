@@ -0,0 +1,21 @@
+from enum import Enum
+
+
+class LoadPolicies(Enum):
+    # probe as usual, whether or not a speed test is running
+    IGNORE = "IGNORE"
+    # skip the cycles a speed test overlaps, their results are not published
+    PAUSE = "PAUSE"
+    # publish the results of the cycles a speed test overlaps with under_load set
+    TAG = "TAG"
+
+    @staticmethod
+    def from_str(name: str):
+        try:
+            return LoadPolicies[name.upper()]
+        except KeyError:
+            return LoadPolicies.TAG
+
+    @staticmethod
+    def to_list():
+        return [x.name for x in LoadPolicies]
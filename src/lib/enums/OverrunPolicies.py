@@ -0,0 +1,19 @@
+from enum import Enum
+
+
+class OverrunPolicies(Enum):
+    # drop ticks that come due while the previous run is still going
+    SKIP = "SKIP"
+    # run once as soon as the previous run finishes, however many ticks were missed
+    COALESCE = "COALESCE"
+
+    @staticmethod
+    def from_str(name: str):
+        try:
+            return OverrunPolicies[name.upper()]
+        except KeyError:
+            return OverrunPolicies.SKIP
+
+    @staticmethod
+    def to_list():
+        return [x.name for x in OverrunPolicies]
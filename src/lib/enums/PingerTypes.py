@@ -0,0 +1,18 @@
+from enum import Enum
+
+
+class PingerTypes(Enum):
+    ICMP = "ICMP"
+    SYSTEM = "SYSTEM"
+    FPING = "FPING"
+
+    @staticmethod
+    def from_str(name: str):
+        try:
+            return PingerTypes[name.upper()]
+        except KeyError:
+            return PingerTypes.ICMP
+
+    @staticmethod
+    def to_list():
+        return [x.name for x in PingerTypes]
@@ -0,0 +1,17 @@
+from enum import Enum
+
+
+class ProbeModes(Enum):
+    BURST = "BURST"
+    STREAM = "STREAM"
+
+    @staticmethod
+    def from_str(name: str):
+        try:
+            return ProbeModes[name.upper()]
+        except KeyError:
+            return ProbeModes.BURST
+
+    @staticmethod
+    def to_list():
+        return [x.name for x in ProbeModes]
@@ -0,0 +1,17 @@
+from enum import Enum
+
+
+class SpeedTestBackends(Enum):
+    SPEEDTEST = "SPEEDTEST"
+    HTTP = "HTTP"
+
+    @staticmethod
+    def from_str(name: str):
+        try:
+            return SpeedTestBackends[name.upper()]
+        except KeyError:
+            return SpeedTestBackends.SPEEDTEST
+
+    @staticmethod
+    def to_list():
+        return [x.name for x in SpeedTestBackends]
@@ -9,6 +9,14 @@ class YamlVars(Enum):
     DATASTORE_SPEEDTEST_TYPE = "$.datastore.speedtest.type"
     DATASTORE_PROBE_TOPIC = "$.datastore.probe.topic"
     DATASTORE_SPEEDTEST_TOPIC = "$.datastore.speedtest.topic"
+    DATASTORE_SPEEDTEST_SERVER_TOPIC = "$.datastore.speedtest.server_topic"
+    DATASTORE_SPEEDTEST_LOAD_TOPIC = "$.datastore.speedtest.load_topic"
+    DATASTORE_TCP_TYPE = "$.datastore.tcp.type"
+    DATASTORE_TCP_TOPIC = "$.datastore.tcp.topic"
+    DATASTORE_HTTP_PROBE_TYPE = "$.datastore.http_probe.type"
+    DATASTORE_HTTP_PROBE_TOPIC = "$.datastore.http_probe.topic"
+    DATASTORE_TRACE_TYPE = "$.datastore.trace.type"
+    DATASTORE_TRACE_TOPIC = "$.datastore.trace.topic"
 
     FILE_DATASTORE_PATH = "$.datastore.file.path"
 
@@ -28,6 +36,15 @@ class YamlVars(Enum):
     HTTP_WRITE_COOKIES = "$.datastore.http.write.cookies"
     HTTP_WRITE_PARAMS = "$.datastore.http.write.params"
 
+    HTTP_PROBE_CONCURRENCY = "$.http_probe.concurrency"
+    HTTP_PROBE_COUNT = "$.http_probe.count"
+    HTTP_PROBE_ENABLED = "$.http_probe.enabled"
+    HTTP_PROBE_INTERVAL = "$.http_probe.interval"
+    HTTP_PROBE_KEEPALIVE = "$.http_probe.keepalive"
+    HTTP_PROBE_TIMEOUT = "$.http_probe.timeout"
+    HTTP_PROBE_URLS = "$.http_probe.urls"
+    HTTP_PROBE_VERIFY_SSL = "$.http_probe.verify_ssl"
+
     LOG_LEVEL = "$.logging.level"
     LOG_FORMAT = "$.logging.format"
     LOG_DATE_FORMAT = "$.logging.date_format"
@@ -44,12 +61,42 @@ class YamlVars(Enum):
     PRESENTATION_PORT = "$.presentation.port"
     PRESENTATION_INTERFACE = "$.presentation.interface"
 
+    SCHEDULER_JITTER = "$.scheduler.jitter"
+    SCHEDULER_LOAD_LOCK = "$.scheduler.load.lock"
+    SCHEDULER_LOAD_POLICY = "$.scheduler.load.policy"
+    SCHEDULER_LOAD_SHARED = "$.scheduler.load.shared"
+    SCHEDULER_OVERRUN = "$.scheduler.overrun"
+    SCHEDULER_RATE_LIMIT = "$.scheduler.rate_limit"
+    SCHEDULER_RATE_BURST = "$.scheduler.rate_burst"
+
+    PROBE_ADAPTIVE = "$.probe.adaptive.enabled"
+    PROBE_ADAPTIVE_MAX_COUNT = "$.probe.adaptive.max_count"
+    PROBE_ADAPTIVE_MAX_INTERVAL = "$.probe.adaptive.max_interval"
+    PROBE_ADAPTIVE_MIN_COUNT = "$.probe.adaptive.min_count"
+    PROBE_ADAPTIVE_MIN_INTERVAL = "$.probe.adaptive.min_interval"
+    PROBE_BACKEND = "$.probe.backend"
     PROBE_COUNT = "$.probe.count"
+    PROBE_CONCURRENCY = "$.probe.concurrency"
     PROBE_ENABLED = "$.probe.enabled"
     PROBE_INTERVAL = "$.probe.interval"
+    PROBE_GROUPS = "$.probe.groups"
+    PROBE_SOURCES = "$.probe.sources"
+    PROBE_TIMEOUT = "$.probe.timeout"
+    PROBE_MODE = "$.probe.mode"
+    PROBE_STREAM_RATE = "$.probe.stream.rate"
+    PROBE_STREAM_WINDOW = "$.probe.stream.window"
+    PROBE_DEADLINE = "$.probe.deadline"
     PROBE_DEVICE_ID = "$.probe.device_id"
+    PROBE_DNS_CONCURRENCY = "$.probe.dns.concurrency"
+    PROBE_DNS_CACHE_MISS = "$.probe.dns.cache_miss"
+    PROBE_DNS_RECORD_TYPES = "$.probe.dns.record_types"
+    PROBE_DNS_SAMPLES = "$.probe.dns.samples"
     PROBE_DNS_TEST_SITE = "$.probe.dns.test"
+    PROBE_DNS_TEST_SITES = "$.probe.dns.tests"
+    PROBE_DNS_TIMEOUT = "$.probe.dns.timeout"
     PROBE_SITES = "$.probe.sites"
+    PROBE_SHARD_PROCESSES = "$.probe.shard.processes"
+    PROBE_SHARD_WORKERS = "$.probe.shard.workers"
     PROBE_LOCAL_DNS = "$.probe.dns.local"
     PROBE_EXTERNAL_DNS = "$.probe.dns.nameservers"
 
@@ -58,11 +105,35 @@ class YamlVars(Enum):
     REDIS_DB = "$.datastore.redis.db"
     REDIS_PASSWORD = "$.datastore.redis.password"
 
+    SPEEDTEST_BACKEND = "$.speedtest.backend"
+    SPEEDTEST_BUFFERBLOAT = "$.speedtest.bufferbloat.enabled"
+    SPEEDTEST_BUFFERBLOAT_IDLE = "$.speedtest.bufferbloat.idle"
+    SPEEDTEST_BUFFERBLOAT_RATE = "$.speedtest.bufferbloat.rate"
+    SPEEDTEST_BUFFERBLOAT_TARGET = "$.speedtest.bufferbloat.target"
     SPEEDTEST_ENABLED = "$.speedtest.enabled"
+    SPEEDTEST_HTTP_BYTES = "$.speedtest.http.bytes"
+    SPEEDTEST_HTTP_DOWNLOAD_URL = "$.speedtest.http.download_url"
+    SPEEDTEST_HTTP_DURATION = "$.speedtest.http.duration"
+    SPEEDTEST_HTTP_LATENCY_URL = "$.speedtest.http.latency_url"
+    SPEEDTEST_HTTP_STABILITY = "$.speedtest.http.stability"
+    SPEEDTEST_HTTP_STREAMS = "$.speedtest.http.streams"
+    SPEEDTEST_HTTP_TIMEOUT = "$.speedtest.http.timeout"
+    SPEEDTEST_HTTP_UPLOAD_URL = "$.speedtest.http.upload_url"
+    SPEEDTEST_HTTP_VERIFY_SSL = "$.speedtest.http.verify_ssl"
     SPEEDTEST_INTERVAL = "$.speedtest.interval"
+    SPEEDTEST_MEMORY_LIMIT = "$.speedtest.memory_limit"
+    SPEEDTEST_SERVER_TTL = "$.speedtest.server_ttl"
+    SPEEDTEST_TIMEOUT = "$.speedtest.timeout"
     SPEEDTEST_WEIGHT_REBALANCE = "$.health.weights.speedtest_rebalance"
     SPEEDTEST_WEIGHT_ENFORCE = "$.health.weights.speedtest_enforce"
 
+    TCP_CONCURRENCY = "$.tcp.concurrency"
+    TCP_COUNT = "$.tcp.count"
+    TCP_ENABLED = "$.tcp.enabled"
+    TCP_INTERVAL = "$.tcp.interval"
+    TCP_TARGETS = "$.tcp.targets"
+    TCP_TIMEOUT = "$.tcp.timeout"
+
     THRESHOLD_EXTERNAL_DNS_LATENCY = "$.health.thresholds.external_dns_latency"
     THRESHOLD_INTERNAL_DNS_LATENCY = "$.health.thresholds.internal_dns_latency"
     THRESHOLD_JITTER = "$.health.thresholds.jitter"
@@ -71,6 +142,14 @@ class YamlVars(Enum):
     THRESHOLD_SPEEDTEST_DOWNLOAD = "$.health.thresholds.speedtest_download"
     THRESHOLD_SPEEDTEST_UPLOAD = "$.health.thresholds.speedtest_upload"
 
+    TRACE_COUNT = "$.trace.count"
+    TRACE_ENABLED = "$.trace.enabled"
+    TRACE_INTERVAL = "$.trace.interval"
+    TRACE_MAX_HOPS = "$.trace.max_hops"
+    TRACE_TARGETS = "$.trace.targets"
+    TRACE_TIMEOUT = "$.trace.timeout"
+    TRACE_WINDOW = "$.trace.window"
+
     WEIGHT_EXTERNAL_DNS_LATENCY = "$.health.weights.external_dns_latency"
     WEIGHT_INTERNAL_DNS_LATENCY = "$.health.weights.internal_dns_latency"
     WEIGHT_JITTER = "$.health.weights.jitter"
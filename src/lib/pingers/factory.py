@@ -0,0 +1,47 @@
+import typing
+from concurrent.futures import Executor
+
+from config import ApplicationConfiguration
+from config.ProbeSourceConfiguration import ProbeSourceConfiguration
+from lib.enums.PingerTypes import PingerTypes
+from lib.logging import setup_logging
+
+
+class PingerFactory:
+    def __init__(self):
+        pass
+
+    def create(
+        self,
+        type: PingerTypes,
+        executor: typing.Optional[Executor] = None,
+        timeout: float = 2,
+        source: typing.Optional[ProbeSourceConfiguration] = None,
+    ):
+        config = ApplicationConfiguration
+        logger = setup_logging(self.__class__.__name__, config.logging)
+        if type == PingerTypes.ICMP:
+            from lib.pingers.icmp import IcmpPinger
+
+            if IcmpPinger.available():
+                logger.debug("Creating ICMP Pinger")
+                return IcmpPinger(executor, timeout, source)
+            logger.warning("ICMP sockets are not available, falling back to the System Pinger")
+            type = PingerTypes.SYSTEM
+
+        if type == PingerTypes.FPING:
+            from lib.pingers.fping import FpingPinger
+
+            if FpingPinger.available():
+                logger.debug("Creating Fping Pinger")
+                return FpingPinger(executor, timeout, source)
+            logger.warning("fping was not found, falling back to the System Pinger")
+            type = PingerTypes.SYSTEM
+
+        if type == PingerTypes.SYSTEM:
+            logger.debug("Creating System Pinger")
+            from lib.pingers.system import SystemPinger
+
+            return SystemPinger(executor, timeout, source)
+        else:
+            raise Exception("Pinger type not supported")
@@ -0,0 +1,129 @@
+import json
+import math
+import re
+import shutil
+import subprocess
+import time
+import traceback
+import typing
+from concurrent.futures import Executor
+
+from config.ProbeSourceConfiguration import ProbeSourceConfiguration
+from lib.pingers.pinger import Pinger
+from lib.schedulers.ratelimiter import SharedRateLimiter
+from lib.stats.rttsamples import RttSamples
+
+
+class FpingPinger(Pinger):
+    """Pings every site with a single `fping -C` process per cycle."""
+
+    PERIOD = 100  # ms between echo requests to the same site, same as `ping -i 0.1`
+    SPACING = 10  # ms between echo requests to any site, fping's default -i
+
+    # google.com : 11.48 12.91 - 14.47
+    RESULT_REGEX = re.compile(r"^(\S+)\s+:\s+((?:[\d.]+|-)(?:\s+(?:[\d.]+|-))*)\s*$")
+
+    def __init__(
+        self,
+        executor: typing.Optional[Executor] = None,
+        timeout: float = 2,
+        source: typing.Optional[ProbeSourceConfiguration] = None,
+    ):
+        super().__init__(executor, timeout, source)
+        self.logger.debug("Initializing Fping Pinger")
+
+    @staticmethod
+    def available() -> bool:
+        return shutil.which("fping") is not None
+
+    def ping(self, sites: typing.List[str], count: int, deadline: typing.Optional[float] = None) -> typing.List[dict]:
+        if not sites:
+            return []
+
+        # fping paces itself at the limiter's rate with -i, the reservation keeps the other probes out of its way
+        started = time.monotonic()
+        if not SharedRateLimiter.acquire(
+            "fping", len(sites) * count, started + deadline if deadline is not None else math.inf
+        ):
+            self.logger.warning("The rate limit left no time to run fping before the cycle deadline")
+            return [RttSamples(unsent=count).summary(site) for site in sites]
+        if deadline is not None:
+            deadline = max(0.0, deadline - (time.monotonic() - started))
+        spacing = max(1, math.ceil(1000 / SharedRateLimiter.rate)) if SharedRateLimiter.enabled else self.SPACING
+        pacing = ["-i", str(spacing)] if SharedRateLimiter.enabled else []
+        sent = count
+        if deadline is not None:
+            # fping only prints the results when it exits, so it is only asked for the requests that can be sent and
+            # answered within the deadline. The others are reported as unsent instead of lost
+            period = max(self.PERIOD, spacing * len(sites)) / 1000
+            sent = min(count, max(0, math.floor(round((deadline - self.timeout) / period, 6)) + 1))
+            if sent == 0:
+                self.logger.warning(f"The {deadline:.1f}s left of the cycle deadline are shorter than the timeout")
+                return [RttSamples(unsent=count).summary(site) for site in sites]
+        binding = []
+        if self.source is not None:
+            if self.source.interface:
+                binding += ["-I", self.source.interface]
+            if self.source.address:
+                binding += ["-S", self.source.address]
+
+        try:
+            # -q suppresses the per-reply lines, -C prints every rtt of each target on one line of stderr
+            process = subprocess.run(
+                [
+                    "fping",
+                    "-q",
+                    "-C",
+                    str(sent),
+                    "-p",
+                    str(self.PERIOD),
+                    "-t",
+                    str(int(self.timeout * 1000)),
+                    *pacing,
+                    *binding,
+                    *sites,
+                ],
+                capture_output=True,
+                text=True,
+                timeout=deadline,
+            )
+        except subprocess.TimeoutExpired:
+            # fping only prints the results when it exits, every site missed the deadline
+            self.logger.warning(f"fping did not finish within the {deadline}s cycle deadline")
+            return [RttSamples([None] * count).summary(site) for site in sites]
+        except Exception as e:
+            self.logger.error(f"Error pinging {', '.join(sites)}")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return []
+
+        self.logger.debug(process.stderr)
+        return self.parse(process.stderr, sites, count - sent)
+
+    def parse(self, output: str, sites: typing.List[str], unsent: int = 0) -> typing.List[dict]:
+        stats = []
+        found = set()
+        for line in output.splitlines():
+            match = self.RESULT_REGEX.match(line.strip())
+            if not match:
+                continue
+
+            site = match.group(1)
+            if site in found or site not in sites:
+                continue
+            found.add(site)
+
+            try:
+                samples = RttSamples((None if rtt == "-" else float(rtt) for rtt in match.group(2).split()), unsent)
+                netdata = samples.summary(site)
+                self.logger.debug(json.dumps(netdata, indent=4))
+                stats.append(netdata)
+            except ValueError as e:
+                self.logger.error(f"Error parsing fping output for {site}")
+                self.logger.error(e)
+
+        for site in sites:
+            if site not in found:
+                self.logger.warning(f"Invalid ping results for {site}")
+
+        return stats
@@ -0,0 +1,262 @@
+import asyncio
+import itertools
+import json
+import math
+import os
+import socket
+import struct
+import time
+import traceback
+import typing
+from concurrent.futures import Executor
+
+from config.ProbeSourceConfiguration import ProbeSourceConfiguration
+from lib.clients.sourcebinding import bind_socket
+from lib.pingers.pinger import Pinger
+from lib.schedulers.ratelimiter import SharedRateLimiter
+from lib.stats.rttsamples import RttSamples
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMPV6_ECHO_REQUEST = 128
+ICMPV6_ECHO_REPLY = 129
+
+ICMP_HEADER = struct.Struct("!BBHHH")
+
+# raw sockets see every echo reply on the host, each session of the process needs an identifier of its own
+SESSION_COUNTER = itertools.count()
+
+
+def checksum(data: bytes) -> int:
+    # RFC 1071 internet checksum
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+class EchoSession:
+    """Multiplexes ICMP echo requests for any number of targets over one socket per address family.
+
+    Unprivileged datagram ICMP sockets are tried first (net.ipv4.ping_group_range), then raw sockets,
+    which require CAP_NET_RAW. Replies are matched to their request by address and sequence number, and on raw
+    sockets by the identifier of the session.
+    """
+
+    PAYLOAD = b"netprobe" * 7  # 56 bytes, the same payload size `ping` sends by default
+
+    def __init__(
+        self, identifier: typing.Optional[int] = None, source: typing.Optional[ProbeSourceConfiguration] = None
+    ):
+        if identifier is None:
+            # spread over the 16 bits so the sessions of processes with close pids do not collide either
+            identifier = os.getpid() + next(SESSION_COUNTER) * 0x9E37
+        self.identifier = identifier & 0xFFFF
+        self.source = source  # uplink the echo requests are sent from, None for the default route
+        self.sockets: typing.Dict[int, socket.socket] = {}
+        self.raw: typing.Dict[int, bool] = {}
+        self.pending: typing.Dict[typing.Tuple[int, int], typing.Tuple[str, float, asyncio.Future]] = {}
+        self.sequence = 0
+        self.loop: typing.Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def create_socket(
+        family: int, source: typing.Optional[ProbeSourceConfiguration] = None
+    ) -> typing.Tuple[socket.socket, bool]:
+        proto = socket.IPPROTO_ICMP if family == socket.AF_INET else socket.IPPROTO_ICMPV6
+        try:
+            sock, raw = socket.socket(family, socket.SOCK_DGRAM, proto), False
+        except PermissionError:
+            sock, raw = socket.socket(family, socket.SOCK_RAW, proto), True
+        try:
+            bind_socket(sock, source)
+        except OSError:
+            sock.close()
+            raise
+        return sock, raw
+
+    def open(self, family: int) -> socket.socket:
+        if family in self.sockets:
+            return self.sockets[family]
+
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+
+        sock, raw = self.create_socket(family, self.source)
+        sock.setblocking(False)
+        self.sockets[family] = sock
+        self.raw[family] = raw
+        self.loop.add_reader(sock.fileno(), self._on_readable, family)
+        return sock
+
+    def close(self) -> None:
+        for family, sock in self.sockets.items():
+            if self.loop is not None:
+                self.loop.remove_reader(sock.fileno())
+            sock.close()
+        self.sockets = {}
+        for _, _, future in self.pending.values():
+            if not future.done():
+                future.cancel()
+        self.pending = {}
+
+    def _next_sequence(self, family: int) -> int:
+        # skip sequence numbers that are still waiting on a reply
+        for _ in range(0x10000):
+            self.sequence = (self.sequence + 1) & 0xFFFF
+            if (family, self.sequence) not in self.pending:
+                return self.sequence
+        raise RuntimeError("No free ICMP sequence numbers")
+
+    def _packet(self, family: int, sequence: int) -> bytes:
+        request = ICMP_ECHO_REQUEST if family == socket.AF_INET else ICMPV6_ECHO_REQUEST
+        header = ICMP_HEADER.pack(request, 0, 0, self.identifier, sequence)
+        # the kernel fills in the checksum for datagram and ICMPv6 sockets, raw IPv4 needs it computed here
+        header = ICMP_HEADER.pack(request, 0, checksum(header + self.PAYLOAD), self.identifier, sequence)
+        return header + self.PAYLOAD
+
+    def _on_readable(self, family: int) -> None:
+        sock = self.sockets.get(family)
+        if sock is None:
+            return
+        while True:
+            try:
+                data, addr = sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            received = time.perf_counter()
+
+            if family == socket.AF_INET and self.raw[family]:
+                # raw IPv4 sockets hand us the IP header as well
+                data = data[(data[0] & 0x0F) * 4 :]
+            if len(data) < ICMP_HEADER.size:
+                continue
+
+            icmp_type, _, _, identifier, sequence = ICMP_HEADER.unpack_from(data)
+            reply = ICMP_ECHO_REPLY if family == socket.AF_INET else ICMPV6_ECHO_REPLY
+            if icmp_type != reply:
+                continue
+            # datagram sockets rewrite the identifier and only deliver our own replies
+            if self.raw[family] and identifier != self.identifier:
+                continue
+
+            entry = self.pending.get((family, sequence))
+            if entry is None:
+                continue
+            address, sent, future = entry
+            if addr[0] != address:
+                continue
+            del self.pending[(family, sequence)]
+            if not future.done():
+                future.set_result((received - sent) * 1000)
+
+    async def echo(
+        self, family: int, address: str, timeout: float, ttl: typing.Optional[int] = None
+    ) -> typing.Optional[float]:
+        """Sends a single echo request and returns the round trip time in ms, or None if it was lost.
+
+        With a `ttl`, the request expires after that many hops instead of the socket's default.
+        """
+        sock = self.open(family)
+        if ttl is not None:
+            if family == socket.AF_INET:
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+            else:
+                sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_UNICAST_HOPS, ttl)
+        sequence = self._next_sequence(family)
+        future = self.loop.create_future()  # type: ignore
+        sockaddr = (address, 0) if family == socket.AF_INET else (address, 0, 0, 0)
+        self.pending[(family, sequence)] = (address, time.perf_counter(), future)
+        try:
+            sock.sendto(self._packet(family, sequence), sockaddr)
+            return await asyncio.wait_for(future, timeout)
+        except (asyncio.TimeoutError, OSError):
+            return None
+        finally:
+            self.pending.pop((family, sequence), None)
+
+
+class IcmpPinger(Pinger):
+    """Pings every site from a single asyncio loop using ICMP sockets instead of spawning `ping` processes."""
+
+    def __init__(
+        self,
+        executor: typing.Optional[Executor] = None,
+        timeout: float = 2,
+        source: typing.Optional[ProbeSourceConfiguration] = None,
+    ):
+        super().__init__(executor, timeout, source)
+        self.logger.debug("Initializing ICMP Pinger")
+
+    @staticmethod
+    def available() -> bool:
+        try:
+            sock, _ = EchoSession.create_socket(socket.AF_INET)
+            sock.close()
+            return True
+        except OSError:
+            return False
+
+    def ping(self, sites: typing.List[str], count: int, deadline: typing.Optional[float] = None) -> typing.List[dict]:
+        try:
+            return asyncio.run(self._ping_all(sites, count, deadline))
+        except Exception as e:
+            self.logger.error("Error running ICMP probes")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return []
+
+    async def _ping_all(
+        self, sites: typing.List[str], count: int, deadline: typing.Optional[float]
+    ) -> typing.List[dict]:
+        session = EchoSession(source=self.source)
+        until = asyncio.get_running_loop().time() + deadline if deadline is not None else math.inf
+        try:
+            results = await asyncio.gather(*[self._ping_site(session, site, count, until) for site in sites])
+        finally:
+            session.close()
+        return [netdata for netdata in results if netdata is not None]
+
+    async def _resolve(self, site: str) -> typing.Tuple[int, str]:
+        loop = asyncio.get_running_loop()
+        addresses = await loop.getaddrinfo(site, None, type=socket.SOCK_RAW)
+        family, _, _, _, sockaddr = addresses[0]
+        return family, sockaddr[0]
+
+    async def _ping_site(self, session: EchoSession, site: str, count: int, until: float) -> typing.Optional[dict]:
+        loop = asyncio.get_running_loop()
+        try:
+            family, address = await asyncio.wait_for(self._resolve(site), max(0.0, until - loop.time()))
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Resolving {site} did not finish before the cycle deadline")
+            return RttSamples([None] * count).summary(site)
+        except (OSError, IndexError) as e:
+            self.logger.warning(f"Invalid ping results for {site}: {e}")
+            return None
+
+        try:
+            echoes = []
+            for index in range(count):
+                if index > 0:
+                    await asyncio.sleep(self.INTERVAL)
+                if not await SharedRateLimiter.wait("icmp", until=until):
+                    break
+                remaining = until - loop.time()
+                if remaining <= 0:
+                    break
+                echoes.append(asyncio.ensure_future(session.echo(family, address, min(self.timeout, remaining))))
+            rtts = list(await asyncio.gather(*echoes))
+        except OSError as e:
+            self.logger.error(f"Error pinging {site}")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return None
+
+        # requests the deadline left no time to send are reported apart from the lost ones
+        netdata = RttSamples(rtts, count - len(rtts)).summary(site)
+        self.logger.debug(json.dumps(netdata, indent=4))
+        return netdata
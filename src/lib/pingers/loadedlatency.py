@@ -0,0 +1,118 @@
+import asyncio
+import contextlib
+import time
+import typing
+
+from lib.pingers.stream import StreamPinger
+from lib.stats.rttsamples import RttSamples
+
+# the scale of the common bufferbloat tests: the added latency (ms) each grade is given below, F above the last
+GRADES = ["A+", "A", "B", "C", "D", "F"]
+GRADE_LIMITS = [5, 30, 60, 200, 400]
+
+
+def bufferbloat_grade(added: float) -> str:
+    for grade, limit in zip(GRADES, GRADE_LIMITS):
+        if added < limit:
+            return grade
+    return GRADES[-1]
+
+
+def bufferbloat_score(grade: str) -> int:
+    # 5 for A+ down to 0 for F, so the grade can be graphed
+    return len(GRADES) - 1 - GRADES.index(grade)
+
+
+def measure_phases(
+    phases: typing.Dict[str, typing.Callable[[], float]],
+    target: typing.Optional[str],
+    rate: float,
+    idle: float,
+    on_partial: typing.Optional[typing.Callable[[dict], None]] = None,
+) -> dict:
+    """Runs the phases of a speed test in order and returns their results by name.
+
+    When `target` is set, the latency to it is measured idle and during every phase and added to the results.
+    `on_partial` is called with the results so far after every phase.
+    """
+    results = {}
+    loaded = LoadedLatency(target, rate, idle) if target else None
+    with loaded or contextlib.nullcontext():
+        for name, run in phases.items():
+            if loaded:
+                loaded.phase(name)
+            results[name] = run()
+            if on_partial is not None:
+                on_partial({**results, **(loaded.results() if loaded else {})})
+    return {**results, **(loaded.results() if loaded else {})}
+
+
+class LoadedLatency(StreamPinger):
+    """Pings one target at a steady rate through the phases of a speed test.
+
+    The stream is started before the test and measures the idle latency for `idle` seconds, then `phase()` switches
+    it to a new set of samples before the download and upload. The difference between the median latency of the
+    busiest phase and the idle median is the latency the line adds under load, graded like the common bufferbloat
+    tests (A+ below 5ms up to F at 400ms and above).
+    """
+
+    IDLE = "idle"
+
+    def __init__(self, target: str, rate: float, idle: float, timeout: float = 2):
+        super().__init__([target], rate, 0, timeout)
+        self.target = target
+        self.idle = idle
+        self.phases: typing.Dict[str, RttSamples] = {}
+
+    def __enter__(self) -> "LoadedLatency":
+        self.start()
+        self.phase(self.IDLE)
+        time.sleep(self.idle)
+        return self
+
+    def __exit__(self, *args) -> None:
+        # the last requests are given time to be answered, they would count as lost if they were cancelled
+        self.loop.call_soon_threadsafe(self.windows.__setitem__, self.target, RttSamples())  # type: ignore
+        time.sleep(self.timeout)
+        self.stop()
+
+    def phase(self, name: str) -> None:
+        samples = self.phases.setdefault(name, RttSamples())
+        # swapped on the ping loop so a reply is never added while the window changes
+        self.loop.call_soon_threadsafe(self.windows.__setitem__, self.target, samples)  # type: ignore
+
+    def results(self) -> dict:
+        """Returns the latency percentiles and loss of every phase, and the grade if the target answered."""
+        if self.loop is not None and self.loop.is_running():
+            summaries = asyncio.run_coroutine_threadsafe(self._summaries(), self.loop).result()
+        else:
+            # the stream is over, nothing adds to the samples any more
+            summaries = self._summarize()
+        results: typing.Dict[str, typing.Any] = {}
+        medians = {}
+        for name, summary in summaries.items():
+            results[f"latency_{name}_loss"] = summary["loss"]
+            if "p50" not in summary:
+                # no reply during the phase
+                continue
+            results[f"latency_{name}"] = summary["latency"]
+            results[f"latency_{name}_jitter"] = summary["jitter"]
+            for percent in RttSamples.PERCENTILES:
+                results[f"latency_{name}_p{percent}"] = summary[f"p{percent}"]
+            medians[name] = summary["p50"]
+
+        idle = medians.pop(self.IDLE, None)
+        if idle is not None and medians:
+            added = round(max(0.0, max(medians.values()) - idle), 3)
+            results["bufferbloat"] = added
+            results["bufferbloat_grade"] = bufferbloat_grade(added)
+            results["bufferbloat_score"] = bufferbloat_score(results["bufferbloat_grade"])
+        return results
+
+    async def _summaries(self) -> typing.Dict[str, dict]:
+        # runs on the ping loop so the samples are never read while a reply is being added
+        return self._summarize()
+
+    def _summarize(self) -> typing.Dict[str, dict]:
+        # phases that were over before a request went out have nothing to report
+        return {name: samples.summary(self.target) for name, samples in self.phases.items() if samples.sent}
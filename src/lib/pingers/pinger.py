@@ -0,0 +1,28 @@
+import typing
+from concurrent.futures import Executor
+
+from config import ApplicationConfiguration
+from config.ProbeSourceConfiguration import ProbeSourceConfiguration
+from lib.logging import setup_logging
+
+
+class Pinger:
+    INTERVAL = 0.1  # seconds between echo requests to the same site, same as `ping -i 0.1`
+
+    def __init__(
+        self,
+        executor: typing.Optional[Executor] = None,
+        timeout: float = 2,
+        source: typing.Optional[ProbeSourceConfiguration] = None,
+    ):
+        config = ApplicationConfiguration
+        self.logger = setup_logging(self.__class__.__name__, config.logging)
+        # shared worker pool for backends that probe one site per task
+        self.executor = executor
+        self.timeout = timeout  # seconds to wait for each reply
+        self.source = source  # uplink to ping from, None for the default route
+
+    def ping(self, sites: typing.List[str], count: int, deadline: typing.Optional[float] = None) -> typing.List[dict]:
+        # returns one RttSamples.summary() record per site that could be probed. Echo requests that are not
+        # answered, or not even sent, within `deadline` seconds count as lost
+        return []
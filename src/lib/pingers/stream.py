@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import traceback
+import typing
+
+from config import ApplicationConfiguration
+from config.ProbeSourceConfiguration import ProbeSourceConfiguration
+from lib.logging import setup_logging
+from lib.pingers.icmp import EchoSession
+from lib.resolvers.resolvecache import Resolution, SharedResolveCache
+from lib.schedulers.ratelimiter import SharedRateLimiter
+from lib.stats.rollingwindow import RollingWindow
+
+
+class StreamPinger:
+    """Pings every site continuously at a steady rate from one long-lived ICMP session.
+
+    The session runs on an asyncio loop in a background thread. Every reply (or timeout) is added to the site's
+    RollingWindow, and `snapshot()` returns the window statistics whenever the probe publishes, so outages between
+    publishes are not missed and the packets are spread evenly instead of being sent in bursts.
+    """
+
+    RETRY = 10  # seconds to wait before resolving a site again after a failure
+
+    def __init__(
+        self,
+        sites: typing.List[str],
+        rate: float,
+        window: float,
+        timeout: float = 2,
+        source: typing.Optional[ProbeSourceConfiguration] = None,
+    ):
+        config = ApplicationConfiguration
+        self.logger = setup_logging(self.__class__.__name__, config.logging)
+        self.sites = sites
+        self.rate = rate  # echo requests per second to each site
+        self.timeout = timeout  # seconds to wait for each reply
+        self.windows = {site: RollingWindow(int(window * rate)) for site in sites}
+        self.resolutions: typing.Dict[str, Resolution] = {}
+        self.loop: typing.Optional[asyncio.AbstractEventLoop] = None
+        self.thread: typing.Optional[threading.Thread] = None
+        self.tasks: typing.List[asyncio.Task] = []
+        self.session = EchoSession(source=source)
+
+    def start(self) -> None:
+        if self.thread is not None:
+            return
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name=self.__class__.__name__, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        if self.loop is None or self.thread is None:
+            return
+        self.loop.call_soon_threadsafe(self._cancel)
+        self.thread.join(self.timeout)
+        self.thread = None
+
+    def snapshot(self) -> typing.List[dict]:
+        """Returns one RttSamples.summary() compatible record per site, taken on the ping loop."""
+        if self.loop is None or not self.loop.is_running():
+            return []
+        future = asyncio.run_coroutine_threadsafe(self._snapshot(), self.loop)
+        return future.result()
+
+    async def _snapshot(self) -> typing.List[dict]:
+        # runs on the ping loop so the windows are never read while they are being updated
+        snapshot = []
+        for site, window in self.windows.items():
+            resolution = self.resolutions.get(site)
+            fields = resolution.fields() if resolution is not None else {}
+            if window.sent > 0:
+                snapshot.append({**window.summary(site), **fields})
+            elif resolution is not None and resolution.address is None:
+                snapshot.append({"site": site, **fields})
+            if resolution is not None and not resolution.cached:
+                # the lookup is reported once, the next snapshots use the address it cached
+                self.resolutions[site] = resolution.hit()
+        return snapshot
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.tasks = [self.loop.create_task(self._stream(site)) for site in self.sites]  # type: ignore
+            self.loop.run_until_complete(asyncio.gather(*self.tasks))  # type: ignore
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.error("Error running the ping stream")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+        finally:
+            # let the echoes still in flight finish cancelling before the loop goes away
+            self._cancel()
+            pending = asyncio.all_tasks(self.loop)
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))  # type: ignore
+            self.session.close()
+            self.loop.close()  # type: ignore
+
+    def _cancel(self) -> None:
+        for task in asyncio.all_tasks(self.loop):
+            task.cancel()
+
+    async def _stream(self, site: str) -> None:
+        loop = asyncio.get_running_loop()
+        period = 1 / self.rate
+        while True:
+            resolution = await SharedResolveCache.resolve(site)
+            self.resolutions[site] = resolution
+            if resolution.address is None:
+                await asyncio.sleep(self.RETRY)
+                continue
+
+            # sends are scheduled on a fixed grid, independent of how long each reply takes, until the cached
+            # address expires and the site is resolved again
+            next_send = loop.time()
+            while SharedResolveCache.fresh(resolution):
+                await SharedRateLimiter.wait("stream")
+                # the reply counts toward the window the request was sent in, even if it is swapped meanwhile
+                window = self.windows[site]
+                echo = loop.create_task(self.session.echo(resolution.family, resolution.address, self.timeout))
+                echo.add_done_callback(
+                    lambda task, window=window: window.add(None if task.cancelled() else task.result())
+                )
+                next_send += period
+                await asyncio.sleep(max(0.0, next_send - loop.time()))
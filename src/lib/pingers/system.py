@@ -0,0 +1,118 @@
+import json
+import math
+import os
+import re
+import subprocess
+import time
+import traceback
+import typing
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from config.ProbeSourceConfiguration import ProbeSourceConfiguration
+from lib.pingers.pinger import Pinger
+from lib.schedulers.ratelimiter import SharedRateLimiter
+from lib.stats.rttsamples import RttSamples
+
+
+class SystemPinger(Pinger):
+    """Pings each site with the system `ping` binary, one process per site."""
+
+    def __init__(
+        self,
+        executor: typing.Optional[Executor] = None,
+        timeout: float = 2,
+        source: typing.Optional[ProbeSourceConfiguration] = None,
+    ):
+        super().__init__(executor or ThreadPoolExecutor(thread_name_prefix=self.__class__.__name__), timeout, source)
+        self.logger.debug("Initializing System Pinger")
+
+    def ping(self, sites: typing.List[str], count: int, deadline: typing.Optional[float] = None) -> typing.List[dict]:
+        results = self.executor.map(lambda site: self.pingtest(count, site, deadline), sites)  # type: ignore
+        return [netdata for netdata in results if netdata is not None]
+
+    def pingtest(self, count: int, site: str, deadline: typing.Optional[float] = None) -> typing.Optional[dict]:
+        ping = None
+        if os.name == "nt":
+            # This is only for testing purposes locally.
+            self.logger.warning("Windows detected, using fake ping")
+            try:
+                ping = """64 bytes from 142.250.80.46: icmp_seq=1 ttl=117 time=11.487 ms
+64 bytes from 142.250.80.46: icmp_seq=2 ttl=117 time=14.475 ms
+64 bytes from 142.250.80.46: icmp_seq=3 ttl=117 time=12.783 ms
+3 packets transmitted, 3 received, 0% packet loss, time 203ms
+rtt min/avg/max/mdev = 11.487/12.915/14.475/1.224 ms"""
+            except Exception as e:
+                self.logger.error(f"Error pinging {site}")
+                self.logger.error(e)
+                self.logger.error(traceback.format_exc())
+                return None
+        else:
+            # ping paces its own requests, the limiter holds it back until the budget has room for all of them
+            started = time.monotonic()
+            if not SharedRateLimiter.acquire("ping", count, started + deadline if deadline is not None else math.inf):
+                self.logger.warning(f"The rate limit left no time to ping {site} before the cycle deadline")
+                return RttSamples(unsent=count).summary(site)
+            if deadline is not None:
+                deadline = max(0.0, deadline - (time.monotonic() - started))
+            # never faster than the limiter's rate, it reserved the tokens for the whole run at once
+            interval = max(self.INTERVAL, 1 / SharedRateLimiter.rate) if SharedRateLimiter.enabled else self.INTERVAL
+            wait = str(max(1, math.ceil(self.timeout)))
+            command = ["ping", "-n", "-i", f"{interval:.3f}", "-W", wait, "-c", str(count)]
+            if self.source is not None:
+                # -I takes either the device or the address to ping from
+                command += ["-I", self.source.interface or self.source.address]
+            if deadline is not None:
+                # -w makes ping stop on its own and still print what it got, the timeout catches a hung resolver
+                command += ["-w", str(max(1, math.floor(deadline)))]
+            try:
+                process = subprocess.run(
+                    [*command, site], capture_output=True, text=True, timeout=deadline + 1 if deadline else None
+                )
+                ping = process.stdout
+                # 64 bytes from 142.250.80.46: icmp_seq=1 ttl=117 time=11.487 ms
+                # ...
+                # 10 packets transmitted, 10 received, 0% packet loss, time 9011ms
+                # rtt min/avg/max/mdev = 11.487/12.915/14.475/1.095 ms
+            except subprocess.TimeoutExpired:
+                self.logger.warning(f"Pinging {site} did not finish before the cycle deadline")
+                return RttSamples([None] * count).summary(site)
+            except Exception as e:
+                self.logger.error(f"Error pinging {site}")
+                self.logger.error(e)
+                self.logger.error(traceback.format_exc())
+                return None
+
+        if ping is None:
+            self.logger.error(f"Error pinging {site}. No output from ping command")
+            return None
+
+        try:
+            self.logger.debug(ping)
+            transmitted_regex = re.compile(r"(\d+) packets transmitted", re.MULTILINE | re.DOTALL | re.IGNORECASE)
+            reply_regex = re.compile(r"icmp_seq=(\d+).*?time[=<](\d+(?:\.\d+)?)\s?ms", re.IGNORECASE)
+
+            transmitted_match = transmitted_regex.search(ping)
+            if not transmitted_match:
+                self.logger.critical("Ping output did not match expected format")
+                self.logger.warning(f"Invalid ping results for {site}")
+                return None
+
+            # keyed by sequence number so duplicate replies are only counted once
+            replies = {}
+            for line in ping.splitlines():
+                reply_match = reply_regex.search(line)
+                if reply_match:
+                    replies.setdefault(int(reply_match.group(1)), float(reply_match.group(2)))
+
+            # requests a deadline stopped ping from sending are reported apart from the lost ones
+            transmitted = min(int(transmitted_match.group(1)), count)
+            samples = RttSamples((replies.get(sequence) for sequence in range(1, transmitted + 1)), count - transmitted)
+
+            netdata = samples.summary(site)
+            self.logger.debug(json.dumps(netdata, indent=4))
+            return netdata
+        except Exception as e:
+            self.logger.error(f"Error parsing ping output for {site}")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return None
@@ -0,0 +1,136 @@
+import socket
+import struct
+import time
+import typing
+
+from lib.pingers.icmp import ICMP_ECHO_REPLY, ICMP_HEADER, ICMPV6_ECHO_REPLY, EchoSession
+
+IP_RECVERR = getattr(socket, "IP_RECVERR", 11)
+IPV6_RECVERR = getattr(socket, "IPV6_RECVERR", 25)
+SO_EE_ORIGIN_ICMP = 2
+SO_EE_ORIGIN_ICMP6 = 3
+
+ICMP_DEST_UNREACH = 3
+ICMP_TIME_EXCEEDED = 11
+ICMPV6_DEST_UNREACH = 1
+ICMPV6_TIME_EXCEEDED = 3
+
+# struct sock_extended_err, followed by the sockaddr of the host that sent the ICMP error
+SOCK_EXTENDED_ERR = struct.Struct("=IBBBBII")
+
+# (address of the hop that answered, round trip time in ms, True if it was the target or the path ends there)
+HopReply = typing.Tuple[str, float, bool]
+
+
+class TraceSession(EchoSession):
+    """Sends TTL limited echo requests and matches the ICMP errors of the routers on the way to them.
+
+    Datagram ICMP sockets never see the Time Exceeded messages themselves, the kernel queues them on the socket's
+    error queue (IP_RECVERR) with the original request and the address of the router that sent them. Raw sockets
+    receive them like any other ICMP message, with the original request quoted after the inner IP header. Either way
+    the request's sequence number finds the hop it was sent to, so every hop of every target can be in flight at once.
+    """
+
+    def open(self, family: int) -> socket.socket:
+        opened = family in self.sockets
+        sock = super().open(family)
+        if not opened:
+            if family == socket.AF_INET:
+                sock.setsockopt(socket.SOL_IP, IP_RECVERR, 1)
+            else:
+                sock.setsockopt(socket.IPPROTO_IPV6, IPV6_RECVERR, 1)
+        return sock
+
+    async def hop(self, family: int, address: str, ttl: int, timeout: float) -> typing.Optional[HopReply]:
+        """Sends one echo request that expires after `ttl` hops, returns who answered it or None if nobody did."""
+        # the reply is resolved into a HopReply by _resolve
+        return await self.echo(family, address, timeout, ttl)  # type: ignore
+
+    def _resolve(self, family: int, sequence: int, responder: str, received: float, reached: bool) -> None:
+        entry = self.pending.pop((family, sequence), None)
+        if entry is None:
+            return
+        _, sent, future = entry
+        if not future.done():
+            future.set_result((responder, (received - sent) * 1000, reached))
+
+    def _on_readable(self, family: int) -> None:
+        sock = self.sockets.get(family)
+        if sock is None:
+            return
+        self._read_errors(family, sock)
+        while True:
+            try:
+                data, addr = sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # reports an ICMP error that was queued, it is read from the error queue
+                self._read_errors(family, sock)
+                continue
+            received = time.perf_counter()
+
+            if family == socket.AF_INET and self.raw[family]:
+                # raw IPv4 sockets hand us the IP header as well
+                data = data[(data[0] & 0x0F) * 4 :]
+            if len(data) < ICMP_HEADER.size:
+                continue
+
+            icmp_type, _, _, identifier, sequence = ICMP_HEADER.unpack_from(data)
+            if icmp_type == (ICMP_ECHO_REPLY if family == socket.AF_INET else ICMPV6_ECHO_REPLY):
+                # datagram sockets rewrite the identifier and only deliver our own replies
+                if not self.raw[family] or identifier == self.identifier:
+                    self._resolve(family, sequence, addr[0], received, True)
+                continue
+
+            if not self.raw[family]:
+                continue
+            errors = (
+                (ICMP_TIME_EXCEEDED, ICMP_DEST_UNREACH)
+                if family == socket.AF_INET
+                else (ICMPV6_TIME_EXCEEDED, ICMPV6_DEST_UNREACH)
+            )
+            if icmp_type not in errors:
+                continue
+            # the error quotes our request: its IP header, then at least the 8 bytes of the ICMP header
+            quoted = data[ICMP_HEADER.size :]
+            if family == socket.AF_INET:
+                if not quoted:
+                    continue
+                quoted = quoted[(quoted[0] & 0x0F) * 4 :]
+            else:
+                quoted = quoted[40:]
+            if len(quoted) < ICMP_HEADER.size:
+                continue
+            _, _, _, identifier, sequence = ICMP_HEADER.unpack_from(quoted)
+            if identifier == self.identifier:
+                self._resolve(family, sequence, addr[0], received, icmp_type == errors[1])
+
+    def _read_errors(self, family: int, sock: socket.socket) -> None:
+        unreachable = ICMP_DEST_UNREACH if family == socket.AF_INET else ICMPV6_DEST_UNREACH
+        while True:
+            try:
+                data, ancdata, _, _ = sock.recvmsg(2048, 512, socket.MSG_ERRQUEUE)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            received = time.perf_counter()
+            if len(data) < ICMP_HEADER.size:
+                continue
+            # the queued request, as it was sent
+            _, _, _, _, sequence = ICMP_HEADER.unpack_from(data)
+            for level, kind, cmsg in ancdata:
+                if (level, kind) not in ((socket.SOL_IP, IP_RECVERR), (socket.IPPROTO_IPV6, IPV6_RECVERR)):
+                    continue
+                if len(cmsg) < SOCK_EXTENDED_ERR.size + 8:
+                    continue
+                _, origin, icmp_type, _, _, _, _ = SOCK_EXTENDED_ERR.unpack_from(cmsg)
+                if origin not in (SO_EE_ORIGIN_ICMP, SO_EE_ORIGIN_ICMP6):
+                    continue
+                offender = cmsg[SOCK_EXTENDED_ERR.size :]
+                if family == socket.AF_INET:
+                    responder = socket.inet_ntop(socket.AF_INET, offender[4:8])
+                else:
+                    responder = socket.inet_ntop(socket.AF_INET6, offender[8:24])
+                self._resolve(family, sequence, responder, received, icmp_type == unreachable)
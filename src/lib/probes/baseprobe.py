@@ -1,12 +1,12 @@
-import signal
-import time
 import traceback
+import typing
 
 from config import ApplicationConfiguration
 from lib.collectors.basecollector import BaseCollector
 from lib.datastores.factory import DatastoreFactory
 from lib.logging import setup_logging
 from lib.probes.BaseProbeConfiguration import BaseProbeConfiguration
+from lib.schedulers.scheduler import ProbeScheduler
 
 
 class BaseProbe:
@@ -18,9 +18,6 @@ class BaseProbe:
         self.interval = self.config.interval
         self.collector = collector
 
-        signal.signal(signal.SIGTERM, self.sighandler)
-        self._exit_loop = False
-
         if self.collector is None:
             self.logger.error('No collector specified')
             raise ValueError('No collector specified')
@@ -31,38 +28,43 @@ class BaseProbe:
         self.logger.info(f"PROBE ENABLED: {self.config.enabled}")
         self.logger.info(f"PROBE INTERVAL: {self.config.interval}s")
 
-    def sighandler(self, signum, frame):
-        self.logger.warning('<SIGTERM received>')
-        self._exit_loop = True
-
-    def run(self):
+    def schedule(self, scheduler: ProbeScheduler) -> None:
         if not self.enabled:
             self.logger.debug("Probe is disabled")
             return
+        self.collector.start()
+        scheduler.add(self.__class__.__name__, self.interval, self.tick, on_stop=self.collector.close)
+
+    def run(self):
+        # runs this probe on its own, probes that share a process should share one scheduler instead
+        scheduler = ProbeScheduler()
+        self.schedule(scheduler)
+        scheduler.run()
+
+    def tick(self):
+        stats = None
+        try:
+            self.logger.debug("Running probe")
+            stats = self.collector.collect()
+        except Exception as e:
+            self.logger.error("Error executing probe")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+        self.write(stats)
 
-        while not self._exit_loop:
-            stats = None
-            try:
-                self.logger.debug("Running probe")
-                stats = self.collector.collect()
-            except Exception as e:
-                self.logger.error("Error executing probe")
-                self.logger.error(e)
-                self.logger.error(traceback.format_exc())
-            # Connect to Datastore
-            try:
-                if stats is not None:
-                    data_store = DatastoreFactory().create(self.config.datastore)
-                    cache_interval = self.interval + 15  # Set the cache TTL slightly longer than the probe interval
-                    topic = self.config.topic
-                    data_store.write(topic, stats, cache_interval)
-                    self.logger.debug("Stats successfully written to data store")
-                else:
-                    self.logger.debug("No stats to write to data store")
-            except Exception as e:
-                self.logger.error("Could not connect to data store")
-                self.logger.error(e)
-                self.logger.error(traceback.format_exc())
-            self.logger.debug(f'Probe sleeping for {self.interval} seconds')
-            time.sleep(self.interval)
-        self.logger.debug("Exiting probe")
+    def write(self, stats: typing.Optional[dict], interval: typing.Optional[float] = None):
+        # Connect to Datastore
+        try:
+            if stats is not None:
+                data_store = DatastoreFactory().create(self.config.datastore)
+                # Set the cache TTL slightly longer than the probe interval
+                cache_interval = (interval or self.interval) + 15
+                topic = self.config.topic
+                data_store.write(topic, stats, cache_interval)
+                self.logger.debug("Stats successfully written to data store")
+            else:
+                self.logger.debug("No stats to write to data store")
+        except Exception as e:
+            self.logger.error("Could not connect to data store")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
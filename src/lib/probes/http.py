@@ -0,0 +1,26 @@
+from config import ApplicationConfiguration
+from lib.collectors.httpcollector import HttpCollector
+from lib.enums.ConfigurationDefaults import ConfigurationDefaults
+from lib.probes.baseprobe import BaseProbe, BaseProbeConfiguration
+
+
+class HttpProbe(BaseProbe):
+    def __init__(self):
+        self.app_config = ApplicationConfiguration
+        http = self.app_config.http_probe
+        probe_config = BaseProbeConfiguration(
+            http.enabled,
+            http.interval,
+            self.app_config.datastore.http_probe.get('topic', ConfigurationDefaults.DATASTORE_HTTP_PROBE_TOPIC),
+            self.app_config.datastore.http_probe.get('type', ConfigurationDefaults.DATASTORE_HTTP_PROBE_TYPE),
+        )
+        super().__init__(
+            probe_config,
+            HttpCollector(http.urls, http.count, http.timeout, http.keepalive, http.verify_ssl, http.concurrency),
+        )
+
+        self.logger.info(f"HTTP URLS: {http.urls}")
+        self.logger.info(f"HTTP COUNT: {http.count}")
+        self.logger.info(f"HTTP TIMEOUT: {http.timeout}s")
+        self.logger.info(f"HTTP KEEPALIVE: {http.keepalive}")
+        self.logger.info(f"HTTP CONCURRENCY: {http.concurrency}")
@@ -1,36 +1,122 @@
+import copy
+import functools
+import threading
+import time
+import traceback
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
 from config import ApplicationConfiguration
+from config.ProbeGroupConfiguration import ProbeGroupConfiguration
+from config.ProbeSourceConfiguration import ProbeSourceConfiguration
+from lib.collectors.basecollector import BaseCollector
+from lib.collectors.multisourcecollector import MultiSourceCollector
 from lib.collectors.networkcollector import NetworkCollector
 from lib.enums.ConfigurationDefaults import ConfigurationDefaults
+from lib.enums.LoadPolicies import LoadPolicies
+from lib.enums.ProbeModes import ProbeModes
 from lib.probes.baseprobe import BaseProbe, BaseProbeConfiguration
+from lib.schedulers import sharding
+from lib.schedulers.cadence import AdaptiveCadence
+from lib.schedulers.loadlock import SharedLoadLock
+from lib.schedulers.ratelimiter import SharedRateLimiter
+from lib.schedulers.scheduler import ProbeScheduler
 
 
 class NetworkProbe(BaseProbe):
-    def __init__(self):
+    DEFAULT_GROUP = "default"
+
+    def __init__(self, shard: int = 0):
         self.app_config = ApplicationConfiguration
-        probe_count = self.app_config.probe.count
-        sites = self.app_config.probe.sites
-        dns_test_site = self.app_config.probe.dns_test_site
-        nameservers = self.app_config.probe.nameservers
+        probe = self.app_config.probe
+        probe_count = probe.count
+        backend = probe.backend
+        concurrency = probe.concurrency
+        sites = probe.sites
+        dns_test_sites = probe.dns_test_sites
+        nameservers = probe.nameservers
         self.device_id = self.app_config.probe.device_id
+        topic = self.app_config.datastore.netprobe.get('topic', ConfigurationDefaults.DATASTORE_PROBE_TOPIC)
+
+        # with sharding, this worker only probes the sites and nameservers it owns and writes them to its own topic
+        self.worker = probe.shard_id(shard)
+        if probe.shards:
+            sites = sharding.shard(sites, probe.shards, self.worker)
+            nameservers = sharding.shard(nameservers, probe.shards, self.worker, key=lambda nameserver: nameserver[1])
+            topic = sharding.shard_topic(topic, self.worker)
+
+        # the top level sites are the default group, which also runs the DNS tests
+        default_group = ProbeGroupConfiguration(self.DEFAULT_GROUP, sites, probe.interval, probe_count, probe.timeout)
+        self.groups: typing.Dict[str, ProbeGroupConfiguration] = {self.DEFAULT_GROUP: default_group}
+        for group in probe.groups:
+            if group.name in self.groups:
+                raise ValueError(f"Duplicate probe group '{group.name}'")
+            group_sites = sharding.shard(group.sites, probe.shards, self.worker)
+            if group_sites:
+                self.groups[group.name] = copy.copy(group)
+                self.groups[group.name].sites = group_sites
+
+        # every group is scheduled on its own, they are merged into one result when any of them completes
+        self.collectors: typing.Dict[str, BaseCollector] = {}
+        self.intervals: typing.Dict[str, float] = {}
+        for name, group in self.groups.items():
+            default = name == self.DEFAULT_GROUP
+            self.collectors[name], self.intervals[name] = self.create_collector(
+                group, dns_test_sites if default else [], nameservers if default else []
+            )
+        self.group_stats: typing.Dict[str, dict] = {}
+        self.lock = threading.Lock()
 
         super().__init__(
             BaseProbeConfiguration(
                 enabled=self.app_config.probe.enabled,
-                interval=self.app_config.probe.interval,
-                topic=self.app_config.datastore.netprobe.get('topic', ConfigurationDefaults.DATASTORE_PROBE_TOPIC),
+                interval=self.intervals[self.DEFAULT_GROUP],
+                topic=topic,
                 datastore=self.app_config.datastore.netprobe.get('type', ConfigurationDefaults.DATASTORE_PROBE_TYPE),
             ),
-            NetworkCollector(sites, probe_count, dns_test_site, nameservers),
+            self.collectors[self.DEFAULT_GROUP],
         )
 
         self.logger.info(f"PROBE COUNT: {probe_count}")
+        self.logger.info(f"PROBE TIMEOUT: {probe.timeout}s")
+        self.logger.info(f"PROBE DEADLINE: {probe.deadline * 100}% of the interval")
+        self.logger.info(f"PROBE BACKEND: {backend.name}")
+        self.logger.info(f"PROBE MODE: {probe.mode.name}")
+        self.logger.info(f"PROBE UNDER LOAD: {self.app_config.scheduler.load_policy.name}")
+        for source in probe.sources:
+            self.logger.info(f"PROBE SOURCE: {source.name} ({source.interface or source.address})")
+        if SharedRateLimiter.enabled:
+            self.logger.info(f"RATE LIMIT: {SharedRateLimiter.rate} packets/s, bursts of {SharedRateLimiter.burst}")
+        if probe.adaptive and probe.mode == ProbeModes.BURST:
+            self.logger.info(
+                f"PROBE ADAPTIVE: every {probe.adaptive_min_interval}-{probe.adaptive_max_interval}s "
+                f"with {probe.adaptive_min_count}-{probe.adaptive_max_count} packets"
+            )
+        if probe.mode == ProbeModes.STREAM:
+            self.logger.info(f"PROBE STREAM RATE: {probe.stream_rate}/s")
+            self.logger.info(f"PROBE STREAM WINDOW: {probe.stream_window}s")
+        for group in list(self.groups.values())[1:]:
+            self.logger.info(
+                f"PROBE GROUP: {group.name} SITES: {group.sites} INTERVAL: {group.interval}s COUNT: {group.count} "
+                f"TIMEOUT: {group.timeout}s"
+            )
+        if probe.shards:
+            if self.worker not in probe.shards:
+                self.logger.warning(f"SHARD WORKER {self.worker} is not one of {probe.shards}, it owns no sites")
+            self.logger.info(f"SHARD WORKER: {self.worker} OF {len(probe.shards)}")
+        self.logger.info(f"PROBE CONCURRENCY: {concurrency}")
         self.logger.info(f"SITES: {sites}")
-        self.logger.info(f"DNS TEST SITE: {dns_test_site}")
+        self.logger.info(f"DNS TEST SITES: {dns_test_sites}")
+        self.logger.info(f"DNS RECORD TYPES: {probe.dns_record_types}")
+        self.logger.info(f"DNS SAMPLES: {probe.dns_samples}")
+        self.logger.info(f"DNS CACHE MISS: {probe.dns_cache_miss}")
+        self.logger.info(f"DNS TIMEOUT: {probe.dns_timeout}s")
+        self.logger.info(f"DNS CONCURRENCY: {probe.dns_concurrency if probe.dns_concurrency > 0 else 'unlimited'}")
         self.logger.info(f"DEVICE ID: {self.device_id}")
 
         # Logging each nameserver
         self.logger.info("NAMESERVERS:")
-        for nameserver, ip, type in self.app_config.probe.nameservers:
+        for nameserver, ip, type in nameservers:
             self.logger.info(f"NAMESERVER: {nameserver} IP: {ip} TYPE: {type}")
 
         # log weight information
@@ -76,6 +162,145 @@ class NetworkProbe(BaseProbe):
         )
         self.logger.info(f"SPEEDTEST UPLOAD THRESHOLD: {self.app_config.presentation.threshold_speedtest_upload}Mbp/s")
 
+    def thresholds(self, group: ProbeGroupConfiguration) -> typing.Tuple[float, float]:
+        presentation = self.app_config.presentation
+        loss = group.threshold_loss if group.threshold_loss is not None else presentation.threshold_loss
+        latency = group.threshold_latency if group.threshold_latency is not None else presentation.threshold_latency
+        return loss, latency
+
+    def create_collector(
+        self,
+        group: ProbeGroupConfiguration,
+        dns_test_sites: typing.List[str],
+        nameservers: typing.List[typing.Tuple[str, str, str]],
+    ) -> typing.Tuple[BaseCollector, float]:
+        probe = self.app_config.probe
+        adaptive = probe.adaptive and probe.mode == ProbeModes.BURST
+        # the group ticks at the fastest cadence and only pings the sites that are due
+        interval = probe.adaptive_min_interval if adaptive else group.interval
+        if not probe.sources:
+            return self.create_source_collector(group, dns_test_sites, nameservers, interval, adaptive), interval
+
+        # every uplink probes the whole group in the same cycle, sharing one worker pool
+        executor = ThreadPoolExecutor(
+            max_workers=probe.concurrency + len(probe.sources), thread_name_prefix=MultiSourceCollector.__name__
+        )
+        collectors = [
+            self.create_source_collector(group, dns_test_sites, nameservers, interval, adaptive, source, executor)
+            for source in probe.sources
+        ]
+        return MultiSourceCollector(collectors, executor), interval
+
+    def create_source_collector(
+        self,
+        group: ProbeGroupConfiguration,
+        dns_test_sites: typing.List[str],
+        nameservers: typing.List[typing.Tuple[str, str, str]],
+        interval: float,
+        adaptive: bool,
+        source: typing.Optional[ProbeSourceConfiguration] = None,
+        executor: typing.Optional[ThreadPoolExecutor] = None,
+    ) -> NetworkCollector:
+        probe = self.app_config.probe
+        cadence = None
+        if adaptive:
+            cadence = AdaptiveCadence(
+                group.interval,
+                group.count,
+                probe.adaptive_min_interval,
+                probe.adaptive_max_interval,
+                probe.adaptive_min_count,
+                probe.adaptive_max_count,
+                *self.thresholds(group),
+                deadline=probe.deadline,
+                timeout=group.timeout,
+            )
+
+        return NetworkCollector(
+            group.sites,
+            group.count,
+            dns_test_sites,
+            nameservers,
+            backend=probe.backend,
+            concurrency=probe.concurrency,
+            dns_concurrency=probe.dns_concurrency,
+            dns_timeout=probe.dns_timeout,
+            dns_record_types=probe.dns_record_types,
+            dns_samples=probe.dns_samples,
+            dns_cache_miss=probe.dns_cache_miss,
+            mode=probe.mode,
+            stream_rate=probe.stream_rate,
+            stream_window=probe.stream_window,
+            cadence=cadence,
+            dns_interval=group.interval if cadence is not None else 0,
+            timeout=group.timeout,
+            deadline=interval * probe.deadline,
+            source=source,
+            executor=executor,
+        )
+
+    def schedule(self, scheduler: ProbeScheduler) -> None:
+        if not self.enabled:
+            self.logger.debug("Probe is disabled")
+            return
+        for name, collector in self.collectors.items():
+            collector.start()
+            job = self.__class__.__name__ if name == self.DEFAULT_GROUP else f"{self.__class__.__name__}[{name}]"
+            scheduler.add(job, self.intervals[name], functools.partial(self.tick_group, name), on_stop=collector.close)
+
+    def tick(self):
+        for name in self.collectors:
+            self.tick_group(name)
+
+    def tick_group(self, name: str):
+        stats = None
+        policy = self.app_config.scheduler.load_policy
+        started = time.time()
+        if policy == LoadPolicies.PAUSE and SharedLoadLock.overlaps(started):
+            self.logger.info(f"Speed test running, skipping probe group {name}")
+            return
+        try:
+            self.logger.debug(f"Running probe group {name}")
+            stats = self.collectors[name].collect()
+        except Exception as e:
+            self.logger.error(f"Error executing probe group {name}")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+        if stats is None:
+            return
+
+        if policy != LoadPolicies.IGNORE:
+            # a stream's results hold the samples of the whole window, not only of this cycle
+            probe = self.app_config.probe
+            since = started - probe.stream_window if probe.mode == ProbeModes.STREAM else started
+            if SharedLoadLock.overlaps(since):
+                if policy == LoadPolicies.PAUSE:
+                    self.logger.info(f"Speed test ran during probe group {name}, discarding its results")
+                    return
+                for netdata in stats.get("stats", []) + stats.get("dns_stats", []):
+                    netdata["under_load"] = 1
+
+        loss_threshold, latency_threshold = self.thresholds(self.groups[name])
+        for netdata in stats.get("stats", []):
+            netdata["group"] = name
+            latency = float(netdata.get("latency", -1))
+            netdata["healthy"] = int(0 <= latency < latency_threshold and netdata.get("loss", 100) < loss_threshold)
+
+        with self.lock:
+            # publish every group's latest results, the groups do not complete at the same time
+            self.group_stats[name] = stats
+            merged = {
+                "stats": [netdata for group in self.group_stats.values() for netdata in group.get("stats", [])],
+                "dns_stats": self.group_stats.get(self.DEFAULT_GROUP, {}).get("dns_stats", []),
+                # how long the probes of this process waited for the packet budget
+                "limiter_stats": (
+                    [{**limiter, "worker": self.worker} for limiter in SharedRateLimiter.summary()]
+                    if SharedRateLimiter.enabled
+                    else []
+                ),
+            }
+            self.write(merged, max(self.intervals.values()))
+
     # def run(self):
     #     while True:
     #         try:
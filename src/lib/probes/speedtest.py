@@ -1,7 +1,14 @@
+import typing
+
 from config import ApplicationConfiguration
+from lib.collectors.basecollector import BaseCollector
+from lib.collectors.isolatedcollector import IsolatedCollector
 from lib.collectors.speedtestcollector import SpeedTestCollector
+from lib.collectors.throughputcollector import ThroughputCollector
 from lib.enums.ConfigurationDefaults import ConfigurationDefaults
+from lib.enums.SpeedTestBackends import SpeedTestBackends
 from lib.probes.baseprobe import BaseProbe, BaseProbeConfiguration
+from lib.schedulers.loadlock import SharedLoadLock
 
 
 class SpeedTestProbe(BaseProbe):
@@ -13,7 +20,64 @@ class SpeedTestProbe(BaseProbe):
             self.app_config.datastore.speedtest.get('topic', ConfigurationDefaults.DATASTORE_SPEEDTEST_TOPIC),
             self.app_config.datastore.speedtest.get('type', ConfigurationDefaults.DATASTORE_SPEEDTEST_TYPE),
         )
-        super().__init__(probe_config, SpeedTestCollector())
+        speedtest = self.app_config.speedtest
+        super().__init__(probe_config, self.create_collector())
+
+        self.logger.info(f"SPEEDTEST BACKEND: {speedtest.backend.name}")
+        self.logger.info(f"SPEEDTEST TIMEOUT: {speedtest.timeout}s")
+        self.logger.info(f"SPEEDTEST MEMORY LIMIT: {speedtest.memory_limit}MB")
+        if speedtest.backend == SpeedTestBackends.HTTP:
+            self.logger.info(f"SPEEDTEST DOWNLOAD URL: {speedtest.http.download_url}")
+            self.logger.info(f"SPEEDTEST UPLOAD URL: {speedtest.http.upload_url}")
+            self.logger.info(f"SPEEDTEST STREAMS: {speedtest.http.streams}")
+            self.logger.info(f"SPEEDTEST BUDGET: {speedtest.http.bytes} bytes / {speedtest.http.duration}s")
+        else:
+            self.logger.info(f"SPEEDTEST SERVER TTL: {speedtest.server_ttl}s")
+        if speedtest.bufferbloat:
+            self.logger.info(f"SPEEDTEST BUFFERBLOAT TARGET: {speedtest.bufferbloat_target}")
+            self.logger.info(f"SPEEDTEST BUFFERBLOAT RATE: {speedtest.bufferbloat_rate}/s")
+
+    def create_collector(self) -> BaseCollector:
+        # the collector is created in the child process the test runs in
+        speedtest = self.app_config.speedtest
+        factory, args = self.collector_factory()
+        return IsolatedCollector(speedtest.timeout, speedtest.memory_limit * 1024 * 1024, factory, *args)
+
+    def collector_factory(self) -> typing.Tuple[typing.Callable[..., BaseCollector], tuple]:
+        speedtest = self.app_config.speedtest
+        bufferbloat_target = speedtest.bufferbloat_target if speedtest.bufferbloat else None
+        if speedtest.backend == SpeedTestBackends.HTTP:
+            http = speedtest.http
+            return ThroughputCollector, (
+                http.download_url,
+                http.upload_url,
+                http.latency_url,
+                http.streams,
+                http.bytes,
+                http.duration,
+                http.stability,
+                http.timeout,
+                http.verify_ssl,
+                bufferbloat_target,
+                speedtest.bufferbloat_rate,
+                speedtest.bufferbloat_idle,
+            )
+
+        return SpeedTestCollector, (
+            bufferbloat_target,
+            speedtest.bufferbloat_rate,
+            speedtest.bufferbloat_idle,
+            speedtest.server_ttl,
+            self.app_config.datastore.speedtest.get('type', ConfigurationDefaults.DATASTORE_SPEEDTEST_TYPE),
+            self.app_config.datastore.speedtest.get(
+                'server_topic', ConfigurationDefaults.DATASTORE_SPEEDTEST_SERVER_TOPIC
+            ),
+        )
+
+    def tick(self):
+        # the network probes skip or tag the cycles the test overlaps, the child is stopped well within this
+        with SharedLoadLock.hold(self.app_config.speedtest.timeout + 2 * IsolatedCollector.GRACE):
+            super().tick()
 
     def run(self) -> None:
         return super().run()
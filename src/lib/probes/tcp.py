@@ -0,0 +1,22 @@
+from config import ApplicationConfiguration
+from lib.collectors.tcpcollector import TcpCollector
+from lib.enums.ConfigurationDefaults import ConfigurationDefaults
+from lib.probes.baseprobe import BaseProbe, BaseProbeConfiguration
+
+
+class TcpProbe(BaseProbe):
+    def __init__(self):
+        self.app_config = ApplicationConfiguration
+        tcp = self.app_config.tcp
+        probe_config = BaseProbeConfiguration(
+            tcp.enabled,
+            tcp.interval,
+            self.app_config.datastore.tcp.get('topic', ConfigurationDefaults.DATASTORE_TCP_TOPIC),
+            self.app_config.datastore.tcp.get('type', ConfigurationDefaults.DATASTORE_TCP_TYPE),
+        )
+        super().__init__(probe_config, TcpCollector(tcp.targets, tcp.count, tcp.timeout, tcp.concurrency))
+
+        self.logger.info(f"TCP TARGETS: {tcp.targets}")
+        self.logger.info(f"TCP COUNT: {tcp.count}")
+        self.logger.info(f"TCP TIMEOUT: {tcp.timeout}s")
+        self.logger.info(f"TCP CONCURRENCY: {tcp.concurrency}")
@@ -0,0 +1,25 @@
+from config import ApplicationConfiguration
+from lib.collectors.tracecollector import TraceCollector
+from lib.enums.ConfigurationDefaults import ConfigurationDefaults
+from lib.probes.baseprobe import BaseProbe, BaseProbeConfiguration
+
+
+class TraceProbe(BaseProbe):
+    def __init__(self):
+        self.app_config = ApplicationConfiguration
+        trace = self.app_config.trace
+        probe_config = BaseProbeConfiguration(
+            trace.enabled,
+            trace.interval,
+            self.app_config.datastore.trace.get('topic', ConfigurationDefaults.DATASTORE_TRACE_TOPIC),
+            self.app_config.datastore.trace.get('type', ConfigurationDefaults.DATASTORE_TRACE_TYPE),
+        )
+        super().__init__(
+            probe_config, TraceCollector(trace.targets, trace.count, trace.max_hops, trace.timeout, trace.window)
+        )
+
+        self.logger.info(f"TRACE TARGETS: {trace.targets}")
+        self.logger.info(f"TRACE COUNT: {trace.count}")
+        self.logger.info(f"TRACE MAX HOPS: {trace.max_hops}")
+        self.logger.info(f"TRACE TIMEOUT: {trace.timeout}s")
+        self.logger.info(f"TRACE WINDOW: {trace.window}")
@@ -0,0 +1,178 @@
+import asyncio
+import ipaddress
+import math
+import secrets
+import socket
+import traceback
+import typing
+
+import dns.asyncresolver
+import dns.resolver
+from config import ApplicationConfiguration
+from config.ProbeSourceConfiguration import ProbeSourceConfiguration
+from lib.clients.sourcebinding import source_address
+from lib.logging import setup_logging
+from lib.schedulers.ratelimiter import SharedRateLimiter
+from lib.stats.rttsamples import RttSamples
+
+
+class DnsProber:
+    """Times DNS queries against every nameserver concurrently from a single asyncio loop.
+
+    One resolver is created per nameserver the first time it is queried and reused on every cycle after that.
+    Each nameserver is asked for every test site and record type `samples` times. With `cache_miss` enabled it is
+    also asked for a random label under each test site, which it cannot have cached, to time a full recursive lookup.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10,
+        concurrency: int = 0,
+        record_types: typing.Optional[typing.List[str]] = None,
+        samples: int = 1,
+        cache_miss: bool = False,
+        source: typing.Optional[ProbeSourceConfiguration] = None,
+    ):
+        config = ApplicationConfiguration
+        self.logger = setup_logging(self.__class__.__name__, config.logging)
+        self.timeout = timeout
+        self.concurrency = concurrency  # Max queries in flight, 0 for no limit
+        self.record_types = record_types or ['A']
+        self.samples = max(samples, 1)
+        self.cache_miss = cache_miss
+        self.resolvers: typing.Dict[str, dns.asyncresolver.Resolver] = {}
+        self.source = source  # uplink the queries are sent from, None for the default route
+        self.source_addresses: typing.Dict[str, typing.Optional[str]] = {}
+
+    def resolver(self, ip: str) -> dns.asyncresolver.Resolver:
+        resolver = self.resolvers.get(ip)
+        if resolver is None:
+            resolver = dns.asyncresolver.Resolver(configure=False)
+            resolver.nameservers = [ip]
+            resolver.timeout = self.timeout
+            resolver.lifetime = self.timeout
+            self.resolvers[ip] = resolver
+            family = socket.AF_INET6 if ipaddress.ip_address(ip).version == 6 else socket.AF_INET
+            self.source_addresses[ip] = source_address(self.source, family)
+        return resolver
+
+    def probe(
+        self,
+        sites: typing.List[str],
+        nameservers: typing.List[typing.Tuple[str, str, str]],
+        deadline: typing.Optional[float] = None,
+    ) -> typing.List[dict]:
+        """Queries every nameserver. Queries still unanswered `deadline` seconds from now count as failures."""
+        try:
+            return asyncio.run(self._probe_all(sites, nameservers, deadline))
+        except Exception as e:
+            self.logger.error("Error running DNS probes")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return []
+
+    async def _probe_all(
+        self,
+        sites: typing.List[str],
+        nameservers: typing.List[typing.Tuple[str, str, str]],
+        deadline: typing.Optional[float],
+    ) -> typing.List[dict]:
+        limit = asyncio.Semaphore(self.concurrency) if self.concurrency > 0 else None
+        # absolute loop time every query has to be answered by
+        until = asyncio.get_running_loop().time() + deadline if deadline is not None else math.inf
+        results = await asyncio.gather(*[self._probe(limit, sites, nameserver, until) for nameserver in nameservers])
+        return list(results)
+
+    async def _probe(
+        self,
+        limit: typing.Optional[asyncio.Semaphore],
+        sites: typing.List[str],
+        nameserver: typing.Tuple[str, str, str],
+        until: float,
+    ) -> dict:
+        resolver = self.resolver(nameserver[1])
+        queries = [(site, record_type) for site in sites for record_type in self.record_types] * self.samples
+        misses = [(f"{secrets.token_hex(8)}.{site}", 'A') for site in sites for _ in range(self.samples)]
+        if not self.cache_miss:
+            misses = []
+
+        results = await asyncio.gather(
+            *[self._query(limit, resolver, nameserver, until, *query) for query in queries + misses]
+        )
+        latencies, miss_latencies = results[: len(queries)], results[len(queries) :]
+
+        samples = RttSamples(latencies)
+        summary = samples.summary(nameserver[1])
+        dnsdata = {
+            "nameserver": nameserver[0],
+            "nameserver_ip": nameserver[1],
+            "type": nameserver[2] if len(nameserver) == 3 else "external",
+            "latency": summary["latency"],
+            "loss": summary["loss"],
+            "queries": samples.sent,
+            "failures": samples.sent - samples.received,
+        }
+        if samples.received == 0:
+            # reported as lost, with a latency of -1 like a site that did not answer
+            self.logger.error(f"Error performing DNS resolution on {nameserver}: no queries were answered")
+            return dnsdata
+
+        for stat in ['min', 'p50', 'p90', 'p99', 'max']:
+            dnsdata[stat] = summary[stat]
+
+        if misses:
+            miss_summary = RttSamples(miss_latencies).summary(nameserver[1])
+            dnsdata["cache_miss_latency"] = miss_summary["latency"]
+            dnsdata["cache_miss_max"] = miss_summary.get("max", -1)
+
+        return dnsdata
+
+    async def _query(
+        self,
+        limit: typing.Optional[asyncio.Semaphore],
+        resolver: dns.asyncresolver.Resolver,
+        nameserver: typing.Tuple[str, str, str],
+        until: float,
+        site: str,
+        record_type: str,
+    ) -> typing.Optional[float]:
+        if limit is None:
+            return await self._timed_query(resolver, nameserver, until, site, record_type)
+        async with limit:
+            return await self._timed_query(resolver, nameserver, until, site, record_type)
+
+    async def _timed_query(
+        self,
+        resolver: dns.asyncresolver.Resolver,
+        nameserver: typing.Tuple[str, str, str],
+        until: float,
+        site: str,
+        record_type: str,
+    ) -> typing.Optional[float]:
+        # latency in ms as measured by dnspython, None if the nameserver did not answer
+        if not await SharedRateLimiter.wait("dns", until=until):
+            return None
+        remaining = until - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            # the cycle deadline passed while the query waited for its turn
+            return None
+        try:
+            answers = await resolver.resolve(
+                site,
+                record_type,
+                raise_on_no_answer=False,
+                lifetime=min(self.timeout, remaining),
+                source=self.source_addresses.get(nameserver[1]),
+            )
+            return round(answers.response.time * 1000, 2)
+        except dns.resolver.NXDOMAIN as e:
+            # a negative answer is still an answer, and it is what the cache-miss queries expect
+            responses = list(e.responses().values())
+            if responses:
+                return round(responses[0].time * 1000, 2)
+            return None
+        except Exception as e:
+            self.logger.error(f"Error performing DNS resolution of {site} {record_type} on {nameserver}")
+            self.logger.error(e)
+            self.logger.debug(traceback.format_exc())
+            return None
@@ -0,0 +1,178 @@
+import asyncio
+import ipaddress
+import os
+import socket
+import threading
+import time
+import typing
+from concurrent.futures import Future
+
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+from config import ApplicationConfiguration
+from lib.logging import setup_logging
+
+
+class Resolution:
+    def __init__(
+        self,
+        host: str,
+        address: typing.Optional[str],
+        family: int,
+        resolve_time: float,
+        expires: float,
+        error: typing.Optional[str] = None,
+        cached: bool = False,
+    ):
+        self.host = host
+        self.address = address  # None when the host could not be resolved
+        self.family = family
+        self.resolve_time = resolve_time  # ms the lookup took, 0 when the entry came from the cache
+        self.expires = expires  # monotonic time the entry has to be resolved again
+        self.error = error
+        self.cached = cached
+
+    def hit(self) -> "Resolution":
+        # the entry as a cache hit, which took no lookup
+        return Resolution(self.host, self.address, self.family, 0.0, self.expires, self.error, True)
+
+    def fields(self) -> dict:
+        # the resolution fields added to a probe record
+        fields: typing.Dict[str, typing.Any] = {"address": self.address, "resolve_time": round(self.resolve_time, 3)}
+        if self.cached:
+            fields["resolve_cached"] = 1
+        if self.error:
+            fields["resolve_error"] = self.error
+        return fields
+
+
+class ResolveCache:
+    """Resolves probe targets once and keeps the address for the TTL of the DNS answer.
+
+    Hosts are looked up with the system's nameservers (A, then AAAA). Names the nameservers do not know, such as
+    entries in /etc/hosts, fall back to getaddrinfo and are kept for FALLBACK_TTL seconds. Failures are kept for
+    NEGATIVE_TTL seconds so a broken name is not looked up on every cycle. The cache is shared by every collector in
+    the process. `submit()` resolves on a background loop, so a slow lookup can outlive the cycle that started it
+    without being started again by the next ones.
+    """
+
+    MIN_TTL = 1
+    MAX_TTL = 3600
+    FALLBACK_TTL = 300
+    NEGATIVE_TTL = 30
+
+    def __init__(self, timeout: float = 5):
+        config = ApplicationConfiguration
+        self.logger = setup_logging(self.__class__.__name__, config.logging)
+        self.timeout = timeout
+        self.entries: typing.Dict[str, Resolution] = {}
+        self.lock = threading.Lock()
+        self._resolver: typing.Optional[dns.asyncresolver.Resolver] = None
+        # lookups in flight on the background loop, by host
+        self.pending: typing.Dict[str, Future] = {}
+        self._loop: typing.Optional[asyncio.AbstractEventLoop] = None
+        self._loop_pid = 0
+
+    @property
+    def resolver(self) -> dns.asyncresolver.Resolver:
+        if self._resolver is None:
+            self._resolver = dns.asyncresolver.Resolver()
+            self._resolver.lifetime = self.timeout
+        return self._resolver
+
+    def cached(self, host: str) -> typing.Optional[Resolution]:
+        with self.lock:
+            entry = self.entries.get(host)
+        if entry is not None and entry.expires > time.monotonic():
+            return entry
+        return None
+
+    def fresh(self, resolution: Resolution) -> bool:
+        # True while the entry `resolution` came from, as a lookup or a cache hit, is still cached
+        entry = self.cached(resolution.host)
+        return entry is not None and entry.expires == resolution.expires
+
+    async def resolve(self, host: str) -> Resolution:
+        entry = self.cached(host)
+        if entry is not None:
+            return entry.hit()
+
+        try:
+            address = ipaddress.ip_address(host.strip("[]"))
+            family = socket.AF_INET6 if address.version == 6 else socket.AF_INET
+            entry = Resolution(host, str(address), family, 0.0, float("inf"))
+        except ValueError:
+            entry = await self._lookup(host)
+
+        with self.lock:
+            self.entries[host] = entry
+        return entry
+
+    async def resolve_all(self, hosts: typing.Iterable[str]) -> typing.Dict[str, Resolution]:
+        hosts = list(dict.fromkeys(hosts))
+        entries = await asyncio.gather(*[self.resolve(host) for host in hosts])
+        return dict(zip(hosts, entries))
+
+    def submit(self, host: str) -> Future:
+        """Resolves `host` on the background loop, sharing the lookup already in flight for it if there is one."""
+        entry = self.cached(host)
+        if entry is not None:
+            future: Future = Future()
+            future.set_result(entry.hit())
+            return future
+        with self.lock:
+            future = self.pending.get(host)  # type: ignore
+            if future is not None:
+                return future
+            future = asyncio.run_coroutine_threadsafe(self.resolve(host), self._background_loop())
+            self.pending[host] = future
+        # outside the lock, the callback runs right away if the lookup is already over
+        future.add_done_callback(lambda done: self._settle(host, done))
+        return future
+
+    def _settle(self, host: str, future: Future) -> None:
+        with self.lock:
+            if self.pending.get(host) is future:
+                del self.pending[host]
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        # called with the lock held. A forked process does not inherit the parent's loop thread, it starts its own
+        if self._loop is None or self._loop_pid != os.getpid():
+            self._loop = asyncio.new_event_loop()
+            self._loop_pid = os.getpid()
+            self.pending = {}
+            threading.Thread(target=self._loop.run_forever, name=f"{self.__class__.__name__}Loop", daemon=True).start()
+        return self._loop
+
+    async def _lookup(self, host: str) -> Resolution:
+        started = time.perf_counter()
+        error = None
+        for record_type, family in (("A", socket.AF_INET), ("AAAA", socket.AF_INET6)):
+            try:
+                answer = await self.resolver.resolve(host, record_type)
+                ttl = min(max(answer.rrset.ttl, self.MIN_TTL), self.MAX_TTL)  # type: ignore
+                resolve_time = (time.perf_counter() - started) * 1000
+                return Resolution(host, answer[0].to_text(), family, resolve_time, time.monotonic() + ttl)
+            except dns.resolver.NoAnswer:
+                continue
+            except dns.exception.DNSException as e:
+                error = e.__class__.__name__
+                break
+
+        # not in DNS, but it may still be known to the system (/etc/hosts, mDNS)
+        try:
+            loop = asyncio.get_running_loop()
+            addresses = await asyncio.wait_for(loop.getaddrinfo(host, None, type=socket.SOCK_RAW), self.timeout)
+            family, _, _, _, sockaddr = addresses[0]
+            resolve_time = (time.perf_counter() - started) * 1000
+            return Resolution(host, sockaddr[0], family, resolve_time, time.monotonic() + self.FALLBACK_TTL)
+        except (OSError, IndexError, asyncio.TimeoutError) as e:
+            error = error or e.__class__.__name__
+            self.logger.warning(f"Could not resolve {host}: {error}")
+
+        resolve_time = (time.perf_counter() - started) * 1000
+        return Resolution(host, None, socket.AF_UNSPEC, resolve_time, time.monotonic() + self.NEGATIVE_TTL, error)
+
+
+SharedResolveCache = ResolveCache()
@@ -0,0 +1,103 @@
+import math
+import typing
+
+from config import ApplicationConfiguration
+from lib.logging import setup_logging
+from lib.pingers.pinger import Pinger
+
+
+class SiteCadence:
+    def __init__(self, interval: float, count: int):
+        self.interval = interval
+        self.count = count
+        self.due = 0.0  # monotonic time the site should be probed next
+        self.stable = 0  # consecutive healthy results
+
+
+class AdaptiveCadence:
+    """Chooses how often, and with how many packets, each site is probed from its recent results.
+
+    A result that crosses the loss or latency threshold sends the site straight to the fastest cadence (the shortest
+    interval and the largest count). Every `STABLE_RESULTS` healthy results in a row back it off one step, doubling the
+    interval and halving the count, until the slowest cadence is reached. With a `deadline`, the largest count is
+    capped to what the fastest cadence has time to send and hear back from within it.
+    """
+
+    STABLE_RESULTS = 3
+
+    def __init__(
+        self,
+        interval: float,
+        count: int,
+        min_interval: float,
+        max_interval: float,
+        min_count: int,
+        max_count: int,
+        threshold_loss: float,
+        threshold_latency: float,
+        deadline: typing.Optional[float] = None,
+        timeout: float = 0,
+    ):
+        config = ApplicationConfiguration
+        self.logger = setup_logging(self.__class__.__name__, config.logging)
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.min_count = min_count
+        self.max_count = max(max_count, min_count)
+        if deadline is not None:
+            # requests are sent Pinger.INTERVAL apart and the last one needs its whole timeout. More than fits would
+            # be lost to the deadline every cycle and keep an unhealthy site from ever recovering
+            fits = max(1, math.floor(round((min_interval * deadline - timeout) / Pinger.INTERVAL, 6)) + 1)
+            if self.max_count > fits:
+                self.logger.warning(
+                    f"{self.max_count} packets do not fit in the {min_interval * deadline:g}s deadline of the fastest "
+                    f"cadence, probing unhealthy sites with {fits}"
+                )
+                self.max_count = fits
+                self.min_count = min(self.min_count, fits)
+        self.interval = min(max(interval, self.min_interval), self.max_interval)
+        self.count = min(max(count, self.min_count), self.max_count)
+        self.threshold_loss = threshold_loss
+        self.threshold_latency = threshold_latency
+        self.sites: typing.Dict[str, SiteCadence] = {}
+
+    def site(self, site: str) -> SiteCadence:
+        if site not in self.sites:
+            self.sites[site] = SiteCadence(self.interval, self.count)
+        return self.sites[site]
+
+    def due(self, sites: typing.List[str], now: float) -> typing.Dict[int, typing.List[str]]:
+        """Returns the sites due by `now`, grouped by the packet count to probe them with."""
+        # a site due before the next tick is probed now, rather than one whole tick late
+        horizon = now + self.min_interval / 2
+        groups: typing.Dict[int, typing.List[str]] = {}
+        for site in sites:
+            cadence = self.site(site)
+            if cadence.due <= horizon:
+                groups.setdefault(cadence.count, []).append(site)
+        return groups
+
+    def update(self, site: str, netdata: typing.Optional[dict], now: float) -> None:
+        cadence = self.site(site)
+        latency = float(netdata.get("latency", -1)) if netdata else -1
+        loss = float(netdata.get("loss", 100)) if netdata else 100
+        healthy = 0 <= latency < self.threshold_latency and loss < self.threshold_loss
+
+        previous = (cadence.interval, cadence.count)
+        if not healthy:
+            cadence.stable = 0
+            cadence.interval = self.min_interval
+            cadence.count = self.max_count
+        else:
+            cadence.stable += 1
+            if cadence.stable >= self.STABLE_RESULTS:
+                cadence.stable = 0
+                cadence.interval = min(cadence.interval * 2, self.max_interval)
+                cadence.count = max(cadence.count // 2, self.min_count)
+
+        if (cadence.interval, cadence.count) != previous:
+            self.logger.info(
+                f"{site} is {'healthy' if healthy else 'unhealthy'}, probing every {cadence.interval}s "
+                f"with {cadence.count} packets"
+            )
+        cadence.due = now + cadence.interval
@@ -0,0 +1,147 @@
+import contextlib
+import fcntl
+import json
+import os
+import time
+import traceback
+import typing
+
+from config import ApplicationConfiguration
+from lib.datastores.factory import DatastoreFactory
+from lib.enums.ConfigurationDefaults import ConfigurationDefaults
+from lib.enums.DataStoreTypes import DataStoreTypes
+from lib.logging import setup_logging
+
+
+class LoadLock:
+    """Tells the network probes when a speed test is saturating the link.
+
+    The speed test holds an exclusive flock on `path` while it runs and records in the file when it started and
+    finished, so every probe process on the host can tell whether a test is running or ran since a given time. The
+    kernel releases the lock when its holder dies, a test that crashed never counts as running. With a `datastore`,
+    the record is also written to `topic` for probes in other containers, where a test that never finished stops
+    counting once its `timeout` has passed.
+    """
+
+    RETENTION = 3600  # seconds the datastore keeps the last finished test
+    LOCK_RETRY = 1.0  # seconds to wait for readers holding a shared lock to let go of the file
+
+    def __init__(
+        self, path: str, datastore: typing.Optional[DataStoreTypes] = None, topic: typing.Optional[str] = None
+    ):
+        config = ApplicationConfiguration
+        self.logger = setup_logging(self.__class__.__name__, config.logging)
+        self.path = path
+        self.datastore = datastore
+        self.topic = topic
+
+    @contextlib.contextmanager
+    def hold(self, timeout: float) -> typing.Iterator[None]:
+        """Marks a speed test as running for the duration of the `with` block, or at most `timeout` seconds."""
+        started = time.time()
+        handle = None
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            handle = open(self.path, "a+")
+            self._lock(handle)
+            self._record(handle, {"started": started, "expires": started + timeout})
+        except OSError as e:
+            # another host's test holds the lock on a shared volume, or the path is not writable
+            self.logger.warning(f"Could not lock {self.path}: {e}")
+            if handle is not None:
+                handle.close()
+                handle = None
+        self._publish({"started": started, "expires": started + timeout}, int(timeout) + 1)
+        try:
+            yield
+        finally:
+            record = {"started": started, "finished": time.time()}
+            if handle is not None:
+                with contextlib.suppress(OSError):
+                    self._record(handle, record)
+                handle.close()  # releases the lock
+            self._publish(record, self.RETENTION)
+
+    def _lock(self, handle: typing.IO) -> None:
+        # probes checking for a running test hold a shared lock for the time of a read, wait them out
+        retry_until = time.monotonic() + self.LOCK_RETRY
+        while True:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                if time.monotonic() >= retry_until:
+                    raise
+                time.sleep(0.05)
+
+    def overlaps(self, since: float) -> bool:
+        """Returns True if a speed test is running or finished after `since` (a time.time())."""
+        running, record = self._read_local()
+        if running or self._finished_since(record, since):
+            return True
+        if self.datastore is None or not self.topic:
+            return False
+        record = self._read_shared()
+        if record and "finished" not in record and record.get("expires", 0) > time.time():
+            return True
+        return self._finished_since(record, since)
+
+    def _finished_since(self, record: typing.Optional[dict], since: float) -> bool:
+        return bool(record) and record.get("finished", 0) >= since  # type: ignore
+
+    def _record(self, handle: typing.IO, record: dict) -> None:
+        handle.seek(0)
+        handle.truncate()
+        handle.write(json.dumps(record))
+        handle.flush()
+
+    def _read_local(self) -> typing.Tuple[bool, typing.Optional[dict]]:
+        try:
+            with open(self.path, "r") as handle:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_SH | fcntl.LOCK_NB)
+                    running = False
+                except BlockingIOError:
+                    running = True
+                try:
+                    return running, json.loads(handle.read())
+                except ValueError:
+                    # empty, or read while it was being written
+                    return running, None
+        except FileNotFoundError:
+            return False, None
+        except OSError as e:
+            self.logger.warning(f"Could not read {self.path}: {e}")
+            return False, None
+
+    def _read_shared(self) -> typing.Optional[dict]:
+        try:
+            return DatastoreFactory().create(self.datastore).read(self.topic)  # type: ignore
+        except Exception as e:
+            self.logger.error("Could not read the speed test state")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return None
+
+    def _publish(self, record: dict, ttl: int) -> None:
+        if self.datastore is None or not self.topic:
+            return
+        try:
+            DatastoreFactory().create(self.datastore).write(self.topic, record, ttl)
+        except Exception as e:
+            self.logger.error("Could not publish the speed test state")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+
+
+# the speed test and the network probes of every process meet on the same file
+_speedtest_datastore = ApplicationConfiguration.datastore.speedtest
+SharedLoadLock = LoadLock(
+    ApplicationConfiguration.scheduler.load_lock,
+    (
+        _speedtest_datastore.get('type', ConfigurationDefaults.DATASTORE_SPEEDTEST_TYPE)
+        if ApplicationConfiguration.scheduler.load_shared
+        else None
+    ),
+    _speedtest_datastore.get('load_topic', ConfigurationDefaults.DATASTORE_SPEEDTEST_LOAD_TOPIC),
+)
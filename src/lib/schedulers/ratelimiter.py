@@ -0,0 +1,116 @@
+import asyncio
+import collections
+import math
+import threading
+import time
+import typing
+
+from config import ApplicationConfiguration
+from lib.stats.rttsamples import percentile
+
+
+class LimiterStats:
+    WINDOW = 1024  # most recent waits the percentiles are taken over
+
+    def __init__(self):
+        self.tokens = 0  # packets let through
+        self.delayed = 0  # packets that had to wait for a token
+        self.dropped = 0  # packets that could not be sent before their deadline
+        self.wait_time = 0.0  # total seconds spent waiting
+        self.waits: typing.Deque[float] = collections.deque(maxlen=self.WINDOW)
+
+    def summary(self, consumer: str) -> dict:
+        ordered = sorted(self.waits)
+        summary = {
+            "consumer": consumer,
+            "tokens": self.tokens,
+            "delayed": self.delayed,
+            "dropped": self.dropped,
+            "wait_time": round(self.wait_time, 3),
+        }
+        if ordered:
+            for percent in (50, 99):
+                summary[f"wait_p{percent}"] = round(percentile(ordered, percent), 3)
+            summary["wait_max"] = round(ordered[-1], 3)
+        return summary
+
+
+class RateLimiter:
+    """Token bucket that caps how many packets per second every probe in the process sends, all together.
+
+    Each echo request, DNS query, TCP connect and HTTP request takes a token. Tokens are handed out in the order they
+    are asked for and the bucket goes into debt instead of refusing them, so a burst of requests is spread evenly at
+    `rate` per second behind the `burst` that may go out at once. Waits are counted per consumer so the budget can be
+    sized from the metrics. A `rate` of 0 disables the limiter.
+    """
+
+    def __init__(self, rate: float = 0, burst: float = 1):
+        self.lock = threading.Lock()
+        self.stats: typing.Dict[str, LimiterStats] = {}
+        self.configure(rate, burst)
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def configure(self, rate: float, burst: float = 1) -> None:
+        with self.lock:
+            self.rate = max(0.0, rate)
+            self.burst = max(1.0, burst)
+            self.tokens = self.burst
+            self.updated = time.monotonic()
+
+    def reserve(self, consumer: str, tokens: int = 1, until: float = math.inf) -> typing.Optional[float]:
+        """Takes `tokens` and returns the seconds to wait before using them, or None if that is past `until`.
+
+        `until` is a time.monotonic() (or asyncio loop) time. A caller that takes more than one token is expected to
+        send them no faster than `rate`.
+        """
+        with self.lock:
+            stats = self.stats.setdefault(consumer, LimiterStats())
+            wait = 0.0
+            if self.enabled:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                # a reservation starts once one token is free, the rest are borrowed from later
+                wait = max(0.0, (1 - self.tokens) / self.rate)
+                if now + wait > until:
+                    stats.dropped += tokens
+                    return None
+                self.tokens -= tokens
+            stats.tokens += tokens
+            if wait > 0:
+                stats.delayed += tokens
+                stats.wait_time += wait
+            stats.waits.append(wait * 1000)
+        return wait
+
+    def acquire(self, consumer: str, tokens: int = 1, until: float = math.inf) -> bool:
+        """Blocks until `tokens` may be used, returns False without waiting if that is past `until`."""
+        wait = self.reserve(consumer, tokens, until)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def wait(self, consumer: str, tokens: int = 1, until: float = math.inf) -> bool:
+        """Same as `acquire()` without blocking the event loop."""
+        wait = self.reserve(consumer, tokens, until)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def summary(self) -> typing.List[dict]:
+        with self.lock:
+            return [stats.summary(consumer) for consumer, stats in self.stats.items()]
+
+
+# shared by every probe in the process, shard processes split the budget between them
+SharedRateLimiter = RateLimiter(
+    ApplicationConfiguration.scheduler.rate_limit / ApplicationConfiguration.probe.shard_processes,
+    ApplicationConfiguration.scheduler.rate_burst,
+)
@@ -0,0 +1,176 @@
+import math
+import random
+import signal
+import threading
+import time
+import traceback
+import typing
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from config import ApplicationConfiguration
+from lib.enums.OverrunPolicies import OverrunPolicies
+from lib.logging import setup_logging
+
+
+class ScheduledJob:
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        callback: typing.Callable[[], None],
+        on_stop: typing.Optional[typing.Callable[[], None]] = None,
+    ):
+        self.name = name
+        self.interval = interval  # seconds between ticks, may be changed while the scheduler runs
+        self.callback = callback
+        self.on_stop = on_stop
+        self.tick = 0.0  # monotonic time of the next tick on the fixed grid
+        self.due = 0.0  # the tick plus its random delay
+        self.future: typing.Optional[Future] = None
+        self.pending = False  # a tick came due while running and was coalesced
+        self.runs = 0
+        self.overruns = 0  # runs that took longer than the interval
+        self.skipped = 0  # ticks that were dropped or coalesced
+
+    @property
+    def running(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+
+class ProbeScheduler:
+    """Runs jobs on a fixed tick grid from one thread instead of each probe sleeping between collections.
+
+    Ticks are computed from the start time, so the period does not drift by the time spent collecting and
+    writing. Each tick is delayed by a random fraction (`jitter`) of the interval to spread the load of probes that
+    share an interval. A job never overlaps itself: ticks that come due while it is still running are counted and
+    either skipped or coalesced into one run after it finishes. `stop()` wakes the scheduler immediately.
+    """
+
+    STOP_GRACE = 5  # seconds to wait for the runs in progress on shutdown, docker kills the container after 10
+
+    def __init__(self, jitter: typing.Optional[float] = None, overrun: typing.Optional[OverrunPolicies] = None):
+        config = ApplicationConfiguration
+        self.logger = setup_logging(self.__class__.__name__, config.logging)
+        self.jitter = config.scheduler.jitter if jitter is None else jitter
+        self.overrun = config.scheduler.overrun if overrun is None else overrun
+        self.jobs: typing.List[ScheduledJob] = []
+        self.executor: typing.Optional[ThreadPoolExecutor] = None
+        self._wake = threading.Event()
+        self._stopping = False
+
+    def add(
+        self,
+        name: str,
+        interval: float,
+        callback: typing.Callable[[], None],
+        on_stop: typing.Optional[typing.Callable[[], None]] = None,
+    ) -> ScheduledJob:
+        job = ScheduledJob(name, interval, callback, on_stop)
+        self.jobs.append(job)
+        return job
+
+    def sighandler(self, signum, frame):
+        self.logger.warning('<SIGTERM received>')
+        self.stop()
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._wake.set()
+
+    def run(self) -> None:
+        if not self.jobs:
+            self.logger.debug("No jobs to schedule")
+            return
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self.sighandler)
+
+        # one worker per job, a job is never run twice at the same time
+        self.executor = ThreadPoolExecutor(max_workers=len(self.jobs), thread_name_prefix=self.__class__.__name__)
+        started = time.monotonic()
+        for job in self.jobs:
+            job.tick = started
+            job.due = started + self._delay(job)
+
+        try:
+            while not self._stopping:
+                now = time.monotonic()
+                for job in self.jobs:
+                    if job.pending and not job.running:
+                        job.pending = False
+                        self._submit(job)
+                    if job.due <= now:
+                        self._fire(job, now)
+                next_due = min(job.due for job in self.jobs)
+                self._wake.wait(max(0.0, next_due - time.monotonic()))
+                self._wake.clear()
+        finally:
+            self._shutdown()
+
+    def _delay(self, job: ScheduledJob) -> float:
+        return random.uniform(0, self.jitter * job.interval)
+
+    def _fire(self, job: ScheduledJob, now: float) -> None:
+        # ticks that passed while the scheduler could not run them are folded into this one
+        missed = max(0, math.floor((now - job.tick) / job.interval))
+        if missed:
+            job.skipped += missed
+            self.logger.warning(f"{job.name} missed {missed} tick(s), {job.skipped} skipped so far")
+        job.tick += (missed + 1) * job.interval
+        job.due = job.tick + self._delay(job)
+
+        if job.running:
+            job.skipped += 1
+            if self.overrun == OverrunPolicies.COALESCE:
+                job.pending = True
+            self.logger.warning(
+                f"{job.name} is still running, tick {'coalesced' if job.pending else 'skipped'} "
+                f"({job.skipped} skipped so far)"
+            )
+            return
+        self._submit(job)
+
+    def _submit(self, job: ScheduledJob) -> None:
+        job.future = self.executor.submit(self._execute, job)  # type: ignore
+        # wake the scheduler when the run ends so a coalesced tick runs right away
+        job.future.add_done_callback(lambda _: self._wake.set() if job.pending else None)
+
+    def _execute(self, job: ScheduledJob) -> None:
+        started = time.monotonic()
+        try:
+            job.callback()
+        except Exception as e:
+            self.logger.error(f"Error running {job.name}")
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+        elapsed = time.monotonic() - started
+        job.runs += 1
+        if elapsed > job.interval:
+            job.overruns += 1
+            self.logger.warning(
+                f"{job.name} took {elapsed:.1f}s, longer than its {job.interval}s interval "
+                f"({job.overruns} of {job.runs} runs overran)"
+            )
+
+    def _shutdown(self) -> None:
+        if self.executor is not None:
+            # runs in progress cannot be interrupted, but nothing new is started
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        # a job's resources are only released once its run is over, on_stop may close what the run still uses
+        running = [job.future for job in self.jobs if job.running]
+        if running:
+            self.logger.debug(f"Waiting up to {self.STOP_GRACE}s for {len(running)} run(s) to finish")
+            wait(running, self.STOP_GRACE)  # type: ignore
+        for job in self.jobs:
+            self.logger.debug(f"{job.name}: {job.runs} runs, {job.overruns} overruns, {job.skipped} skipped ticks")
+            if job.running:
+                self.logger.warning(f"{job.name} is still running after {self.STOP_GRACE}s, leaving it open")
+                continue
+            if job.on_stop is not None:
+                try:
+                    job.on_stop()
+                except Exception as e:
+                    self.logger.error(f"Error stopping {job.name}")
+                    self.logger.error(e)
+                    self.logger.error(traceback.format_exc())
+        self.logger.debug("Exiting scheduler")
@@ -0,0 +1,31 @@
+import hashlib
+import typing
+
+T = typing.TypeVar("T")
+
+
+def weight(worker: str, key: str) -> int:
+    digest = hashlib.blake2b(f"{worker}\x00{key}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def owner(key: str, workers: typing.Sequence[str]) -> str:
+    """Rendezvous (highest random weight) hashing: the worker with the highest weight for the key owns it.
+
+    Adding or removing a worker only moves the keys that worker gains or loses, about 1/N of them.
+    """
+    return max(workers, key=lambda worker: weight(worker, key))
+
+
+def shard(
+    items: typing.Iterable[T], workers: typing.Sequence[str], worker: str, key: typing.Callable[[T], str] = str
+) -> typing.List[T]:
+    """Returns the items owned by `worker`, or all of them when there is nothing to shard across."""
+    if len(workers) <= 1:
+        return list(items)
+    return [item for item in items if owner(key(item), workers) == worker]
+
+
+def shard_topic(topic: str, worker: str) -> str:
+    # each worker writes its partial results to a topic of its own, the presentation merges them
+    return f"{topic}-{worker}"
@@ -0,0 +1,94 @@
+import math
+import typing
+from array import array
+from collections import deque
+
+from lib.stats.rttsamples import RttSamples, percentile
+
+
+class RollingWindow:
+    """The last `capacity` echo results of one target with running aggregates.
+
+    `add` is O(1) (amortized for min/max): the sums, the reply count and the min/max deques are updated as samples
+    enter and leave the ring buffer, so a stream of pings never rescans the window. Only the percentiles and the
+    jitter read the whole window, once per snapshot.
+    """
+
+    LOST = math.nan
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.samples = array("d", [self.LOST]) * self.capacity
+        self.index = 0  # total samples ever added, the next slot is index % capacity
+        self.received = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        # (index, rtt) pairs with increasing (min) and decreasing (max) rtts
+        self.minimums: typing.Deque[typing.Tuple[int, float]] = deque()
+        self.maximums: typing.Deque[typing.Tuple[int, float]] = deque()
+
+    @property
+    def sent(self) -> int:
+        return min(self.index, self.capacity)
+
+    @property
+    def loss(self) -> float:
+        if self.sent == 0:
+            return 0.0
+        return round(100 * (self.sent - self.received) / self.sent, 3)
+
+    def add(self, rtt: typing.Optional[float]) -> None:
+        # None marks a request that never got a reply
+        slot = self.index % self.capacity
+        if self.index >= self.capacity:
+            expired = self.samples[slot]
+            if not math.isnan(expired):
+                self.received -= 1
+                self.total -= expired
+                self.total_squares -= expired * expired
+        expired_index = self.index - self.capacity
+        while self.minimums and self.minimums[0][0] <= expired_index:
+            self.minimums.popleft()
+        while self.maximums and self.maximums[0][0] <= expired_index:
+            self.maximums.popleft()
+
+        if rtt is None:
+            self.samples[slot] = self.LOST
+        else:
+            self.samples[slot] = rtt
+            self.received += 1
+            self.total += rtt
+            self.total_squares += rtt * rtt
+            while self.minimums and self.minimums[-1][1] >= rtt:
+                self.minimums.pop()
+            self.minimums.append((self.index, rtt))
+            while self.maximums and self.maximums[-1][1] <= rtt:
+                self.maximums.pop()
+            self.maximums.append((self.index, rtt))
+        self.index += 1
+
+    def replies(self) -> typing.List[float]:
+        """The rtts of the replies in the window, oldest first."""
+        start = self.index % self.capacity if self.index >= self.capacity else 0
+        ordered = self.samples[start:] + self.samples[:start]
+        return [rtt for rtt in ordered if not math.isnan(rtt)]
+
+    def summary(self, site: str) -> dict:
+        """Same record as RttSamples.summary(), for the samples currently in the window."""
+        netdata: typing.Dict[str, typing.Any] = {"site": site, "latency": -1, "loss": self.loss, "jitter": -1}
+        if self.received == 0:
+            return netdata
+
+        mean = self.total / self.received
+        replies = self.replies()
+        ordered = sorted(replies)
+        netdata["latency"] = round(mean, 3)
+        # the RFC 3550 estimate over the replies in the window only, not since the stream started
+        netdata["jitter"] = round(RttSamples(replies).jitter, 3)
+        netdata["mdev"] = round(math.sqrt(max(self.total_squares / self.received - mean * mean, 0)), 3)
+        netdata["min"] = round(self.minimums[0][1], 3)
+        for percent in RttSamples.PERCENTILES:
+            netdata[f"p{percent}"] = round(percentile(ordered, percent), 3)
+        netdata["max"] = round(self.maximums[0][1], 3)
+        netdata["samples"] = self.sent
+        return netdata
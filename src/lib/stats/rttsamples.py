@@ -0,0 +1,81 @@
+import math
+import typing
+from array import array
+
+
+def percentile(ordered: typing.Sequence[float], percent: float) -> float:
+    # linear interpolation between the closest ranks of an already sorted sequence
+    rank = (len(ordered) - 1) * percent / 100
+    lower = math.floor(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class RttSamples:
+    """Round trip times (ms) of the replies to one target, kept in send order in a compact double array."""
+
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, rtts: typing.Iterable[typing.Optional[float]] = (), unsent: int = 0):
+        self.rtts = array("d")
+        self.sent = 0
+        self.unsent = unsent  # requests the deadline left no time to send, they are not counted as lost
+        for rtt in rtts:
+            self.add(rtt)
+
+    def add(self, rtt: typing.Optional[float]) -> None:
+        # None marks a request that never got a reply
+        self.sent += 1
+        if rtt is not None:
+            self.rtts.append(rtt)
+
+    @property
+    def received(self) -> int:
+        return len(self.rtts)
+
+    @property
+    def loss(self) -> float:
+        if self.sent == 0:
+            return 0.0
+        return round(100 * (self.sent - self.received) / self.sent, 3)
+
+    @property
+    def mean(self) -> float:
+        return sum(self.rtts) / len(self.rtts)
+
+    @property
+    def mdev(self) -> float:
+        # the "mdev" `ping` reports, the standard deviation of the rtts
+        mean = self.mean
+        return math.sqrt(max(sum(rtt * rtt for rtt in self.rtts) / len(self.rtts) - mean * mean, 0))
+
+    @property
+    def jitter(self) -> float:
+        # RFC 3550 interarrival jitter: J += (|D(i-1, i)| - J) / 16, where D is the difference in transit
+        # time of consecutive replies. For echo replies that difference is the difference of their rtts.
+        jitter = 0.0
+        for previous, current in zip(self.rtts, self.rtts[1:]):
+            jitter += (abs(current - previous) - jitter) / 16
+        return jitter
+
+    def percentile(self, percent: float, ordered: typing.Optional[typing.List[float]] = None) -> float:
+        if ordered is None:
+            ordered = sorted(self.rtts)
+        return percentile(ordered, percent)
+
+    def summary(self, site: str) -> dict:
+        netdata: typing.Dict[str, typing.Any] = {"site": site, "latency": -1, "loss": self.loss, "jitter": -1}
+        if self.unsent:
+            netdata["unsent"] = self.unsent
+        if not self.rtts:
+            return netdata
+
+        ordered = sorted(self.rtts)
+        netdata["latency"] = round(self.mean, 3)
+        netdata["jitter"] = round(self.jitter, 3)
+        netdata["mdev"] = round(self.mdev, 3)
+        netdata["min"] = round(ordered[0], 3)
+        for percent in self.PERCENTILES:
+            netdata[f"p{percent}"] = round(self.percentile(percent, ordered), 3)
+        netdata["max"] = round(ordered[-1], 3)
+        return netdata
@@ -4,10 +4,15 @@ from concurrent.futures import ProcessPoolExecutor
 
 from config import ApplicationConfiguration
 from dotenv import find_dotenv, load_dotenv
+from lib.datastores.factory import DatastoreFactory
 from lib.logging import setup_logging
 from lib.presentations.prometheus import PrometheusPresentation
+from lib.probes.http import HttpProbe
 from lib.probes.network import NetworkProbe
 from lib.probes.speedtest import SpeedTestProbe
+from lib.probes.tcp import TcpProbe
+from lib.probes.trace import TraceProbe
+from lib.schedulers.scheduler import ProbeScheduler
 
 load_dotenv(find_dotenv())
 
@@ -29,24 +34,27 @@ class Netprobe:
         except KeyboardInterrupt:
             self.logger.warning('<KeyboardInterrupt received>')
             exit(0)
+        finally:
+            DatastoreFactory.close_all()
 
-    def speedtest(self):
-        try:
-            speedtest = SpeedTestProbe()
-            self.logger.debug('Starting Speed Test')
-            speedtest.run()
-        except KeyboardInterrupt:
-            self.logger.warning('<KeyboardInterrupt received>')
-            exit(0)
-
-    def probe(self):
+    def probes(self, shard: int = 0):
         try:
-            probe = NetworkProbe()
-            self.logger.debug('Starting probe')
-            probe.run()
+            # every probe runs on one scheduler instead of each sleeping in a process of its own.
+            # Extra shard processes only take their slice of the network probe's sites.
+            scheduler = ProbeScheduler()
+            probes = [NetworkProbe(shard)]
+            if shard == 0:
+                probes += [SpeedTestProbe(), TcpProbe(), HttpProbe(), TraceProbe()]
+            for probe in probes:
+                probe.schedule(scheduler)
+            self.logger.debug('Starting probes')
+            scheduler.run()
         except KeyboardInterrupt:
             self.logger.warning('<KeyboardInterrupt received>')
             exit(0)
+        finally:
+            # the probes are stopped, their datastore connections can go
+            DatastoreFactory.close_all()
 
 
 if __name__ == '__main__':
@@ -56,11 +64,12 @@ if __name__ == '__main__':
         loop = asyncio.new_event_loop()
         signal.signal(signal.SIGTERM, netprobe.sighandler)
         try:
-            executor = ProcessPoolExecutor()
+            processes = netprobe.config.probe.shard_processes
+            executor = ProcessPoolExecutor(max_workers=1 + processes)
 
             loop.run_in_executor(executor, netprobe.presentation)
-            loop.run_in_executor(executor, netprobe.speedtest)
-            loop.run_in_executor(executor, netprobe.probe)
+            for shard in range(processes):
+                loop.run_in_executor(executor, netprobe.probes, shard)
 
             loop.run_forever()
         except DeprecationWarning:
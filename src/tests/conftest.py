@@ -0,0 +1,8 @@
+import os
+import sys
+
+# the application runs from src/, its packages are imported from there
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# the configuration is loaded on import and needs at least one site to probe
+os.environ.setdefault("NP_SITES", "localhost")
@@ -0,0 +1,37 @@
+from lib.schedulers.cadence import AdaptiveCadence
+
+HEALTHY = {"latency": 10.0, "loss": 0.0}
+UNHEALTHY = {"latency": 10.0, "loss": 50.0}
+
+
+def cadence(**kwargs) -> AdaptiveCadence:
+    return AdaptiveCadence(60, 10, 10, 600, 10, 100, 5, 100, **kwargs)
+
+
+def test_unhealthy_sites_are_probed_at_the_fastest_cadence():
+    adaptive = cadence()
+    adaptive.update("a", UNHEALTHY, 0)
+    assert (adaptive.site("a").interval, adaptive.site("a").count) == (10, 100)
+    for _ in range(AdaptiveCadence.STABLE_RESULTS):
+        adaptive.update("a", HEALTHY, 0)
+    assert (adaptive.site("a").interval, adaptive.site("a").count) == (20, 50)
+
+
+def test_the_largest_count_fits_in_the_deadline():
+    # 9s to send requests 0.1s apart and wait 2s for the last reply
+    adaptive = cadence(deadline=0.9, timeout=2)
+    adaptive.update("a", UNHEALTHY, 0)
+    assert adaptive.site("a").count == 71
+    assert (adaptive.max_count, adaptive.min_count) == (71, 10)
+
+
+def test_a_deadline_with_room_for_every_packet():
+    assert cadence(deadline=1.0, timeout=0.1).max_count == 100
+    assert AdaptiveCadence(60, 10, 1, 600, 10, 100, 5, 100, deadline=0.5, timeout=2).max_count == 1
+
+
+def test_due_groups_sites_by_count():
+    adaptive = cadence()
+    adaptive.update("a", UNHEALTHY, 0)
+    assert adaptive.due(["a", "b"], 0) == {10: ["b"]}
+    assert adaptive.due(["a", "b"], 10) == {100: ["a"], 10: ["b"]}
@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from lib.datastores.datastore import DataStore
+from lib.datastores.factory import DatastoreFactory
+from lib.datastores.http import HttpDataStore
+from lib.enums.DataStoreTypes import DataStoreTypes
+
+
+class FakeDataStore(DataStore):
+    def __init__(self):
+        super().__init__()
+        self.alive = True
+        self.closed = False
+
+    def healthy(self) -> bool:
+        return self.alive
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def factory(monkeypatch):
+    monkeypatch.setattr(DatastoreFactory, "pool", {})
+    monkeypatch.setattr(DatastoreFactory, "retired", [])
+    monkeypatch.setattr(DatastoreFactory, "_create", lambda self, type, logger: FakeDataStore())
+    return DatastoreFactory()
+
+
+def test_reuses_the_pooled_datastore(factory):
+    assert factory.create(DataStoreTypes.NONE) is factory.create(DataStoreTypes.NONE)
+
+
+def test_unhealthy_datastore_is_closed_after_the_grace(factory, monkeypatch):
+    lost = factory.create(DataStoreTypes.NONE)
+    lost.alive = False
+    factory.pool[factory._key(DataStoreTypes.NONE)].checked -= DatastoreFactory.HEALTH_CHECK_INTERVAL
+
+    replacement = factory.create(DataStoreTypes.NONE)
+    assert replacement is not lost
+    # another thread may still be using it
+    assert not lost.closed
+
+    monkeypatch.setattr(DatastoreFactory, "RETIRE_GRACE", 0)
+    assert factory.create(DataStoreTypes.NONE) is replacement
+    assert lost.closed and not replacement.closed
+    assert DatastoreFactory.retired == []
+
+
+def test_close_all_closes_retired_datastores(factory):
+    lost = factory.create(DataStoreTypes.NONE)
+    lost.alive = False
+    factory.pool[factory._key(DataStoreTypes.NONE)].checked -= DatastoreFactory.HEALTH_CHECK_INTERVAL
+    replacement = factory.create(DataStoreTypes.NONE)
+
+    DatastoreFactory.close_all()
+    assert lost.closed and replacement.closed
+    assert DatastoreFactory.pool == {} and DatastoreFactory.retired == []
+
+
+def test_http_datastore_session_per_thread():
+    datastore = HttpDataStore()
+    sessions = []
+    threads = [threading.Thread(target=lambda: sessions.append(datastore.session)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert datastore.session is datastore.session
+    assert len({id(session) for session in sessions + [datastore.session]}) == 4
+    datastore.close()
+    assert datastore.sessions == []
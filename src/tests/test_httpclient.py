@@ -0,0 +1,47 @@
+import asyncio
+
+from lib.clients.httpclient import HttpClient
+
+CHUNKS = [b"x" * 100] * 5
+
+
+async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    # a chunked response, then a plain one on the same keep-alive connection
+    responses = [
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+        + b"".join(b"%x\r\n%s\r\n" % (len(chunk), chunk) for chunk in CHUNKS)
+        + b"0\r\n\r\n",
+        b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok",
+    ]
+    for response in responses:
+        while (await reader.readline()) not in (b"\r\n", b""):
+            pass
+        writer.write(response)
+        await writer.drain()
+    writer.close()
+
+
+async def fetch_twice() -> tuple:
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    client = HttpClient(timeout=5, keepalive=True)
+    progress = []
+    try:
+        chunked = await client.request(f"http://127.0.0.1:{port}/", progress=progress.append)
+        plain = await client.request(f"http://127.0.0.1:{port}/")
+    finally:
+        client.close()
+        server.close()
+        await server.wait_closed()
+    return chunked, plain, progress
+
+
+def test_chunked_body():
+    chunked, plain, progress = asyncio.run(fetch_twice())
+    assert chunked.status == 200
+    assert chunked.size == sum(len(chunk) for chunk in CHUNKS)
+    assert sum(progress) == chunked.size
+    # the connection is reused at the message boundary, after the last chunk and its CRLF
+    assert plain.reused
+    assert plain.status == 200
+    assert plain.size == 2
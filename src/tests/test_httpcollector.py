@@ -0,0 +1,72 @@
+import http.server
+import threading
+
+import pytest
+
+from lib.collectors.httpcollector import HttpCollector
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keeps the connection open between requests
+
+    def do_GET(self):
+        body = b"netprobe" * 16
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def url():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def rounded(value: float) -> bool:
+    return value == round(value, 3)
+
+
+def test_cold_requests(url):
+    collector = HttpCollector([url], 3, timeout=5)
+    try:
+        [httpdata] = collector.collect()["http_stats"]
+    finally:
+        collector.close()
+    assert (httpdata["status"], httpdata["loss"], httpdata["bytes"], httpdata["reused"]) == (200, 0.0, 128, 0)
+    for phase in HttpCollector.PHASES:
+        assert httpdata[phase] >= 0 and rounded(httpdata[phase])
+    assert httpdata["connect"] > 0
+
+
+def test_reused_requests_do_not_dilute_the_connection_phases(url):
+    collector = HttpCollector([url], 4, timeout=5, keepalive=True)
+    try:
+        [first] = collector.collect()["http_stats"]
+        [second] = collector.collect()["http_stats"]
+    finally:
+        collector.close()
+    # only the first request opened a connection, the phases are its own timings
+    assert first["reused"] == 3
+    assert first["connect"] > 0 and rounded(first["connect"])
+    assert all(rounded(first[phase]) for phase in HttpCollector.PHASES)
+    # the next cycle reuses the pooled connection for every request
+    assert second["reused"] == 4
+    assert not any(phase in second for phase in HttpCollector.CONNECTION_PHASES)
+    assert second["total"] > 0
+
+
+def test_unreachable_url():
+    collector = HttpCollector(["http://127.0.0.1:1/"], 2, timeout=2)
+    try:
+        [httpdata] = collector.collect()["http_stats"]
+    finally:
+        collector.close()
+    assert (httpdata["status"], httpdata["loss"], httpdata["total"]) == (0, 100.0, -1)
@@ -0,0 +1,30 @@
+import time
+
+import pytest
+
+from lib.pingers.icmp import IcmpPinger
+from lib.pingers.loadedlatency import bufferbloat_grade, bufferbloat_score, measure_phases
+
+
+def test_bufferbloat_grade():
+    assert [bufferbloat_grade(added) for added in (0, 5, 29.9, 60, 399, 400)] == ["A+", "A", "A", "C", "D", "F"]
+    assert (bufferbloat_score("A+"), bufferbloat_score("F")) == (5, 0)
+
+
+@pytest.mark.skipif(not IcmpPinger.available(), reason="ICMP sockets are not available")
+def test_measure_phases():
+    partials = []
+
+    def download() -> float:
+        time.sleep(0.5)
+        return 100.0
+
+    results = measure_phases({"download": download}, "127.0.0.1", 20, 0.5, partials.append)
+    assert results["download"] == 100.0
+    for phase in ("idle", "download"):
+        assert results[f"latency_{phase}_loss"] == 0.0
+        assert results[f"latency_{phase}_p50"] > 0
+    assert results["bufferbloat_grade"] == "A+"
+    # the partial results are taken while the stream is still pinging
+    [partial] = partials
+    assert partial["download"] == 100.0 and partial["latency_download_p50"] > 0
@@ -0,0 +1,55 @@
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from config.ProbeSourceConfiguration import ProbeSourceConfiguration
+from lib.clients.sourcebinding import bind_socket
+from lib.collectors.multisourcecollector import MultiSourceCollector
+from lib.collectors.networkcollector import NetworkCollector
+from lib.pingers.icmp import EchoSession, IcmpPinger
+
+# loopback aliases stand in for two uplinks
+SOURCES = [ProbeSourceConfiguration("first", "127.0.0.1"), ProbeSourceConfiguration("second", "127.0.0.2")]
+
+
+def test_bind_socket():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        bind_socket(sock, SOURCES[1])
+        assert sock.getsockname()[0] == "127.0.0.2"
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        bind_socket(sock, None)
+        assert sock.getsockname() == ("0.0.0.0", 0)
+
+
+@pytest.mark.skipif(not socket.has_ipv6, reason="IPv6 is not available")
+def test_bind_socket_of_another_family():
+    with socket.socket(socket.AF_INET6, socket.SOCK_DGRAM) as sock:
+        # an IPv4 source leaves IPv6 sockets to the routing table
+        bind_socket(sock, SOURCES[1])
+        assert sock.getsockname()[0] == "::"
+
+
+@pytest.mark.skipif(not IcmpPinger.available(), reason="ICMP sockets are not available")
+def test_echo_sockets_are_bound_to_the_source():
+    sock, _ = EchoSession.create_socket(socket.AF_INET, SOURCES[1])
+    with sock:
+        assert sock.getsockname()[0] == "127.0.0.2"
+
+
+@pytest.mark.skipif(not IcmpPinger.available(), reason="ICMP sockets are not available")
+def test_every_record_carries_its_source():
+    executor = ThreadPoolExecutor(max_workers=4)
+    collectors = [
+        NetworkCollector(["127.0.0.1", "127.0.0.3"], 3, [], [], timeout=1, source=source, executor=executor)
+        for source in SOURCES
+    ]
+    collector = MultiSourceCollector(collectors, executor)
+    try:
+        results = collector.collect()
+    finally:
+        collector.close()
+    pinged = sorted((netdata["source"], netdata["site"]) for netdata in results["stats"])
+    assert pinged == [("first", "127.0.0.1"), ("first", "127.0.0.3"), ("second", "127.0.0.1"), ("second", "127.0.0.3")]
+    assert all(netdata["loss"] == 0.0 for netdata in results["stats"])
+    assert results["dns_stats"] == []
@@ -0,0 +1,76 @@
+import subprocess
+
+import pytest
+
+import lib.pingers.system
+from lib.pingers.fping import FpingPinger
+from lib.pingers.icmp import IcmpPinger
+from lib.pingers.system import SystemPinger
+
+FPING_OUTPUT = """
+a.example.com : 11.48 12.91 - 14.47
+b.example.com : - - - -
+ICMP Host Unreachable from 10.0.0.1 for ICMP Echo sent to c.example.com
+other.example.com : 1.00 1.00 1.00 1.00
+"""
+
+PING_OUTPUT = """PING a.example.com (10.0.0.2) 56(84) bytes of data.
+64 bytes from 10.0.0.2: icmp_seq=1 ttl=117 time=11.5 ms
+64 bytes from 10.0.0.2: icmp_seq=2 ttl=117 time=14.5 ms
+64 bytes from 10.0.0.2: icmp_seq=2 ttl=117 time=20.0 ms (DUP!)
+64 bytes from 10.0.0.2: icmp_seq=4 ttl=117 time<1 ms
+
+--- a.example.com ping statistics ---
+4 packets transmitted, 3 received, +1 duplicates, 25% packet loss, time 303ms
+rtt min/avg/max/mdev = 1.000/12.000/20.000/7.000 ms
+"""
+
+
+def test_fping_parse():
+    stats = FpingPinger().parse(FPING_OUTPUT, ["a.example.com", "b.example.com", "c.example.com"])
+    assert [netdata["site"] for netdata in stats] == ["a.example.com", "b.example.com"]
+    assert (stats[0]["loss"], stats[0]["min"], stats[0]["max"]) == (25.0, 11.48, 14.47)
+    assert (stats[1]["loss"], stats[1]["latency"]) == (100.0, -1)
+
+
+def test_system_ping_parse(monkeypatch):
+    def run(command, **kwargs):
+        return subprocess.CompletedProcess(command, 0, stdout=PING_OUTPUT, stderr="")
+
+    monkeypatch.setattr(lib.pingers.system.subprocess, "run", run)
+    netdata = SystemPinger(timeout=1).pingtest(4, "a.example.com")
+    # the duplicate reply to the second request is ignored, the third request was lost
+    assert (netdata["loss"], netdata["min"], netdata["max"]) == (25.0, 1.0, 14.5)
+    assert netdata["latency"] == round((11.5 + 14.5 + 1) / 3, 3)
+
+
+def test_system_ping_without_statistics(monkeypatch):
+    def run(command, **kwargs):
+        return subprocess.CompletedProcess(
+            command, 2, stdout="ping: a.example.com: Name or service not known", stderr=""
+        )
+
+    monkeypatch.setattr(lib.pingers.system.subprocess, "run", run)
+    assert SystemPinger(timeout=1).pingtest(4, "a.example.com") is None
+
+
+def test_fping_parse_unsent():
+    [netdata] = FpingPinger().parse("a.example.com : 11.48 -\n", ["a.example.com"], 3)
+    assert (netdata["loss"], netdata["unsent"]) == (50.0, 3)
+
+
+def test_system_ping_stopped_by_the_deadline(monkeypatch):
+    def run(command, **kwargs):
+        return subprocess.CompletedProcess(command, 1, stdout=PING_OUTPUT, stderr="")
+
+    monkeypatch.setattr(lib.pingers.system.subprocess, "run", run)
+    # ping sent 4 of the 10 requests before -w stopped it
+    netdata = SystemPinger(timeout=1).pingtest(10, "a.example.com", 5)
+    assert (netdata["loss"], netdata["unsent"]) == (25.0, 6)
+
+
+@pytest.mark.skipif(not IcmpPinger.available(), reason="ICMP sockets are not available")
+def test_icmp_requests_cut_off_by_the_deadline_are_not_lost():
+    [netdata] = IcmpPinger(timeout=1).ping(["127.0.0.1"], 20, 0.5)
+    assert netdata["loss"] == 0.0
+    assert 10 <= netdata["unsent"] < 20
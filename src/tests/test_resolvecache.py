@@ -0,0 +1,48 @@
+import asyncio
+import socket
+import threading
+import time
+
+from lib.resolvers.resolvecache import ResolveCache, Resolution
+
+
+class SlowCache(ResolveCache):
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+        self.lookups = 0
+
+    async def _lookup(self, host: str) -> Resolution:
+        self.lookups += 1
+        await asyncio.sleep(self.delay)
+        return Resolution(host, "127.0.0.1", socket.AF_INET, self.delay * 1000, time.monotonic() + 60)
+
+
+def test_a_slow_lookup_is_shared_by_later_cycles():
+    cache = SlowCache(0.5)
+    threads = threading.active_count()
+    # three cycles give up on the name before it resolves
+    for _ in range(3):
+        assert not cache.submit("slow.example.com").done()
+    assert cache.submit("slow.example.com").result(2).address == "127.0.0.1"
+    assert cache.lookups == 1
+    assert threading.active_count() <= threads + 1
+    assert cache.pending == {}
+
+
+def test_cache_hits_take_no_time():
+    cache = SlowCache(0.01)
+    lookup = cache.submit("a.example.com").result(2)
+    assert lookup.fields() == {"address": "127.0.0.1", "resolve_time": 10.0}
+    hit = cache.submit("a.example.com").result(0)
+    assert hit.fields() == {"address": "127.0.0.1", "resolve_time": 0.0, "resolve_cached": 1}
+    assert asyncio.run(cache.resolve("a.example.com")).fields() == hit.fields()
+    assert cache.fresh(lookup) and cache.fresh(hit)
+    assert cache.lookups == 1
+
+
+def test_addresses_are_not_looked_up():
+    cache = SlowCache(0.01)
+    resolution = asyncio.run(cache.resolve("::1"))
+    assert (resolution.address, resolution.family, resolution.resolve_time) == ("::1", socket.AF_INET6, 0.0)
+    assert cache.lookups == 0
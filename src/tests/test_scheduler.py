@@ -0,0 +1,41 @@
+import threading
+import time
+
+from lib.enums.OverrunPolicies import OverrunPolicies
+from lib.schedulers.scheduler import ProbeScheduler
+
+
+def test_on_stop_waits_for_the_run_in_progress():
+    events = []
+    started = threading.Event()
+
+    def run():
+        started.set()
+        time.sleep(0.5)
+        events.append("finished")
+
+    scheduler = ProbeScheduler(jitter=0, overrun=OverrunPolicies.SKIP)
+    scheduler.add("job", 60, run, on_stop=lambda: events.append("stopped"))
+    threading.Thread(target=lambda: started.wait(5) and scheduler.stop()).start()
+    scheduler.run()
+    assert events == ["finished", "stopped"]
+
+
+def test_on_stop_skips_a_run_that_outlives_the_grace_period():
+    events = []
+    release = threading.Event()
+    started = threading.Event()
+
+    def run():
+        started.set()
+        release.wait(5)
+
+    scheduler = ProbeScheduler(jitter=0, overrun=OverrunPolicies.SKIP)
+    scheduler.STOP_GRACE = 0.2
+    scheduler.add("job", 60, run, on_stop=lambda: events.append("stopped"))
+    threading.Thread(target=lambda: started.wait(5) and scheduler.stop()).start()
+    try:
+        scheduler.run()
+    finally:
+        release.set()
+    assert events == []
@@ -0,0 +1,29 @@
+from lib.schedulers.sharding import owner, shard
+
+KEYS = [f"site{index}.example.com" for index in range(200)]
+
+
+def test_owner_is_stable():
+    workers = ["a", "b", "c"]
+    assert [owner(key, workers) for key in KEYS] == [owner(key, list(reversed(workers))) for key in KEYS]
+
+
+def test_adding_a_worker_only_moves_keys_to_it():
+    before = {key: owner(key, ["a", "b", "c"]) for key in KEYS}
+    after = {key: owner(key, ["a", "b", "c", "d"]) for key in KEYS}
+    moved = [key for key in KEYS if before[key] != after[key]]
+    assert moved and all(after[key] == "d" for key in moved)
+    # about a quarter of the keys, with room for an uneven hash
+    assert len(moved) < len(KEYS) / 2
+
+
+def test_shard_partitions_the_items():
+    workers = ["a", "b", "c"]
+    shards = [shard(KEYS, workers, worker) for worker in workers]
+    assert sorted(sum(shards, [])) == sorted(KEYS)
+    assert all(shards)
+
+
+def test_shard_without_workers_to_share_with():
+    assert shard(KEYS, ["a"], "a") == KEYS
+    assert shard(KEYS, [], "a") == KEYS
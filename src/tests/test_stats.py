@@ -0,0 +1,86 @@
+from lib.stats.rollingwindow import RollingWindow
+from lib.stats.rttsamples import RttSamples, percentile
+
+
+def test_percentile_interpolates_between_ranks():
+    assert percentile([10.0, 20.0, 30.0], 50) == 20.0
+    assert percentile([10.0, 20.0, 30.0], 90) == 28.0
+    assert percentile([10.0, 20.0, 30.0], 100) == 30.0
+    assert percentile([7.0], 99) == 7.0
+
+
+def test_summary():
+    netdata = RttSamples([10.0, 20.0, None, 30.0]).summary("a")
+    assert netdata == {
+        "site": "a",
+        "latency": 20.0,
+        "loss": 25.0,
+        "jitter": 1.211,
+        "mdev": 8.165,
+        "min": 10.0,
+        "p50": 20.0,
+        "p90": 28.0,
+        "p99": 29.8,
+        "max": 30.0,
+    }
+
+
+def test_jitter_follows_rfc3550():
+    # J += (|D| - J) / 16 over consecutive replies, lost requests are skipped
+    assert RttSamples([10.0, 20.0, None, 30.0]).jitter == 10 / 16 + (10 - 10 / 16) / 16
+    assert RttSamples([10.0, 10.0, 10.0]).jitter == 0.0
+    assert RttSamples([10.0]).jitter == 0.0
+
+
+def test_empty_summary():
+    assert RttSamples().summary("a") == {"site": "a", "latency": -1, "loss": 0.0, "jitter": -1}
+
+
+def test_all_lost_summary():
+    assert RttSamples([None] * 4).summary("a") == {"site": "a", "latency": -1, "loss": 100.0, "jitter": -1}
+
+
+def test_rolling_window_evicts_the_oldest_samples():
+    window = RollingWindow(3)
+    for rtt in (10.0, 20.0, 30.0, None):
+        window.add(rtt)
+    netdata = window.summary("a")
+    assert (netdata["samples"], netdata["loss"]) == (3, 33.333)
+    assert (netdata["min"], netdata["latency"], netdata["max"]) == (20.0, 25.0, 30.0)
+
+    window.add(5.0)
+    netdata = window.summary("a")
+    assert (netdata["loss"], netdata["min"], netdata["max"]) == (33.333, 5.0, 30.0)
+
+    window.add(None)
+    window.add(None)
+    netdata = window.summary("a")
+    assert (netdata["loss"], netdata["min"], netdata["max"]) == (66.667, 5.0, 5.0)
+
+    for _ in range(3):
+        window.add(None)
+    assert window.summary("a") == {"site": "a", "latency": -1, "loss": 100.0, "jitter": -1}
+
+
+def test_rolling_window_matches_rtt_samples():
+    rtts = [12.5, None, 11.0, 15.25, 9.75, None, 13.0]
+    window = RollingWindow(len(rtts))
+    for rtt in rtts:
+        window.add(rtt)
+    netdata = window.summary("a")
+    assert netdata.pop("samples") == len(rtts)
+    assert netdata == RttSamples(rtts).summary("a")
+
+
+def test_rolling_window_jitter_only_covers_the_window():
+    window = RollingWindow(3)
+    # a burst of jitter that has left the window no longer counts
+    for rtt in (10.0, 50.0, 10.0, 20.0, 20.0, 20.0):
+        window.add(rtt)
+    assert window.replies() == [20.0, 20.0, 20.0]
+    assert window.summary("a")["jitter"] == 0.0
+
+    window.add(None)
+    window.add(36.0)
+    assert window.replies() == [20.0, 36.0]
+    assert window.summary("a")["jitter"] == 1.0
@@ -0,0 +1,52 @@
+import asyncio
+import socket
+
+from lib.collectors.tcpcollector import TcpCollector
+
+
+async def accept(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    writer.close()
+
+
+async def probe_listener(count: int) -> list:
+    server = await asyncio.start_server(accept, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await TcpCollector([f"127.0.0.1:{port}"], count, timeout=2)._collect_all()
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def test_latency():
+    [tcpdata] = asyncio.run(probe_listener(3))
+    assert (tcpdata["host"], tcpdata["loss"], tcpdata["refused"], tcpdata["timeouts"]) == ("127.0.0.1", 0.0, 0, 0)
+    assert 0 < tcpdata["min"] <= tcpdata["latency"] <= tcpdata["max"] < 2000
+
+
+def test_refused():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    # nothing listens on the port any more
+    [tcpdata] = TcpCollector([f"127.0.0.1:{port}"], 2, timeout=2).collect()["tcp_stats"]
+    assert (tcpdata["loss"], tcpdata["latency"], tcpdata["refused"], tcpdata["timeouts"]) == (100.0, -1, 2, 0)
+
+
+def test_timeouts():
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(0)
+        port = listener.getsockname()[1]
+        # a full accept queue drops the next handshakes, they never complete
+        backlog = [socket.create_connection(("127.0.0.1", port), timeout=1)]
+        try:
+            [tcpdata] = TcpCollector([f"127.0.0.1:{port}"], 2, timeout=0.5).collect()["tcp_stats"]
+        finally:
+            for sock in backlog:
+                sock.close()
+    assert (tcpdata["loss"], tcpdata["refused"], tcpdata["timeouts"]) == (100.0, 0, 2)
+
+
+def test_invalid_target():
+    assert TcpCollector(["127.0.0.1"], 1).collect() == {"tcp_stats": []}
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from lib.collectors.throughputcollector import ThroughputCollector
+
+BLOCK = b"x" * 16384
+
+
+class Server:
+    """A keep-alive HTTP server on 127.0.0.1 that serves a steady download, takes uploads and fails on demand."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.requests = {"/download": 0, "/flaky": 0, "/upload": 0}
+        started = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(started,), daemon=True)
+        self.thread.start()
+        started.wait(5)
+
+    def _run(self, started: threading.Event) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.server = self.loop.run_until_complete(asyncio.start_server(self._serve, "127.0.0.1", 0))
+        self.port = self.server.sockets[0].getsockname()[1]
+        started.set()
+        self.loop.run_forever()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def close(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop.close()
+
+    async def _shutdown(self) -> None:
+        self.server.close()
+        # connections the collector left open are still being served
+        handlers = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for handler in handlers:
+            handler.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                method, path, _ = (await reader.readline()).decode().split(" ", 2)
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                self.requests[path] = self.requests.get(path, 0) + 1
+                if path == "/flaky" and self.requests[path] == 1:
+                    # the first stream's request fails, the others go on
+                    break
+                if method == "POST":
+                    await reader.readexactly(length)
+                if method != "GET" or path == "/ok":
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+                    continue
+                # 64 blocks at a steady pace, about 10 MB/s per stream
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % (len(BLOCK) * 64))
+                for _ in range(64):
+                    writer.write(BLOCK)
+                    await writer.drain()
+                    await asyncio.sleep(0.002)
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+def server():
+    server = Server()
+    yield server
+    server.close()
+
+
+def collector(server: Server, path: str, **kwargs) -> ThroughputCollector:
+    kwargs.setdefault("duration", 8)
+    kwargs.setdefault("stability", 0)
+    collector = ThroughputCollector(server.url(path), None, server.url("/ok"), **kwargs)
+    # sampled faster than the real test so it settles within a second or two
+    collector.SAMPLE_INTERVAL = 0.1
+    collector.RATE_WINDOW = 0.3
+    collector.WARMUP = 0.2
+    return collector
+
+
+def measure(collector: ThroughputCollector) -> tuple:
+    started = time.monotonic()
+    results = collector.collect()
+    return results, time.monotonic() - started
+
+
+def test_byte_budget(server):
+    results, elapsed = measure(collector(server, "/download", streams=2, max_bytes=2 * 1024 * 1024))
+    assert results["download"] > 0 and results["latency"] > 0
+    assert elapsed < 4
+
+
+def test_stops_once_the_rate_settles(server):
+    results, elapsed = measure(collector(server, "/download", streams=2, stability=0.5))
+    assert results["download"] > 0
+    # WARMUP, RATE_WINDOW and STABLE_SAMPLES samples, well before the 8s duration
+    assert elapsed < 4
+
+
+def test_runs_for_the_duration_without_settling(server):
+    results, elapsed = measure(collector(server, "/download", streams=1, duration=1.5))
+    assert results["download"] > 0
+    assert 1.5 <= elapsed < 4
+
+
+def test_a_failed_stream_does_not_fail_the_test(server):
+    results, _ = measure(collector(server, "/flaky", streams=2, duration=1))
+    assert results["download"] > 0
+    assert server.requests["/flaky"] > 2
+
+
+def test_upload(server):
+    test = ThroughputCollector(None, server.url("/upload"), server.url("/ok"), streams=2, duration=1, stability=0)
+    test.UPLOAD_SIZE = 256 * 1024
+    results = test.collect()
+    assert results["upload"] > 0 and "download" not in results
+    assert server.requests["/upload"] > 2
+
+
+def test_every_stream_failing(server):
+    # nothing listens on port 1
+    assert ThroughputCollector("http://127.0.0.1:1/", None, server.url("/ok"), duration=1).collect() is None